@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+# Serve the list and retrieve endpoints with async views (see core.views.AsyncReadMixin).
+os.environ.setdefault("API_ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
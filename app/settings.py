@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "rest_framework_simplejwt",
@@ -52,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -59,6 +63,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
+    "core.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "app.urls"
@@ -85,16 +91,133 @@ WSGI_APPLICATION = "app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# The core.db.backends.postgresql engine keeps the connections in a pool shared by the threads of a process (see
+# core.db.pool.ConnectionPool), set DB_ENGINE=django.db.backends.postgresql to open one connection per request.
+# Every process holds up to DB_POOL_MAX_SIZE connections, keep workers * DB_POOL_MAX_SIZE below max_connections.
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": os.environ.get("DB_ENGINE", "core.db.backends.postgresql"),
         "NAME": os.environ.get("DB_NAME"),
         "HOST": os.environ.get("DB_HOST"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        "POOL": {
+            "MIN_SIZE": int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+            "MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+            "MAX_LIFETIME": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+            "MAX_IDLE": float(os.environ.get("DB_POOL_MAX_IDLE", 600)),
+            "CHECK": os.environ.get("DB_POOL_CHECK", "true").lower() == "true",
+        },
     }
 }
 
+# Read replicas: DB_REPLICA_HOSTS is a comma separated list of hosts replicating the primary, with its name and
+# credentials. The catalog reads of the GET requests on DATABASE_REPLICA_PATHS go to one of them (see
+# core.db.routers.ReplicaRouter), picked round_robin or least_loaded (fewest reads in flight in the process). A client
+# that writes on those paths reads from the primary for the next DB_REPLICA_PIN_SECONDS, which must exceed the
+# replication lag: the pin is a signed cookie, also sent as the X-Replica-Pin header (see core.db.replicas.pin). The
+# replicas mirror the primary in tests, no test database is created on them.
+
+for index, host in enumerate(
+    host.strip()
+    for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_SELECTION = os.environ.get("DB_REPLICA_SELECTION", "round_robin")
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", 5))
+DATABASE_REPLICA_PATHS = ["/api/planet/", "/api/terrains/", "/api/climate/"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The "api" cache holds the responses of the planet, terrain and climate endpoints, keyed by the resource versions
+# stored in the database (core.models.ResourceVersion), so a write from any process invalidates them. A shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) lets the workers share the cached responses.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": {
+        "BACKEND": os.environ.get(
+            "API_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("API_CACHE_LOCATION", "api"),
+        "TIMEOUT": int(os.environ.get("API_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "auth": {
+        "BACKEND": os.environ.get(
+            "AUTH_USER_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("AUTH_USER_CACHE_LOCATION", "auth"),
+        "TIMEOUT": int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "profiles": {
+        "BACKEND": os.environ.get(
+            "PROFILING_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("PROFILING_CACHE_LOCATION", "profiles"),
+        "OPTIONS": {"MAX_ENTRIES": 100},
+    },
+    "slow_queries": {
+        "BACKEND": os.environ.get(
+            "SLOW_QUERY_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "SLOW_QUERY_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "slow-queries"),
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+}
+
+API_CACHE_ALIAS = "api"
+API_CACHE_ENABLED = os.environ.get("API_CACHE_ENABLED", "true").lower() == "true"
+
+# The "auth" cache holds the users of verified JWTs (see user.authentication.CachedJWTAuthentication). With several
+# workers a shared backend is mandatory, so that deactivating a user or changing its password takes effect in all of
+# them (`check --deploy` warns about a local one), or turn the cache off with AUTH_USER_CACHE_ENABLED=false.
+AUTH_USER_CACHE_ALIAS = "auth"
+AUTH_USER_CACHE_ENABLED = (
+    os.environ.get("AUTH_USER_CACHE_ENABLED", "true").lower() == "true"
+)
+
+# Staff users profile a request by sending the X-Profile header or the `profile` query parameter (see core.profiling).
+# The profiles are kept in the "profiles" cache, use a shared backend with several workers so that any of them serves
+# /api/monitoring/profiles/<id>/.
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "true").lower() == "true"
+PROFILING_HEADER = "X-Profile"
+PROFILING_QUERY_PARAM = "profile"
+PROFILING_CACHE_ALIAS = "profiles"
+PROFILING_TIMEOUT = int(os.environ.get("PROFILING_TIMEOUT", 3600))
+
+# The queries slower than SLOW_QUERY_THRESHOLD_MS are logged by fingerprint with their views, and a
+# SLOW_QUERY_EXPLAIN_RATE share of the slow SELECT statements is run again under EXPLAIN (ANALYZE, BUFFERS) (see
+# core.db.slow_queries). Every process writes its log to the "slow_queries" cache, a file cache by default so that the
+# `slow_queries` command sees the logs of the workers of the host, use a shared backend across hosts.
+SLOW_QUERY_LOG_ENABLED = (
+    os.environ.get("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+)
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100))
+SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_RATE", 0.1))
+SLOW_QUERY_MAX_FINGERPRINTS = 500
+SLOW_QUERY_CACHE_ALIAS = "slow_queries"
+SLOW_QUERY_FLUSH_INTERVAL = float(os.environ.get("SLOW_QUERY_FLUSH_INTERVAL", 1))
+SLOW_QUERY_RETENTION = int(os.environ.get("SLOW_QUERY_RETENTION", 86400))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -149,11 +272,42 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": False,
     "SIGNING_KEY": SECRET_KEY,
     "TOKEN_OBTAIN_SERIALIZER": "user.serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.RevocableTokenRefreshSerializer",
 }
 
+# Revoked JWTs (see user.revocation): new revocations reach the other workers within the refresh interval, the
+# in-process filter is rebuilt without the expired ones every rebuild interval.
+TOKEN_REVOCATION_REFRESH_INTERVAL = float(
+    os.environ.get("TOKEN_REVOCATION_REFRESH_INTERVAL", 5)
+)
+TOKEN_REVOCATION_REBUILD_INTERVAL = float(
+    os.environ.get("TOKEN_REVOCATION_REBUILD_INTERVAL", 3600)
+)
+TOKEN_REVOCATION_ERROR_RATE = 0.001
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+    "DEFAULT_AUTHENTICATION_CLASSES": ["user.authentication.CachedJWTAuthentication"],
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
+
+# The list and retrieve actions of the planet, terrain and climate endpoints are served by async views when this is on
+# (see core.views.AsyncReadMixin). app/asgi.py turns it on, leave it off under WSGI.
+API_ASYNC_VIEWS = os.environ.get("API_ASYNC_VIEWS", "false").lower() == "true"
+
+# Request metrics of the user, planet, terrain and climate routes, served in the Prometheus text format at /metrics
+# (see core.metrics). With several worker processes set METRICS_DIR to a directory shared by the workers of the host
+# and empty it when they start, every process writes its metrics there and /metrics sums them. When METRICS_TOKEN is
+# set, /metrics requires the "Authorization: Bearer <METRICS_TOKEN>" header, otherwise it is served to staff users only.
+METRICS_NAMESPACES = ["user", "planet", "terrain", "climate"]
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1))
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
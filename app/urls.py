@@ -19,6 +19,8 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from monitoring.views import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
@@ -31,4 +33,6 @@ urlpatterns = [
     path("api/terrains/", include("terrain.urls")),
     path("api/climate/", include("climate.urls")),
     path("api/planet/", include("planet.urls")),
+    path("api/monitoring/", include("monitoring.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
@@ -0,0 +1,268 @@
+"""
+Benchmarks one worker serving many concurrent slow clients on the planet, terrain and climate read endpoints:
+- `wsgi`: the WSGI handler on a pool of `--threads` threads, like a threaded WSGI worker. A thread is busy until its
+  client has read the whole response.
+- `asgi_sync`: the ASGI handler with the sync views (API_ASYNC_VIEWS off).
+- `asgi_async`: the ASGI handler with the async list and retrieve views (API_ASYNC_VIEWS on).
+The requests are driven in-process with a JWT, the response cache off and every query delayed by `--query-latency-ms`
+(a remote database). Clients take `--client-delay-ms` to read a response. It prints the throughput and latency of every
+mode per number of concurrent clients.
+
+    python -m benchmarks.asgi_concurrency --planets 10000 --requests 2000 --keepdb
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+CLIENTS = [16, 64, 256]
+MODES = ["wsgi", "asgi_sync", "asgi_async"]
+
+
+def urlconf(async_views: bool):
+    """
+    The urlconf function builds the API routes with the sync or the async views, the views are chosen when the routes
+    are built.
+    """
+    from django.test import override_settings
+    from django.urls import include, path
+    from rest_framework import routers
+
+    from climate.views import ClimateViewSet
+    from planet.views import PlanetViewSet
+    from terrain.views import TerrainViewSet
+
+    def routes(prefix: str, viewset, namespace: str):
+        router = routers.SimpleRouter()
+        router.register(prefix, viewset)
+        return include((router.urls, namespace))
+
+    module = ModuleType(f"benchmark_urls_{'async' if async_views else 'sync'}")
+    with override_settings(API_ASYNC_VIEWS=async_views):
+        module.urlpatterns = [
+            path("api/terrains/", routes("terrain", TerrainViewSet, "terrain")),
+            path("api/climate/", routes("climate", ClimateViewSet, "climate")),
+            path("api/planet/", routes("planet", PlanetViewSet, "planet")),
+        ]
+
+    return module
+
+
+def request_paths(amount: int, planet_ids: list[int]) -> list[tuple[str, str]]:
+    paths = [
+        ("/api/planet/planet/", "page_size=20"),
+        ("/api/planet/planet/", "page_size=20&terrain=terrain-01"),
+        ("/api/terrains/terrain/", ""),
+        ("/api/climate/climate/", ""),
+    ]
+    paths += [(f"/api/planet/planet/{planet_id}/", "") for planet_id in planet_ids]
+
+    return [paths[index % len(paths)] for index in range(amount)]
+
+
+async def run_asgi(paths, clients: int, token: str, client_delay: float) -> list:
+    from django.core.handlers.asgi import ASGIHandler
+
+    application = ASGIHandler()
+
+    async def request(path: str, query: str) -> float:
+        started_at = time.perf_counter()
+        received = asyncio.Event()
+        status = []
+
+        async def receive():
+            if received.is_set():
+                # Nothing more from the client until it disconnects.
+                await asyncio.Event().wait()
+            received.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+            elif not message.get("more_body"):
+                await asyncio.sleep(client_delay)
+
+        await application(
+            {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": query.encode(),
+                "root_path": "",
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"authorization", f"Bearer {token}".encode()),
+                ],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            },
+            receive,
+            send,
+        )
+        assert status == [200], (path, query, status)
+
+        return time.perf_counter() - started_at
+
+    return await drive(paths, clients, request)
+
+
+async def run_wsgi(paths, clients: int, token: str, client_delay: float, threads: int):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    application = WSGIHandler()
+
+    def serve(path: str, query: str):
+        status = []
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "http",
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        response = application(environ, lambda code, headers: status.append(code))
+        b"".join(response)
+        response.close()
+        # The thread writes the response to the slow client.
+        time.sleep(client_delay)
+        assert status[0].startswith("200"), (path, query, status)
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(threads) as executor:
+
+        async def request(path: str, query: str) -> float:
+            started_at = time.perf_counter()
+            await loop.run_in_executor(executor, serve, path, query)
+            return time.perf_counter() - started_at
+
+        return await drive(paths, clients, request)
+
+
+async def drive(paths, clients: int, request) -> list:
+    """
+    The drive function sends the requests from `clients` concurrent clients, each one waiting for its response
+    before sending the next request, and returns the elapsed time and the latencies.
+    """
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def client():
+        while queue:
+            latencies.append(await request(*queue.pop()))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+
+    return [time.perf_counter() - started_at, sorted(latencies)]
+
+
+def main():
+    parser = base_parser(__doc__, planets=10_000)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per case.")
+    parser.add_argument(
+        "--threads", type=int, default=8, help="Threads of the WSGI worker."
+    )
+    parser.add_argument(
+        "--query-latency-ms",
+        type=float,
+        default=5.0,
+        help="Delay added to every query, like a remote database.",
+    )
+    parser.add_argument(
+        "--client-delay-ms",
+        type=float,
+        default=200.0,
+        help="Time a client takes to read a response.",
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from core.models import Planet
+    from user.tests.test_user_api import create_user
+
+    def slow_query(execute, sql, params, many, context):
+        time.sleep(args.query_latency_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def delay_queries(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow_query)
+
+    client_delay = args.client_delay_ms / 1000
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+        user = create_user(email="benchmark@example.com", password="benchmark123")
+        token = str(AccessToken.for_user(user))
+        planet_ids = list(
+            Planet.objects.order_by("?").values_list("id", flat=True)[:50]
+        )
+        paths = request_paths(args.requests, planet_ids)
+        connection_created.connect(delay_queries)
+
+        try:
+            for clients in CLIENTS:
+                for mode in MODES:
+                    with override_settings(
+                        ROOT_URLCONF=urlconf(async_views=mode == "asgi_async"),
+                        ALLOWED_HOSTS=["testserver"],
+                        API_CACHE_ENABLED=False,
+                    ):
+                        if mode == "wsgi":
+                            run = run_wsgi(
+                                paths, clients, token, client_delay, args.threads
+                            )
+                        else:
+                            run = run_asgi(paths, clients, token, client_delay)
+                        elapsed, latencies = asyncio.run(run)
+
+                    results.append(
+                        {
+                            "mode": mode,
+                            "clients": clients,
+                            "requests": len(latencies),
+                            "requests_per_second": round(len(latencies) / elapsed, 1),
+                            "median_ms": round(statistics.median(latencies) * 1000, 3),
+                            "p95_ms": round(
+                                latencies[int(len(latencies) * 0.95) - 1] * 1000, 3
+                            ),
+                        }
+                    )
+        finally:
+            connection_created.disconnect(delay_queries)
+            user.delete()
+
+    report("asgi_concurrency", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Shared helpers of the benchmark scripts.
+Every benchmark runs against a throwaway copy of the configured database (created like the test database), so the
+development data is never touched. Run them from the repository root, e.g. `python -m benchmarks.planet_filters`.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import re
+import statistics
+import time
+from typing import Callable, Iterator, Optional
+
+TERRAIN_NAMES = [f"terrain-{index:02}" for index in range(40)]
+CLIMATE_NAMES = [f"climate-{index:02}" for index in range(20)]
+# The seed of the catalog of every benchmark, the same planets are generated on every run.
+CATALOG_SEED = 0
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+
+    import django
+
+    django.setup()
+
+
+def base_parser(description: str, planets: int) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--planets",
+        type=int,
+        default=planets,
+        help="Number of planets in the catalog.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of timed runs per case."
+    )
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the benchmark database (and its catalog) between runs.",
+    )
+    parser.add_argument("--json", help="Write the results to this file as JSON.")
+
+    return parser
+
+
+@contextlib.contextmanager
+def benchmark_database(keepdb: bool = False) -> Iterator[None]:
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        if not keepdb:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def synthetic_records(amount: int, seed: int = CATALOG_SEED):
+    from core.ingest.records import PlanetRecord
+
+    rng = random.Random(seed)
+    for index in range(amount):
+        yield PlanetRecord(
+            name=f"planet-{index:08}",
+            population=int(rng.lognormvariate(14, 3)) if rng.random() > 0.1 else None,
+            terrains=tuple(rng.sample(TERRAIN_NAMES, rng.randint(1, 3))),
+            climates=tuple(rng.sample(CLIMATE_NAMES, rng.randint(1, 2))),
+        )
+
+
+def seed_planets(amount: int):
+    """
+    The seed_planets function fills the benchmark database with `amount` synthetic planets, unless a kept database
+    already holds them.
+    """
+    from core.ingest.copy_writer import CopyPlanetWriter
+    from core.models import Planet
+
+    if Planet.objects.count() >= amount:
+        return
+
+    stats = CopyPlanetWriter(batch_size=5000).write(synthetic_records(amount))
+    print(stats.summary())
+
+
+def measure(function: Callable, repeat: int) -> dict:
+    """
+    The measure function runs `function` once to warm up and then `repeat` times, returning timings in milliseconds.
+    """
+    function()
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def percentile(values: list[float], fraction: float) -> Optional[float]:
+    """
+    The percentile function returns the nearest-rank percentile of sorted `values`, None when there are none.
+    """
+    if not values:
+        return None
+
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def plan_indexes(plan: str, tables: list[str]) -> dict:
+    """
+    The plan_indexes function lists the indexes of `tables` used by a query plan and whether any of those tables is
+    read with a sequential scan, for PostgreSQL and SQLite plans.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        names = {
+            name
+            for table in tables
+            for name, constraint in connection.introspection.get_constraints(
+                cursor, table
+            ).items()
+            if constraint["index"] or constraint["primary_key"]
+        }
+
+    table_pattern = "|".join(re.escape(table) for table in tables)
+    sequential = re.search(
+        rf"Seq Scan on ({table_pattern})\b|\bSCAN ({table_pattern})\b(?! USING)", plan
+    )
+    used = sorted(name for name in names if re.search(rf"\b{re.escape(name)}\b", plan))
+    if re.search(r"USING INTEGER PRIMARY KEY", plan):
+        used.append("rowid")
+
+    return {"sequential_scan": bool(sequential), "indexes": used}
+
+
+def report(title: str, results: list[dict], json_path: str = None):
+    print(f"\n{title}")
+    for result in results:
+        print(json.dumps(result))
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump({"benchmark": title, "results": results}, file, indent=2)
@@ -0,0 +1,115 @@
+"""
+Benchmarks opening a PostgreSQL connection per request (Django's default with CONN_MAX_AGE = 0) against checking one
+out of the core.db.backends.postgresql pool. Every simulated request runs a small planet query and closes its
+connection, from several threads at once. For every mode and thread count it prints the request latency and, for the
+pool, its wait time and peak utilization.
+
+    python -m benchmarks.db_pool --planets 10000 --requests 2000 --keepdb
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+THREADS = [1, 4, 16]
+QUERY = "SELECT id, name FROM core_planet ORDER BY id LIMIT 10"
+ALIAS = "benchmark"
+
+
+def run(wrapper_class, settings_dict: dict, threads: int, requests: int) -> dict:
+    def worker(count: int) -> list[float]:
+        wrapper = wrapper_class(dict(settings_dict), alias=ALIAS)
+        timings = []
+        for _ in range(count):
+            started_at = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute(QUERY)
+                cursor.fetchall()
+            wrapper.close()
+            timings.append((time.perf_counter() - started_at) * 1000)
+
+        return timings
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        batches = executor.map(worker, [requests // threads] * threads)
+        timings = sorted(timing for batch in batches for timing in batch)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "threads": threads,
+        "requests": len(timings),
+        "requests_per_second": round(len(timings) / elapsed, 1),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = base_parser(__doc__, planets=10_000)
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Simulated requests per case."
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=10, help="Maximum size of the pool."
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from django.db import connection
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    from core.db import pool
+    from core.db.backends.postgresql.base import DatabaseWrapper as PooledWrapper
+
+    if connection.vendor != "postgresql":
+        print(
+            f"db_pool needs PostgreSQL, the configured database is {connection.vendor}"
+        )
+        return
+
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+        settings_dict = {
+            **connection.settings_dict,
+            "CONN_MAX_AGE": 0,
+            "POOL": {"MIN_SIZE": 0, "MAX_SIZE": args.pool_size},
+        }
+
+        for threads in THREADS:
+            results.append(
+                {
+                    "mode": "connect_per_request",
+                    **run(DatabaseWrapper, settings_dict, threads, args.requests),
+                }
+            )
+
+            result = run(PooledWrapper, settings_dict, threads, args.requests)
+            stats = pool.pool_stats()[ALIAS][0]
+            pool.close_pools(ALIAS)
+            results.append(
+                {
+                    "mode": "pooled",
+                    **result,
+                    "connections_created": stats["connections_created"],
+                    "max_in_use": stats["max_in_use"],
+                    "wait_time_avg_ms": stats["wait_time_avg_ms"],
+                    "wait_time_max_ms": stats["wait_time_max_ms"],
+                    "timeouts": stats["timeouts"],
+                }
+            )
+
+    report("db_pool", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Load-tests the API over HTTP. It seeds a synthetic catalog in a throwaway database, starts a server on it in a
+subprocess (`manage.py runserver` by default, any WSGI or ASGI server with `--server-command`) and drives every endpoint
+for `--duration` seconds with `--concurrency` clients, each one authenticated with its own JWT. It prints the
+throughput, the error count and the p50, p95 and p99 latencies of every endpoint, along with the commit and the
+parameters of the run, so that the results of two commits can be compared (`--json <file>`).
+The server must open the same database as the benchmark: a PostgreSQL database, or a SQLite file (not :memory:).
+Every request opens a new connection unless `--keep-alive` is given: runserver sends the headers and the body of a
+response in two packets, so on a kept-alive connection every response waits for the delayed ACK of the client (~40ms).
+Use `--keep-alive` with servers that turn Nagle's algorithm off, like gunicorn or uvicorn.
+
+    python -m benchmarks.http_load --planets 100000 --concurrency 16 --duration 10 --keepdb
+    python -m benchmarks.http_load --keep-alive --server-command "gunicorn app.wsgi -w 4 -b {host}:{port}"
+"""
+
+import contextlib
+import http.client
+import itertools
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from benchmarks.common import (
+    CATALOG_SEED,
+    CLIMATE_NAMES,
+    TERRAIN_NAMES,
+    base_parser,
+    benchmark_database,
+    percentile,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+HOST = "localhost"
+PASSWORD = "benchmark123"
+DEFAULT_SERVER_COMMAND = (
+    f"{sys.executable} manage.py runserver {{host}}:{{port}} --noreload"
+)
+DETAIL_PLANETS = 100
+
+
+@dataclass
+class Endpoint:
+    method: str
+    paths: list[str]
+    body: Optional[dict] = None
+    authenticated: bool = True
+
+
+@dataclass
+class Sample:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+
+def build_endpoints(planet_ids: list[int], email: str) -> dict[str, Endpoint]:
+    return {
+        "user_token": Endpoint(
+            "POST",
+            ["/api/user/token/"],
+            body={"email": email, "password": PASSWORD},
+            authenticated=False,
+        ),
+        "user_me": Endpoint("GET", ["/api/user/me/"]),
+        "planet_list": Endpoint("GET", ["/api/planet/planet/?page_size=20"]),
+        "planet_filter": Endpoint(
+            "GET",
+            [
+                # Names of the synthetic catalog, so the filtered pages hold planets.
+                f"/api/planet/planet/?page_size=20&terrain={TERRAIN_NAMES[0]}",
+                f"/api/planet/planet/?page_size=20&climate={CLIMATE_NAMES[0]}&population_min=1000000",
+            ],
+        ),
+        "planet_detail": Endpoint(
+            "GET", [f"/api/planet/planet/{planet_id}/" for planet_id in planet_ids]
+        ),
+        "planet_search": Endpoint(
+            "GET",
+            [f"/api/planet/planet/search/?q=planet-0{digit}" for digit in range(10)],
+        ),
+        "planet_statistics": Endpoint("GET", ["/api/planet/statistics/"]),
+        "terrain_list": Endpoint("GET", ["/api/terrains/terrain/"]),
+        "climate_list": Endpoint("GET", ["/api/climate/climate/"]),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@contextlib.contextmanager
+def running_server(command: str, port: int, env: dict) -> Iterator[None]:
+    """
+    The running_server function starts the server command in a subprocess and waits until it accepts connections,
+    its output goes to a log file that is printed if it fails to start.
+    """
+    with tempfile.TemporaryFile("w+") as log:
+        process = subprocess.Popen(
+            shlex.split(command.format(host=HOST, port=port)),
+            cwd=ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    log.seek(0)
+                    raise RuntimeError(f"The server did not start:\n{log.read()}")
+                with contextlib.suppress(OSError):
+                    socket.create_connection((HOST, port), timeout=1).close()
+                    break
+                time.sleep(0.2)
+
+            yield
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def drive(
+    endpoint: Endpoint,
+    port: int,
+    tokens: list[str],
+    duration: float,
+    keep_alive: bool,
+) -> tuple[Sample, float]:
+    """
+    The drive function sends the requests of an endpoint from one thread per token for `duration` seconds, every
+    client sending its next request as soon as it gets a response, and returns the latencies and the elapsed time.
+    """
+    sample = Sample()
+    lock = threading.Lock()
+    paths = itertools.cycle(endpoint.paths)
+    body = json.dumps(endpoint.body) if endpoint.body else None
+    deadline = time.perf_counter() + duration
+
+    def client(token: str):
+        headers = {"Content-Type": "application/json"}
+        if endpoint.authenticated:
+            headers["Authorization"] = f"Bearer {token}"
+        connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        latencies, errors = [], 0
+        while time.perf_counter() < deadline:
+            with lock:
+                path = next(paths)
+            started_at = time.perf_counter()
+            try:
+                connection.request(endpoint.method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                continue
+            if not keep_alive:
+                connection.close()
+            if response.status >= 400:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started_at)
+        connection.close()
+
+        with lock:
+            sample.latencies.extend(latencies)
+            sample.errors += errors
+
+    started_at = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(token,)) for token in tokens]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sample, time.perf_counter() - started_at
+
+
+def milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def create_users(amount: int) -> list:
+    """
+    The create_users function creates one user per client, hashing their shared password once.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    model = get_user_model()
+    emails = [f"load-{index}@example.com" for index in range(amount)]
+    password = make_password(PASSWORD)
+    model.objects.bulk_create(
+        [model(email=email, name=email, password=password) for email in emails],
+        ignore_conflicts=True,
+    )
+
+    return list(model.objects.filter(email__in=emails).order_by("email"))
+
+
+def main():
+    parser = base_parser(__doc__, planets=100_000)
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Number of concurrent clients."
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds measured per endpoint."
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=2, help="Seconds of warm-up per endpoint."
+    )
+    parser.add_argument(
+        "--endpoints", help="Comma separated endpoints to run, all of them by default."
+    )
+    parser.add_argument(
+        "--server-command",
+        default=DEFAULT_SERVER_COMMAND,
+        help="Command starting the server, with {host} and {port} placeholders.",
+    )
+    parser.add_argument(
+        "--keep-alive",
+        action="store_true",
+        help="Send the requests of a client over one connection.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Turn the response cache off."
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from django.db import connection
+    from django.db.models.functions import Mod
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from core.models import Planet
+
+    port = free_port()
+    results = []
+    with benchmark_database(args.keepdb):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            raise SystemExit("The server can't open an in-memory SQLite database.")
+
+        seed_planets(args.planets)
+        users = create_users(args.concurrency)
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        catalog_size = Planet.objects.count()
+        # Every n-th planet by id, so two runs on the same catalog request the same planets.
+        step = max(catalog_size // DETAIL_PLANETS, 1)
+        planet_ids = list(
+            Planet.objects.annotate(remainder=Mod("id", step))
+            .filter(remainder=0)
+            .order_by("id")
+            .values_list("id", flat=True)[:DETAIL_PLANETS]
+        )
+        endpoints = build_endpoints(planet_ids, users[0].email)
+        if args.endpoints:
+            endpoints = {
+                name: endpoints[name] for name in args.endpoints.split(",") if name
+            }
+
+        env = {
+            **os.environ,
+            "DB_NAME": connection.settings_dict["NAME"],
+            "API_CACHE_ENABLED": "false" if args.no_cache else "true",
+        }
+        run = {
+            "commit": git_revision(),
+            "planets": catalog_size,
+            "seed": CATALOG_SEED,
+            "concurrency": args.concurrency,
+            "server": args.server_command.replace(sys.executable, "python"),
+            "cache": not args.no_cache,
+            "keep_alive": args.keep_alive,
+        }
+        with running_server(args.server_command, port, env):
+            for name, endpoint in endpoints.items():
+                drive(endpoint, port, tokens, args.warmup, args.keep_alive)
+                sample, elapsed = drive(
+                    endpoint, port, tokens, args.duration, args.keep_alive
+                )
+                latencies = sorted(sample.latencies)
+                results.append(
+                    {
+                        **run,
+                        "endpoint": name,
+                        "requests": len(latencies),
+                        "errors": sample.errors,
+                        "requests_per_second": round(len(latencies) / elapsed, 1),
+                        "p50_ms": milliseconds(percentile(latencies, 0.50)),
+                        "p95_ms": milliseconds(percentile(latencies, 0.95)),
+                        "p99_ms": milliseconds(percentile(latencies, 0.99)),
+                    }
+                )
+
+    report("http_load", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
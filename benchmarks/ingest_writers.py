@@ -0,0 +1,61 @@
+"""
+Benchmarks the planet ingestion writers on a synthetic catalog: BulkPlanetWriter (batched ORM statements) and
+CopyPlanetWriter (COPY into a staging table merged with set-based SQL, PostgreSQL only, it runs the bulk writer on the
+other databases). Every writer loads the catalog into an empty database and then loads it again over itself, it prints
+the median time and rows per second of both cases.
+
+    python -m benchmarks.ingest_writers --planets 1000000
+"""
+
+import statistics
+import time
+
+from benchmarks.common import base_parser, benchmark_database, report, setup_django
+
+
+def main():
+    parser = base_parser(__doc__, planets=100_000)
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="Planets per batch or chunk."
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from django.core.management import call_command
+
+    from core.ingest.bulk import BulkPlanetWriter
+    from core.ingest.copy_writer import CopyPlanetWriter
+    from core.ingest.synthetic import SyntheticCatalog
+
+    writers = {"bulk": BulkPlanetWriter, "copy": CopyPlanetWriter}
+    catalog = SyntheticCatalog(args.planets)
+    results = []
+    with benchmark_database(args.keepdb):
+        for name, writer_class in writers.items():
+            timings = {"empty": [], "reload": []}
+            rows = {}
+            for _ in range(args.repeat):
+                call_command("flush", interactive=False, verbosity=0)
+                for case in timings:
+                    started_at = time.perf_counter()
+                    stats = writer_class(batch_size=args.batch_size).write(catalog)
+                    timings[case].append(time.perf_counter() - started_at)
+                    rows[case] = stats.rows
+
+            for case, elapsed in timings.items():
+                median = statistics.median(elapsed)
+                results.append(
+                    {
+                        "writer": name,
+                        "case": case,
+                        "planets": args.planets,
+                        "median_s": round(median, 3),
+                        "rows_per_second": round(rows[case] / median),
+                    }
+                )
+
+    report("ingest_writers", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
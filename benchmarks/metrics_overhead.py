@@ -0,0 +1,92 @@
+"""
+Benchmarks the overhead of the request metrics (core.middleware.MetricsMiddleware) on the planet endpoints, with the
+metrics off (the middleware removed), kept in memory, and written to METRICS_DIR for several worker processes. It
+prints the time per request of every case, and the time to render /metrics once every route has been recorded.
+
+    python -m benchmarks.metrics_overhead --planets 10000 --requests 2000 --keepdb
+"""
+
+import tempfile
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    measure,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+MODES = ["off", "memory", "metrics_dir"]
+
+
+def main():
+    parser = base_parser(__doc__, planets=10_000)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run.")
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from core import metrics
+    from core.models import Planet
+    from user.tests.test_user_api import create_user
+
+    middleware = [
+        name
+        for name in settings.MIDDLEWARE
+        if name != "core.middleware.MetricsMiddleware"
+    ]
+    results = []
+    with benchmark_database(args.keepdb), tempfile.TemporaryDirectory() as directory:
+        seed_planets(args.planets)
+        user = create_user(email="benchmark@example.com", password="benchmark123")
+        client = Client(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        planet_id = Planet.objects.values_list("id", flat=True).first()
+        paths = {
+            "planet_detail": f"/api/planet/planet/{planet_id}/",
+            "planet_list": "/api/planet/planet/?page_size=20",
+        }
+
+        try:
+            for name, path in paths.items():
+                for mode in MODES:
+                    overrides = {
+                        "ALLOWED_HOSTS": ["testserver"],
+                        "API_CACHE_ENABLED": False,
+                        "METRICS_DIR": "",
+                    }
+                    if mode == "off":
+                        overrides["MIDDLEWARE"] = middleware
+                    elif mode == "metrics_dir":
+                        overrides["METRICS_DIR"] = directory
+
+                    def run():
+                        for _ in range(args.requests):
+                            assert client.get(path).status_code == 200
+
+                    with override_settings(**overrides):
+                        timings = measure(run, args.repeat)
+                    results.append(
+                        {
+                            "endpoint": name,
+                            "mode": mode,
+                            "per_request_us": round(
+                                timings["median_ms"] * 1000 / args.requests, 1
+                            ),
+                        }
+                    )
+
+            with override_settings(METRICS_DIR=directory):
+                scrape = measure(lambda: metrics.render(metrics.collect()), args.repeat)
+            results.append({"endpoint": "metrics", "scrape_ms": scrape["median_ms"]})
+        finally:
+            user.delete()
+
+    report("metrics_overhead", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmarks the planet filters: for every filter it prints the query plan summary (indexes used and whether a planet
+table is read sequentially) and the time to fetch the first page, as served by PlanetViewSet.
+
+    python -m benchmarks.planet_filters --planets 1000000 --keepdb
+"""
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    measure,
+    plan_indexes,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+PLANET_TABLES = ["core_planet", "core_planet_terrains", "core_planet_climates"]
+CASES = {
+    "terrain_any": "terrain=terrain-01,terrain-02",
+    "terrain_all": "terrain=terrain-01,terrain-02&terrain_match=all",
+    "climate_any": "climate=climate-03",
+    "climate_all": "climate=climate-03,climate-04&climate_match=all",
+    "population_range": "population_min=1000000&population_max=1001000",
+    "name_prefix": "name_prefix=planet-0000012",
+}
+
+
+def filtered_queryset(query: str):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from planet.filters import PlanetFilterBackend
+    from planet.views import PlanetViewSet
+
+    request = Request(APIRequestFactory().get(f"/api/planet/planet/?{query}"))
+    view = PlanetViewSet(action="list", request=request)
+
+    return PlanetFilterBackend().filter_queryset(
+        request, PlanetViewSet.queryset.order_by("id"), view
+    )
+
+
+def main():
+    args = base_parser(__doc__, planets=1_000_000).parse_args()
+    setup_django()
+
+    from django.db import connection
+
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        for name, query in CASES.items():
+            queryset = filtered_queryset(query)
+            page = queryset[:100]
+            results.append(
+                {
+                    "case": name,
+                    "query": query,
+                    "planets": args.planets,
+                    "rows": len(list(page)),
+                    **plan_indexes(page.explain(), PLANET_TABLES),
+                    **measure(lambda: list(queryset[:100]), args.repeat),
+                }
+            )
+
+    report("planet_filters", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
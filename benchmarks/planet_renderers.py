@@ -0,0 +1,73 @@
+"""
+Benchmarks the renderers and parsers on planet list pages: the DRF JSON renderer and parser, their orjson
+counterparts and MessagePack. For every page size it prints the encode and decode time and the payload size.
+
+    python -m benchmarks.planet_renderers --planets 100000 --keepdb
+"""
+
+import io
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    measure,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+PAGE_SIZES = [100, 1000, 10000]
+
+
+def main():
+    args = base_parser(__doc__, planets=100_000).parse_args()
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.parsers import MessagePackParser, ORJSONParser
+    from core.renderers import MessagePackRenderer, ORJSONRenderer
+    from planet.serializers import PlanetRowSerializer
+    from planet.views import PlanetViewSet
+
+    formats = {
+        "drf_json": (JSONRenderer(), JSONParser()),
+        "orjson": (ORJSONRenderer(), ORJSONParser()),
+        "msgpack": (MessagePackRenderer(), MessagePackParser()),
+    }
+
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+
+        for page_size in PAGE_SIZES:
+            serializer = PlanetRowSerializer()
+            rows = list(
+                serializer.rows(PlanetViewSet.queryset.order_by("id"))[:page_size]
+            )
+            page = {
+                "next": None,
+                "previous": None,
+                "results": serializer.to_representation(rows),
+            }
+
+            for name, (renderer, parser) in formats.items():
+                body = renderer.render(page)
+                encode = measure(lambda: renderer.render(page), args.repeat)
+                decode = measure(lambda: parser.parse(io.BytesIO(body)), args.repeat)
+                results.append(
+                    {
+                        "format": name,
+                        "page_size": len(rows),
+                        "bytes": len(body),
+                        "encode_median_ms": encode["median_ms"],
+                        "decode_median_ms": decode["median_ms"],
+                    }
+                )
+
+    report("planet_renderers", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmarks the planet search: for every query it prints whether the search runs on pg_trgm or on the substring
+fallback, the query plan summary of the name match and the latency of planet.search.search_planets.
+
+    python -m benchmarks.planet_search --planets 1000000 --keepdb
+"""
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    measure,
+    plan_indexes,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+PLANET_TABLES = ["core_planet", "core_planet_terrains", "core_planet_climates"]
+CASES = {
+    "exact": ("planet-00000123", False),
+    "prefix": ("planet-000012", False),
+    "typo": ("plnaet-00000123", False),
+    "infix": ("0000123", False),
+    "related": ("terrain-07", True),
+}
+
+
+def main():
+    args = base_parser(__doc__, planets=1_000_000).parse_args()
+    setup_django()
+
+    from django.db import connection
+
+    from core.models import Planet
+    from planet import search
+
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        trigram = search.trigram_available()
+        matches = search.trigram_matches if trigram else search.substring_matches
+        for name, (query, related) in CASES.items():
+            plan = matches(Planet.objects.all(), query).order_by("-rank")[
+                : search.DEFAULT_LIMIT
+            ]
+            results.append(
+                {
+                    "case": name,
+                    "query": query,
+                    "related": related,
+                    "planets": args.planets,
+                    "backend": "pg_trgm" if trigram else "substring",
+                    "rows": len(search.search_planets(query, related=related)),
+                    **plan_indexes(plan.explain(), PLANET_TABLES),
+                    **measure(
+                        lambda: search.search_planets(query, related=related),
+                        args.repeat,
+                    ),
+                }
+            )
+
+    report("planet_search", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmarks the serialization of planet list pages: PlanetSerializer over prefetched model instances against
+PlanetRowSerializer over `.values()` rows, for several page sizes. Both timings include the queries and rendering the
+page to JSON bytes.
+
+    python -m benchmarks.planet_serialization --planets 100000 --keepdb
+"""
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    measure,
+    report,
+    seed_planets,
+    setup_django,
+)
+
+PAGE_SIZES = [100, 1000]
+
+
+def main():
+    args = base_parser(__doc__, planets=100_000).parse_args()
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from planet.serializers import PlanetRowSerializer, PlanetSerializer
+    from planet.views import PlanetViewSet
+
+    def render_serializer(page_size: int) -> bytes:
+        page = PlanetViewSet.queryset.order_by("id")[:page_size]
+        return JSONRenderer().render(PlanetSerializer(page, many=True).data)
+
+    def render_rows(page_size: int) -> bytes:
+        serializer = PlanetRowSerializer()
+        page = list(serializer.rows(PlanetViewSet.queryset.order_by("id"))[:page_size])
+        return JSONRenderer().render(serializer.to_representation(page))
+
+    results = []
+    with benchmark_database(args.keepdb):
+        seed_planets(args.planets)
+
+        for page_size in PAGE_SIZES:
+            serializer = measure(lambda: render_serializer(page_size), args.repeat)
+            rows = measure(lambda: render_rows(page_size), args.repeat)
+            results.append(
+                {
+                    "page_size": page_size,
+                    "planets": args.planets,
+                    "identical": render_serializer(page_size) == render_rows(page_size),
+                    "serializer_median_ms": serializer["median_ms"],
+                    "rows_median_ms": rows["median_ms"],
+                    "speedup": round(serializer["median_ms"] / rows["median_ms"], 2),
+                }
+            )
+
+    report("planet_serialization", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -69,4 +69,4 @@ class PrivateProductApiTests(TestCase):
         res = self.client_api.get(CREATE_GET_CLIMATE_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data[0]["id"], self.climate.id)
+        self.assertEqual(res.data["results"][0]["id"], self.climate.id)
@@ -1,10 +1,20 @@
 from rest_framework import viewsets, permissions
 
+from core import cache
 from core.models import Climate
+from core.pagination import IdCursorPagination
+from core.views import AsyncReadMixin
 from climate.serializers import ClimateSerializer
 
 
-class ClimateViewSet(viewsets.ModelViewSet):
+class ClimateViewSet(
+    cache.ConditionalGetMixin,
+    cache.CachedResponseMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
+    cache_resource = cache.CLIMATE
     serializer_class = ClimateSerializer
     queryset = Climate.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = IdCursorPagination
@@ -68,7 +68,18 @@ class PlanetAdmin(admin.ModelAdmin):
     ]
 
 
+class RevokedTokenAdmin(admin.ModelAdmin):
+    ordering = ["-revoked_at"]
+    list_display = ["jti", "user", "revoked_at", "expires_at"]
+    search_fields = ["jti", "user__email"]
+    readonly_fields = ["jti", "user", "revoked_at", "expires_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Climate, ClimateAdmin)
 admin.site.register(models.Terrain, TerrainAdmin)
 admin.site.register(models.Planet, PlanetAdmin)
+admin.site.register(models.RevokedToken, RevokedTokenAdmin)
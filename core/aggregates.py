@@ -0,0 +1,203 @@
+import contextlib
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from django.db import transaction
+from django.db.models import (
+    BigIntegerField,
+    Count,
+    F,
+    Max,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from core import models
+
+TERRAIN = "terrain"
+CLIMATE = "climate"
+# The summary model, the through table and the target column of every dimension.
+DIMENSIONS = {
+    TERRAIN: (models.TerrainPopulation, models.Planet.terrains.through, "terrain_id"),
+    CLIMATE: (models.ClimatePopulation, models.Planet.climates.through, "climate_id"),
+}
+
+_state = threading.local()
+
+
+@contextlib.contextmanager
+def suspended() -> Iterator[None]:
+    """
+    The suspended function turns off the incremental maintenance of the summaries in this thread, for bulk writes
+    that refresh them once at the end instead of paying a few statements per planet.
+    """
+    _state.suspended = getattr(_state, "suspended", 0) + 1
+    try:
+        yield
+    finally:
+        _state.suspended -= 1
+
+
+def is_suspended() -> bool:
+    return getattr(_state, "suspended", 0) > 0
+
+
+@dataclass(frozen=True)
+class Delta:
+    """
+    The aggregates of a set of planets, added to or removed from the summaries of the terrains or climates they are
+    linked to.
+    """
+
+    planets: int = 0
+    populated_planets: int = 0
+    total_population: int = 0
+    max_population: Optional[int] = None
+
+    @classmethod
+    def of_planet(cls, population: Optional[int]) -> "Delta":
+        return cls(
+            planets=1,
+            populated_planets=int(population is not None),
+            total_population=population or 0,
+            max_population=population,
+        )
+
+    @classmethod
+    def of_planets(cls, planet_ids: Iterable[int], using: str = "default") -> "Delta":
+        values = (
+            models.Planet.objects.using(using)
+            .filter(id__in=planet_ids)
+            .aggregate(
+                planets=Count("id"),
+                populated_planets=Count("population"),
+                total_population=Coalesce(Sum("population"), 0),
+                max_population=Max("population"),
+            )
+        )
+
+        return cls(**values)
+
+
+def summarize(dimension: str, target_ids: Iterable[int] = None, using: str = "default"):
+    """
+    The summarize function aggregates the planets of every terrain or climate (or only of `target_ids`) with one
+    grouped query over the through table.
+    """
+    _, through, target_field = DIMENSIONS[dimension]
+    links = through.objects.using(using)
+    if target_ids is not None:
+        links = links.filter(**{f"{target_field}__in": target_ids})
+
+    return links.values(target_field).annotate(
+        planets=Count("planet_id"),
+        populated_planets=Count("planet__population"),
+        total_population=Coalesce(Sum("planet__population"), 0),
+        max_population=Max("planet__population"),
+    )
+
+
+def refresh(dimension: str, target_ids: Iterable[int] = None, using: str = "default"):
+    """
+    The refresh function recomputes the summaries of `target_ids`, or of every terrain or climate, from the planets.
+    """
+    model, _, target_field = DIMENSIONS[dimension]
+    if target_ids is not None:
+        target_ids = list(target_ids)
+
+    with transaction.atomic(using=using):
+        summaries = model.objects.using(using)
+        if target_ids is not None:
+            summaries = summaries.filter(pk__in=target_ids)
+        summaries.delete()
+
+        model.objects.using(using).bulk_create(
+            [model(**row) for row in summarize(dimension, target_ids, using)],
+            batch_size=1000,
+        )
+
+
+def rebuild(using: str = "default"):
+    for dimension in DIMENSIONS:
+        refresh(dimension, using=using)
+
+
+def add(
+    dimension: str, target_ids: Iterable[int], delta: Delta, using: str = "default"
+):
+    """
+    The add function adds the planets of `delta` to the summaries of `target_ids`, creating the missing ones.
+    Every summary is updated in place with one statement, so concurrent writers don't lose updates.
+    """
+    model, _, target_field = DIMENSIONS[dimension]
+    target_ids = list(target_ids)
+    if not target_ids or not delta.planets:
+        return
+
+    manager = model.objects.using(using)
+    manager.bulk_create(
+        [model(**{target_field: target_id}) for target_id in target_ids],
+        ignore_conflicts=True,
+    )
+
+    updates = {
+        "planets": F("planets") + delta.planets,
+        "populated_planets": F("populated_planets") + delta.populated_planets,
+        "total_population": F("total_population") + delta.total_population,
+    }
+    if delta.max_population is not None:
+        maximum = Value(delta.max_population, output_field=BigIntegerField())
+        updates["max_population"] = Greatest(
+            Coalesce("max_population", maximum), maximum
+        )
+    manager.filter(pk__in=target_ids).update(**updates)
+
+
+def remove(
+    dimension: str, target_ids: Iterable[int], delta: Delta, using: str = "default"
+):
+    """
+    The remove function takes the planets of `delta` out of the summaries of `target_ids`, once they are no longer
+    linked. A maximum can't be decremented, so the maximum of the summaries that may have lost it is recomputed.
+    """
+    model, through, target_field = DIMENSIONS[dimension]
+    target_ids = list(target_ids)
+    if not target_ids or not delta.planets:
+        return
+
+    summaries = model.objects.using(using).filter(pk__in=target_ids)
+    summaries.update(
+        planets=F("planets") - delta.planets,
+        populated_planets=F("populated_planets") - delta.populated_planets,
+        total_population=F("total_population") - delta.total_population,
+    )
+
+    if delta.max_population is not None:
+        maximum = (
+            through.objects.using(using)
+            .filter(**{target_field: OuterRef("pk")})
+            .values(target_field)
+            .annotate(maximum=Max("planet__population"))
+            .values("maximum")
+        )
+        summaries.filter(max_population__lte=delta.max_population).update(
+            max_population=Subquery(maximum)
+        )
+
+
+def planet_links(planet_id: int, using: str = "default") -> dict[str, list[int]]:
+    """
+    The planet_links function returns the terrain and climate ids of a planet.
+    """
+    return {
+        dimension: list(
+            through.objects.using(using)
+            .filter(planet_id=planet_id)
+            .values_list(target_field, flat=True)
+        )
+        for dimension, (_, through, target_field) in DIMENSIONS.items()
+    }
@@ -0,0 +1,300 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from core import models
+
+PLANET = "planet"
+TERRAIN = "terrain"
+CLIMATE = "climate"
+# Terrain and climate names are rendered inside the planets, so changing them must also invalidate the planets.
+DEPENDENT_RESOURCES = {
+    PLANET: (PLANET,),
+    TERRAIN: (TERRAIN, PLANET),
+    CLIMATE: (CLIMATE, PLANET),
+}
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def get_api_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version(resource: str) -> Optional[int]:
+    """
+    The get_version function returns the version of a resource, read from the database that serves its reads (a
+    replica holds the version matching its rows). None when the resource has no version row (e.g. after a flush),
+    its responses are then neither cached nor tagged until its next write.
+    """
+    return (
+        models.ResourceVersion.objects.filter(resource=resource)
+        .values_list("version", flat=True)
+        .first()
+    )
+
+
+async def aget_version(resource: str) -> Optional[int]:
+    return (
+        await models.ResourceVersion.objects.filter(resource=resource)
+        .values_list("version", flat=True)
+        .afirst()
+    )
+
+
+def bump_version(resource: str, using: Optional[str] = None):
+    """
+    The bump_version function invalidates every cached response and ETag of `resource` and of the resources rendering
+    it. The versions are bumped in the transaction of the write, so the writer reads its own writes and the other
+    processes see the new versions with the write when it commits. The versions move to the current time in
+    nanoseconds when it is ahead, so after a rolled back write or a flush they never go back to a value used by
+    responses that may still be cached.
+    """
+    dependents = DEPENDENT_RESOURCES[resource]
+    versions = models.ResourceVersion.objects.db_manager(using)
+    bumped = versions.filter(resource__in=dependents).update(
+        version=Greatest(F("version") + 1, Value(time.time_ns()))
+    )
+    if bumped < len(dependents):
+        versions.bulk_create(
+            [
+                models.ResourceVersion(resource=dependent, version=time.time_ns())
+                for dependent in dependents
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def request_location(request) -> str:
+    """
+    The request_location function identifies a request by its absolute path and sorted query parameters, so
+    `?a=1&b=2` and `?b=2&a=1` are the same location.
+    """
+    query = sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values
+    )
+
+    return f"{request.build_absolute_uri(request.path)}?{query}"
+
+
+def response_cache_key(resource: str, version: int, request) -> str:
+    digest = hashlib.sha1(request_location(request).encode("utf-8")).hexdigest()
+
+    return f"api:response:{resource}:{version}:{digest}"
+
+
+def response_etag(resource: str, version: int, request) -> str:
+    """
+    The response_etag function returns a strong ETag for a response without looking at its body: the representation
+    only depends on the resource version, the location and the negotiated media type.
+    """
+    media_type = getattr(request, "accepted_media_type", "")
+    digest = hashlib.sha1(
+        f"{resource}:{version}:{request_location(request)}:{media_type}".encode("utf-8")
+    ).hexdigest()
+
+    return f'"{digest}"'
+
+
+def record(resource: str, outcome: str):
+    with _stats_lock:
+        _stats[(resource, outcome)] += 1
+
+
+def response_cache_stats() -> dict:
+    """
+    The response_cache_stats function returns the hit and miss counters of this process, per resource.
+    """
+    with _stats_lock:
+        snapshot = dict(_stats)
+
+    return {
+        resource: {
+            "hits": snapshot.get((resource, "hit"), 0),
+            "misses": snapshot.get((resource, "miss"), 0),
+        }
+        for resource in DEPENDENT_RESOURCES
+    }
+
+
+def clear_response_cache():
+    get_api_cache().clear()
+    with _stats_lock:
+        _stats.clear()
+
+
+class ResourceVersionMixin:
+    cache_resource: str = None
+
+    def get_resource_version(self) -> Optional[int]:
+        """
+        The get_resource_version function reads the resource version once per request, a viewset instance only serves
+        one request.
+        """
+        if not hasattr(self, "_resource_version"):
+            self._resource_version = get_version(self.cache_resource)
+
+        return self._resource_version
+
+    async def aget_resource_version(self) -> Optional[int]:
+        if not hasattr(self, "_resource_version"):
+            self._resource_version = await aget_version(self.cache_resource)
+
+        return self._resource_version
+
+
+class ConditionalGetMixin(ResourceVersionMixin):
+    """
+    Adds ETag and If-None-Match support to the list and retrieve handlers of a viewset, and to their async
+    counterparts (see core.views.AsyncReadMixin).
+    The ETag is derived from the resource version (see core.signals), so a matching request is answered with 304 Not
+    Modified after reading that version only, without querying or serializing the resource.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().aretrieve, request, *args, **kwargs
+        )
+
+    @staticmethod
+    def etag_matches(etag: str, if_none_match: str) -> bool:
+        """
+        The etag_matches function applies the weak comparison required by If-None-Match (RFC 9110, 13.1.2).
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+
+        return etag in (tag.removeprefix("W/") for tag in parse_etags(if_none_match))
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        # The ETag is computed before reading the data: if a write lands in between, the ETag is older than the body
+        # and the next request gets a full response instead of a wrong 304.
+        version = self.get_resource_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+
+        etag = response_etag(self.cache_resource, version, request)
+        if self.etag_matches(etag, request.headers.get("If-None-Match")):
+            return self.not_modified_response(etag)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+
+        return response
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        version = await self.aget_resource_version()
+        if version is None:
+            return await handler(request, *args, **kwargs)
+
+        etag = response_etag(self.cache_resource, version, request)
+        if self.etag_matches(etag, request.headers.get("If-None-Match")):
+            return self.not_modified_response(etag)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+
+        return response
+
+    @staticmethod
+    def not_modified_response(etag: str) -> Response:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = etag
+
+        return response
+
+
+class CachedResponseMixin(ResourceVersionMixin):
+    """
+    Serves list and retrieve responses of a viewset, sync or async, from the API cache.
+    Authentication and permissions run before the handlers, so only authorized requests can read the cache. Entries
+    are keyed by the resource version, which is bumped by every write (see core.signals), so they never go stale.
+    A hit costs the read of that version only.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.API_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+
+        version = self.get_resource_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+
+        cache = get_api_cache()
+        key = response_cache_key(self.cache_resource, version, request)
+        data = cache.get(key)
+        if data is not None:
+            return self.cache_hit_response(data)
+
+        record(self.cache_resource, "miss")
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data)
+        response["X-Cache"] = "MISS"
+
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        if not settings.API_CACHE_ENABLED:
+            return await handler(request, *args, **kwargs)
+
+        version = await self.aget_resource_version()
+        if version is None:
+            return await handler(request, *args, **kwargs)
+
+        cache = get_api_cache()
+        key = response_cache_key(self.cache_resource, version, request)
+        data = await cache.aget(key)
+        if data is not None:
+            return self.cache_hit_response(data)
+
+        record(self.cache_resource, "miss")
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data)
+        response["X-Cache"] = "MISS"
+
+        return response
+
+    def cache_hit_response(self, data) -> Response:
+        record(self.cache_resource, "hit")
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+
+        return response
@@ -0,0 +1,82 @@
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+from core.db import pool
+from core.db.backends.postgresql.creation import DatabaseCreation
+
+TRANSACTION_STATUS_IDLE = 0
+
+
+def check_connection(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+def reset_connection(connection) -> bool:
+    """
+    The reset_connection function rolls back the transaction left open on a returned connection and reports whether
+    it can be reused. Session settings are kept, they are set again by Django on every checkout.
+    """
+    if connection.closed:
+        return False
+    if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+    return connection.info.transaction_status == TRANSACTION_STATUS_IDLE
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The PostgreSQL backend with the connections kept in a process wide pool instead of being opened and closed for
+    every request. Closing a connection (at the end of a request with CONN_MAX_AGE = 0) returns it to the pool.
+    The pool is configured with the POOL key of the database settings: MIN_SIZE, MAX_SIZE, TIMEOUT, MAX_LIFETIME,
+    MAX_IDLE and CHECK.
+    """
+
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_pool(self, conn_params: dict) -> pool.ConnectionPool:
+        options = self.settings_dict.get("POOL", {})
+        key = (self.alias, tuple(sorted((k, repr(v)) for k, v in conn_params.items())))
+
+        return pool.get_pool(
+            self.alias,
+            key,
+            lambda: pool.ConnectionPool(
+                connect=lambda: base.DatabaseWrapper.get_new_connection(
+                    self, conn_params
+                ),
+                min_size=options.get("MIN_SIZE", 0),
+                max_size=options.get("MAX_SIZE", 10),
+                timeout=options.get("TIMEOUT", 30.0),
+                max_lifetime=options.get("MAX_LIFETIME", 3600.0),
+                max_idle=options.get("MAX_IDLE", 600.0),
+                check=check_connection if options.get("CHECK", True) else None,
+                reset=reset_connection,
+            ),
+        )
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.checkout()
+        # The pooled connection may have been opened by another thread, whose wrapper got the isolation level.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.checkin(self.connection)
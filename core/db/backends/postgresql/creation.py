@@ -0,0 +1,18 @@
+from django.db.backends.postgresql import creation
+
+from core.db import pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """
+    Closes the pooled connections before the test database is dropped, PostgreSQL refuses to drop a database with
+    open connections.
+    """
+
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        pool.close_pools(self.connection.alias)
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        pool.close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,303 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+@dataclass
+class PooledConnection:
+    connection: object
+    created_at: float
+    idle_since: float
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    connections_created: int = 0
+    connections_closed: int = 0
+    health_check_failures: int = 0
+    max_in_use: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of DB-API connections, shared by the threads of a process.
+    At most `max_size` connections are open, a checkout waits up to `timeout` seconds for one to be returned. Idle
+    connections are reused most recent first, checked with `check` before being handed out, closed once older than
+    `max_lifetime` and, above `min_size`, once idle for more than `max_idle` seconds. Eviction happens on checkout and
+    checkin, there is no background thread.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_lifetime: float = 3600.0,
+        max_idle: float = 600.0,
+        check: Optional[Callable[[object], None]] = None,
+        reset: Optional[Callable[[object], bool]] = None,
+        close: Callable[[object], None] = lambda connection: connection.close(),
+    ):
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check = check
+        self.reset = reset
+        self.close_connection = close
+
+        self.condition = threading.Condition()
+        self.idle: list[PooledConnection] = []
+        self.in_use: dict[int, PooledConnection] = {}
+        # Open connections, including the ones being opened outside of the lock.
+        self.size = 0
+        self.stats = PoolStats()
+
+    def open(self):
+        """
+        The open function opens the `min_size` connections up front.
+        """
+        while True:
+            with self.condition:
+                if self.size >= self.min_size:
+                    return
+                self.size += 1
+            pooled = self.create()
+            with self.condition:
+                self.idle.append(pooled)
+                self.condition.notify()
+
+    def create(self) -> PooledConnection:
+        """
+        The create function opens a connection for a slot already counted in `size`, releasing it on failure.
+        """
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.stats.connections_created += 1
+
+        now = time.monotonic()
+        return PooledConnection(connection, created_at=now, idle_since=now)
+
+    def checkout(self):
+        started_at = time.monotonic()
+        deadline = started_at + self.timeout
+        while True:
+            pooled = self.acquire(deadline)
+            if pooled is None:
+                pooled = self.create()
+            elif not self.healthy(pooled):
+                continue
+            break
+
+        waited = time.monotonic() - started_at
+        with self.condition:
+            self.in_use[id(pooled.connection)] = pooled
+            self.stats.checkouts += 1
+            self.stats.max_in_use = max(self.stats.max_in_use, len(self.in_use))
+            self.stats.wait_time_total += waited
+            self.stats.wait_time_max = max(self.stats.wait_time_max, waited)
+
+        return pooled.connection
+
+    def acquire(self, deadline: float) -> Optional[PooledConnection]:
+        """
+        The acquire function returns an idle connection, or None after reserving a slot for a new one, waiting until
+        `deadline` when the pool is exhausted.
+        """
+        expired = []
+        try:
+            with self.condition:
+                while True:
+                    expired.extend(self.evict(time.monotonic()))
+                    if self.idle:
+                        return self.idle.pop()
+                    if self.size < self.max_size:
+                        self.size += 1
+                        return None
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout}s "
+                            f"({self.max_size} in use)."
+                        )
+                    self.condition.wait(remaining)
+        finally:
+            for pooled in expired:
+                self.close_quietly(pooled)
+
+    def evict(self, now: float) -> list[PooledConnection]:
+        """
+        The evict function takes the expired idle connections out of the pool, the caller closes them outside of the
+        lock.
+        """
+        expired = []
+        kept = []
+        for pooled in self.idle:
+            if now - pooled.created_at >= self.max_lifetime or (
+                now - pooled.idle_since >= self.max_idle
+                and self.size - len(expired) > self.min_size
+            ):
+                expired.append(pooled)
+            else:
+                kept.append(pooled)
+
+        self.idle = kept
+        self.size -= len(expired)
+        if expired:
+            self.condition.notify(len(expired))
+
+        return expired
+
+    def healthy(self, pooled: PooledConnection) -> bool:
+        if self.check is None:
+            return True
+
+        try:
+            self.check(pooled.connection)
+        except Exception:
+            with self.condition:
+                self.stats.health_check_failures += 1
+            self.discard(pooled)
+            return False
+
+        return True
+
+    def checkin(self, connection):
+        """
+        The checkin function returns a connection to the pool, it is closed instead when `reset` reports it unusable
+        or it is older than `max_lifetime`.
+        """
+        with self.condition:
+            pooled = self.in_use.pop(id(connection), None)
+        if pooled is None:
+            self.close_connection(connection)
+            return
+
+        usable = True
+        if self.reset is not None:
+            try:
+                usable = self.reset(connection)
+            except Exception:
+                usable = False
+
+        now = time.monotonic()
+        if not usable or now - pooled.created_at >= self.max_lifetime:
+            self.discard(pooled)
+            return
+
+        pooled.idle_since = now
+        with self.condition:
+            self.idle.append(pooled)
+            self.condition.notify()
+
+    def discard(self, pooled: PooledConnection):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+        self.close_quietly(pooled)
+
+    def close_quietly(self, pooled: PooledConnection):
+        try:
+            self.close_connection(pooled.connection)
+        except Exception:
+            pass
+        with self.condition:
+            self.stats.connections_closed += 1
+
+    def close(self):
+        """
+        The close function closes the idle connections, the ones in use are closed when they are returned.
+        """
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.max_lifetime = 0
+        for pooled in idle:
+            self.close_quietly(pooled)
+
+    def snapshot(self) -> dict:
+        with self.condition:
+            in_use = len(self.in_use)
+            stats = self.stats
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "utilization": round(in_use / self.max_size, 4),
+                "max_in_use": stats.max_in_use,
+                "checkouts": stats.checkouts,
+                "timeouts": stats.timeouts,
+                "connections_created": stats.connections_created,
+                "connections_closed": stats.connections_closed,
+                "health_check_failures": stats.health_check_failures,
+                "wait_time_avg_ms": round(
+                    (
+                        stats.wait_time_total / stats.checkouts * 1000
+                        if stats.checkouts
+                        else 0.0
+                    ),
+                    3,
+                ),
+                "wait_time_max_ms": round(stats.wait_time_max * 1000, 3),
+            }
+
+
+_pools: dict[Hashable, tuple[str, ConnectionPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, key: Hashable, factory: Callable[[], ConnectionPool]):
+    """
+    The get_pool function returns the pool of `key` (an alias and its connection parameters), creating and opening
+    it with `factory` on first use.
+    """
+    with _pools_lock:
+        if key in _pools:
+            return _pools[key][1]
+        pool = factory()
+        _pools[key] = (alias, pool)
+
+    pool.open()
+    return pool
+
+
+def close_pools(alias: Optional[str] = None):
+    with _pools_lock:
+        keys = [key for key, (owner, _) in _pools.items() if alias in (None, owner)]
+        pools = [_pools.pop(key)[1] for key in keys]
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats() -> dict:
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    stats = {}
+    for alias, pool in pools:
+        stats.setdefault(alias, []).append(pool.snapshot())
+
+    return stats
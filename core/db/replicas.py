@@ -0,0 +1,122 @@
+import contextlib
+import contextvars
+import itertools
+import threading
+from collections import Counter
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core import signing
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+PIN_COOKIE = "replica_pin"
+PIN_HEADER = "X-Replica-Pin"
+PIN_SALT = "core.db.replicas.pin"
+PIN_VALUE = "primary"
+
+# The alias the catalog reads of the current request go to, None for the primary. A context variable follows the
+# request into the threads of sync_to_async and across the awaits of async views.
+_read_alias: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "replica_read_alias", default=None
+)
+
+
+class ReplicaSelector:
+    """
+    Spreads the reads over the replicas of the process, round robin or to the replica with the fewest reads in
+    flight (ties broken round robin).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.turns = itertools.count()
+        self.in_flight = Counter()
+
+    def select(self, aliases: list[str], strategy: str) -> str:
+        with self.lock:
+            start = next(self.turns) % len(aliases)
+            ordered = aliases[start:] + aliases[:start]
+            if strategy == LEAST_LOADED:
+                return min(ordered, key=lambda alias: self.in_flight[alias])
+
+            return ordered[0]
+
+    @contextlib.contextmanager
+    def reading_from(self, alias: Optional[str]) -> Iterator[None]:
+        with self.lock:
+            self.in_flight[alias] += 1
+        token = _read_alias.set(alias)
+        try:
+            yield
+        finally:
+            _read_alias.reset(token)
+            with self.lock:
+                self.in_flight[alias] -= 1
+
+    def load(self) -> dict:
+        with self.lock:
+            return {alias: count for alias, count in self.in_flight.items() if alias}
+
+
+selector = ReplicaSelector()
+
+
+def get_replicas() -> list[str]:
+    return list(settings.DATABASE_REPLICAS)
+
+
+def read_alias() -> Optional[str]:
+    return _read_alias.get()
+
+
+def select_replica() -> Optional[str]:
+    replicas = get_replicas()
+    if not replicas:
+        return None
+
+    return selector.select(replicas, settings.DATABASE_REPLICA_SELECTION)
+
+
+def routes_to_replica(request) -> bool:
+    return bool(settings.DATABASE_REPLICAS) and request.path.startswith(
+        tuple(settings.DATABASE_REPLICA_PATHS)
+    )
+
+
+def pin(response):
+    """
+    The pin function sends the next reads of the client to the primary for DATABASE_REPLICA_PIN_SECONDS, so it reads
+    its own writes while the replicas catch up. The pin travels with the client, in a signed cookie and in the
+    X-Replica-Pin response header for the clients that don't keep cookies (they send it back as a request header), so
+    every worker honours it.
+    """
+    token = signing.TimestampSigner(salt=PIN_SALT).sign(PIN_VALUE)
+    response.set_cookie(
+        PIN_COOKIE,
+        token,
+        max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite="Lax",
+    )
+    response[PIN_HEADER] = token
+
+
+def is_pinned(request) -> bool:
+    """
+    The is_pinned function checks the signature and the age of the pin sent by the client, an expired or forged pin
+    doesn't send reads to the primary.
+    """
+    token = request.headers.get(PIN_HEADER) or request.COOKIES.get(PIN_COOKIE)
+    if not token:
+        return False
+
+    try:
+        value = signing.TimestampSigner(salt=PIN_SALT).unsign(
+            token, max_age=settings.DATABASE_REPLICA_PIN_SECONDS
+        )
+    except signing.BadSignature:
+        return False
+
+    return value == PIN_VALUE
@@ -0,0 +1,35 @@
+from core.db import replicas
+
+# The catalog tables, read from the replicas. Users and revoked tokens are always read from the primary, a lagging
+# replica must not accept a revoked token or a changed password.
+REPLICATED_MODELS = {
+    "core.Planet",
+    "core.Planet_terrains",
+    "core.Planet_climates",
+    "core.Terrain",
+    "core.Climate",
+    "core.TerrainPopulation",
+    "core.ClimatePopulation",
+    "core.ResourceVersion",
+}
+
+
+class ReplicaRouter:
+    """
+    Sends the catalog reads of the requests selected by core.middleware.ReplicaRoutingMiddleware to a replica, every
+    other query goes to the primary ("default").
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = replicas.read_alias()
+        if alias is not None and model._meta.label in REPLICATED_MODELS:
+            return alias
+
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
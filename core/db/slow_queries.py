@@ -0,0 +1,343 @@
+"""
+Slow-query log. An execute wrapper installed on every database connection times the queries, the ones slower than
+SLOW_QUERY_THRESHOLD_MS are aggregated by fingerprint (the SQL with its literals and IN lists normalized) with their
+count, total and max time, the views that ran them (see core.middleware.SlowQueryMiddleware) and the project code that
+called the ORM. A SLOW_QUERY_EXPLAIN_RATE share of the slow SELECT statements is run again under
+EXPLAIN (ANALYZE, BUFFERS) (EXPLAIN QUERY PLAN on SQLite) and the plan is kept with the fingerprint. The statement runs
+again in the request, which waits for it.
+Every process writes its log to the "slow_queries" cache at most every SLOW_QUERY_FLUSH_INTERVAL seconds, the
+`slow_queries` command and /api/monitoring/slow-queries/ sum the logs of all the processes, ranked by total time.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, transaction
+
+from core import metrics
+
+PROCESSES_KEY = "slowq:processes"
+MAX_SQL_LENGTH = 2000
+NO_VIEW = "-"
+# The database backends and the execute wrappers are between the ORM and the database, they are not the caller.
+INTERNAL_PATHS = (
+    os.path.dirname(__file__) + os.sep,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "metrics.py"),
+)
+
+_current_request = contextvars.ContextVar("slow_queries_request", default=None)
+_explaining = contextvars.ContextVar("slow_queries_explaining", default=False)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\".])-?\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    The fingerprint function normalizes a statement so its executions with other values share one entry: the
+    placeholders, string and number literals become `?` and the lists of values (IN lists, multi-row VALUES) `(...)`.
+    """
+    normalized = _WHITESPACE.sub(" ", sql).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    normalized = _ROWS.sub("(...)", normalized)
+
+    return normalized
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def get_slow_query_cache():
+    return caches[settings.SLOW_QUERY_CACHE_ALIAS]
+
+
+def process_key(token: str) -> str:
+    return f"slowq:process:{token}"
+
+
+class SlowQueryLog:
+    """
+    Holds the slow queries of the process by fingerprint id. Beyond SLOW_QUERY_MAX_FINGERPRINTS, the fingerprint with
+    the lowest total time is dropped.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Also run in the child after a fork, the log of the parent must not be counted twice.
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.token = uuid.uuid4().hex
+        self.flushed_at = 0.0
+        self.dirty = False
+
+    def record(
+        self,
+        sql: str,
+        duration_ms: float,
+        view: str,
+        caller: Optional[str],
+        plan: Optional[str],
+    ):
+        normalized = fingerprint(sql)
+        key = fingerprint_id(normalized)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= settings.SLOW_QUERY_MAX_FINGERPRINTS:
+                    del self.entries[
+                        min(self.entries, key=lambda k: self.entries[k]["total_ms"])
+                    ]
+                entry = self.entries[key] = {
+                    "fingerprint": key,
+                    "sql": normalized[:MAX_SQL_LENGTH],
+                    "example": sql[:MAX_SQL_LENGTH],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "views": Counter(),
+                    "callers": Counter(),
+                    "plan": None,
+                    "plan_captured_at": None,
+                    "last_seen": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["views"][view] += 1
+            if caller:
+                entry["callers"][caller] += 1
+            entry["last_seen"] = time.time()
+            if plan is not None:
+                entry["plan"] = plan
+                entry["plan_captured_at"] = entry["last_seen"]
+            self.dirty = True
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                key: {
+                    **entry,
+                    "views": Counter(entry["views"]),
+                    "callers": Counter(entry["callers"]),
+                }
+                for key, entry in self.entries.items()
+            }
+
+    def flush(self, force: bool = False):
+        """
+        The flush function writes the log of the process to the cache, unless it did not change or was written less
+        than SLOW_QUERY_FLUSH_INTERVAL seconds ago, and makes sure the process is listed for the readers.
+        """
+        now = time.monotonic()
+        if not self.dirty or (
+            not force and now - self.flushed_at < settings.SLOW_QUERY_FLUSH_INTERVAL
+        ):
+            return
+
+        self.flushed_at = now
+        self.dirty = False
+        cache = get_slow_query_cache()
+        timeout = settings.SLOW_QUERY_RETENTION
+        cache.set(process_key(self.token), self.snapshot(), timeout=timeout)
+        processes = cache.get(PROCESSES_KEY) or []
+        if self.token not in processes:
+            cache.set(PROCESSES_KEY, processes + [self.token], timeout=timeout)
+
+
+log = SlowQueryLog()
+os.register_at_fork(after_in_child=log.reset)
+
+
+def merge(entries: list[dict]) -> dict:
+    merged = {}
+    for entry in entries:
+        total = merged.get(entry["fingerprint"])
+        if total is None:
+            merged[entry["fingerprint"]] = {
+                **entry,
+                "views": Counter(entry["views"]),
+                "callers": Counter(entry["callers"]),
+            }
+            continue
+
+        total["count"] += entry["count"]
+        total["total_ms"] += entry["total_ms"]
+        total["max_ms"] = max(total["max_ms"], entry["max_ms"])
+        total["views"].update(entry["views"])
+        total["callers"].update(entry["callers"])
+        total["last_seen"] = max(total["last_seen"], entry["last_seen"])
+        if entry["plan"] is not None and (
+            total["plan"] is None
+            or entry["plan_captured_at"] > total["plan_captured_at"]
+        ):
+            total["plan"] = entry["plan"]
+            total["plan_captured_at"] = entry["plan_captured_at"]
+
+    return merged
+
+
+def slow_queries(limit: Optional[int] = None) -> list[dict]:
+    """
+    The slow_queries function returns the slow queries of every process, the fingerprints with the highest total time
+    first, with their mean time and their views and callers by count.
+    """
+    log.flush(force=True)
+    cache = get_slow_query_cache()
+    processes = cache.get(PROCESSES_KEY) or []
+    snapshots = cache.get_many([process_key(token) for token in processes])
+
+    merged = merge(
+        [entry for snapshot in snapshots.values() for entry in snapshot.values()]
+    )
+    ranked = sorted(merged.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+    return [
+        {
+            **entry,
+            "total_ms": round(entry["total_ms"], 3),
+            "max_ms": round(entry["max_ms"], 3),
+            "mean_ms": round(entry["total_ms"] / entry["count"], 3),
+            "views": dict(entry["views"].most_common()),
+            "callers": dict(entry["callers"].most_common()),
+        }
+        for entry in ranked[:limit]
+    ]
+
+
+def clear_slow_queries():
+    cache = get_slow_query_cache()
+    processes = cache.get(PROCESSES_KEY) or []
+    cache.delete_many([process_key(token) for token in processes] + [PROCESSES_KEY])
+    with log.lock:
+        log.entries.clear()
+        log.dirty = False
+
+
+@contextlib.contextmanager
+def tracking_request(request):
+    token = _current_request.set(request)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+
+def current_view() -> str:
+    """
+    The current_view function names the view of the request running the query (e.g. "planet:planet-list" or
+    "admin:core_planet_changelist"), NO_VIEW outside of a request or before its URL is resolved.
+    """
+    request = _current_request.get()
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return NO_VIEW
+
+    return match.view_name or match._func_path
+
+
+def calling_code() -> Optional[str]:
+    """
+    The calling_code function returns the innermost frame of the project (outside of the installed packages and of
+    INTERNAL_PATHS) that led to the query, as "path:line in function". The code awaiting an async query is not on the
+    stack, it has no caller.
+    """
+    root = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if frame.name == "thread_handler" and "asgiref" in filename:
+            # Ran by sync_to_async, the frames further out are the ones of the thread, not of the awaiting code.
+            return None
+        if (
+            filename.startswith(root)
+            and "site-packages" not in filename
+            and not filename.startswith(INTERNAL_PATHS)
+        ):
+            return f"{os.path.relpath(filename, root)}:{frame.lineno} in {frame.name}"
+
+    return None
+
+
+def explain(connection, sql: str, params) -> Optional[str]:
+    """
+    The explain function runs a SELECT statement again under EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL (the plan
+    reported by EXPLAIN on the other databases). It runs in a savepoint, so a failure does not break the transaction
+    of the request, and is left out of the request metrics. ANALYZE executes the statement: the sampled request runs
+    the slow SELECT twice before it responds.
+    """
+    options = {"analyze": True, "buffers": True}
+    if connection.vendor != "postgresql":
+        options = {}
+    prefix = connection.ops.explain_query_prefix(**options)
+
+    token = _explaining.set(True)
+    try:
+        with metrics.untracked_queries(), transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    finally:
+        _explaining.reset(token)
+
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    if not settings.SLOW_QUERY_LOG_ENABLED or _explaining.get():
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return result
+
+    plan = None
+    if (
+        not many
+        and sql.lstrip()[:6].upper() == "SELECT"
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+    ):
+        plan = explain(context["connection"], sql, params)
+
+    log.record(sql, duration_ms, current_view(), calling_code(), plan)
+    log.flush()
+
+    return result
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # connection_created is sent every time the wrapper reconnects.
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
+
+
+@atexit.register
+def flush_at_exit():
+    # The cache may be gone or unreachable at exit, the log of the process is then lost.
+    with contextlib.suppress(Exception):
+        log.flush(force=True)
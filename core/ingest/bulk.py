@@ -0,0 +1,234 @@
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.db import transaction
+
+from core import aggregates, cache, models
+from core.ingest.records import PlanetRecord
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    The chunked function splits an iterable in lists of `size` items without loading the whole iterable in memory.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@dataclass
+class IngestStats:
+    planets: int = 0
+    terrains: int = 0
+    climates: int = 0
+    terrain_links: int = 0
+    climate_links: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return (
+            self.planets
+            + self.terrains
+            + self.climates
+            + self.terrain_links
+            + self.climate_links
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Wrote {self.planets} planets, {self.terrains} terrains, {self.climates} climates, "
+            f"{self.terrain_links} terrain links and {self.climate_links} climate links "
+            f"({self.rows} rows, {self.skipped} skipped) in {self.elapsed:.2f}s "
+            f"- {self.rows_per_second:.0f} rows/s"
+        )
+
+
+class BulkPlanetWriter:
+    """
+    Writes planet records with set-based statements.
+    Records are consumed in batches: the terrain and climate names of a batch are resolved in memory (creating the
+    missing ones with a single insert), planets are upserted by name and the many-to-many rows are inserted straight
+    into the through tables. The whole run happens inside one transaction, at the end of which the population
+    summaries of the terrains and climates it touched are recomputed.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, using: str = "default"):
+        self.batch_size = batch_size
+        self.using = using
+        self.terrain_ids: dict[str, int] = {}
+        self.climate_ids: dict[str, int] = {}
+        # The terrain and climate ids whose population summaries are stale, by dimension.
+        self.touched: dict[str, set[int]] = {
+            dimension: set() for dimension in aggregates.DIMENSIONS
+        }
+
+    def write(self, records: Iterable[PlanetRecord]) -> IngestStats:
+        stats = IngestStats()
+        started_at = time.perf_counter()
+
+        with transaction.atomic(using=self.using), aggregates.suspended():
+            for batch in chunked(records, self.batch_size):
+                self.write_batch(batch, stats)
+            self.invalidate_cache(stats)
+            self.refresh_aggregates()
+
+        stats.elapsed = time.perf_counter() - started_at
+        return stats
+
+    def invalidate_cache(self, stats: IngestStats):
+        """
+        The invalidate_cache function bumps the cached responses versions, bulk statements don't send model signals.
+        The planets render their terrains and climates, new links change them even when no planet row changed.
+        """
+        if stats.terrains:
+            cache.bump_version(cache.TERRAIN, self.using)
+        if stats.climates:
+            cache.bump_version(cache.CLIMATE, self.using)
+        if stats.planets or stats.terrain_links or stats.climate_links:
+            cache.bump_version(cache.PLANET, self.using)
+
+    def touch_linked(self, planet_ids: Iterable[int]):
+        """
+        The touch_linked function marks the terrains and climates linked to `planet_ids` as stale, with one query per
+        dimension. It runs before their links are deleted and after their populations or links change.
+        """
+        planet_ids = list(planet_ids)
+        if not planet_ids:
+            return
+
+        for dimension, (_, through, target_field) in aggregates.DIMENSIONS.items():
+            self.touched[dimension].update(
+                through.objects.using(self.using)
+                .filter(planet_id__in=planet_ids)
+                .values_list(target_field, flat=True)
+                .distinct()
+            )
+
+    def refresh_aggregates(self):
+        """
+        The refresh_aggregates function recomputes the population summaries of the terrains and climates touched by
+        the run, bulk statements don't send the signals that maintain them incrementally.
+        """
+        for dimension, target_ids in self.touched.items():
+            for chunk in chunked(sorted(target_ids), self.batch_size):
+                aggregates.refresh(dimension, chunk, self.using)
+            target_ids.clear()
+
+    def write_batch(self, batch: list[PlanetRecord], stats: IngestStats):
+        records = {}
+        for record in batch:
+            if not record.name:
+                stats.skipped += 1
+                continue
+            # The last occurrence of a planet wins, as it would with one upsert per record.
+            records[record.name] = record
+
+        if not records:
+            return
+
+        stats.terrains += self.resolve_names(
+            models.Terrain,
+            self.terrain_ids,
+            {name for record in records.values() for name in record.terrains},
+        )
+        stats.climates += self.resolve_names(
+            models.Climate,
+            self.climate_ids,
+            {name for record in records.values() for name in record.climates},
+        )
+
+        planet_ids = self.upsert_planets(records.values())
+        stats.planets += len(planet_ids)
+
+        stats.terrain_links += self.link(
+            models.Planet.terrains.through,
+            "terrain_id",
+            self.terrain_ids,
+            planet_ids,
+            {record.name: record.terrains for record in records.values()},
+        )
+        stats.climate_links += self.link(
+            models.Planet.climates.through,
+            "climate_id",
+            self.climate_ids,
+            planet_ids,
+            {record.name: record.climates for record in records.values()},
+        )
+        # Links are only added, the terrains and climates linked now are all those whose summaries may have changed.
+        self.touch_linked(planet_ids.values())
+
+    def resolve_names(self, model, ids_by_name: dict[str, int], names: set[str]) -> int:
+        """
+        The resolve_names function makes sure every name is present in `ids_by_name`, inserting the missing rows in bulk
+        and returning how many rows were inserted. The names missing from the map are looked up first, they may have
+        been created by another run since.
+        """
+        missing = names - ids_by_name.keys()
+        if not missing:
+            return 0
+
+        manager = model.objects.using(self.using)
+        ids_by_name.update(manager.filter(name__in=missing).values_list("name", "id"))
+        missing -= ids_by_name.keys()
+        if not missing:
+            return 0
+
+        manager.bulk_create(
+            [model(name=name) for name in missing],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        ids_by_name.update(manager.filter(name__in=missing).values_list("name", "id"))
+
+        return len(missing)
+
+    def upsert_planets(self, records: Iterable[PlanetRecord]) -> dict[str, int]:
+        planets = models.Planet.objects.using(self.using).bulk_create(
+            [
+                models.Planet(name=record.name, population=record.population)
+                for record in records
+            ],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["population"],
+        )
+
+        if all(planet.pk is not None for planet in planets):
+            return {planet.name: planet.pk for planet in planets}
+
+        # Backends that can't return the ids from an upsert need one extra lookup per batch.
+        return dict(
+            models.Planet.objects.using(self.using)
+            .filter(name__in=[planet.name for planet in planets])
+            .values_list("name", "id")
+        )
+
+    def link(
+        self,
+        through,
+        target_field: str,
+        target_ids: dict[str, int],
+        planet_ids: dict[str, int],
+        names_by_planet: dict[str, tuple[str, ...]],
+    ) -> int:
+        rows = [
+            through(planet_id=planet_ids[planet], **{target_field: target_ids[name]})
+            for planet, names in names_by_planet.items()
+            for name in names
+        ]
+        through.objects.using(self.using).bulk_create(
+            rows, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+        return len(rows)
@@ -0,0 +1,230 @@
+import csv
+import io
+import time
+from typing import Iterable, Iterator
+
+from django.db import connections, transaction
+
+from core import aggregates, models
+from core.ingest.bulk import DEFAULT_BATCH_SIZE, BulkPlanetWriter, IngestStats
+from core.ingest.records import PlanetRecord
+
+STAGING_TABLE = "ingest_planet_staging"
+PLANETS_TABLE = "ingest_planet"
+CHANGED_TABLE = "ingest_planet_changed"
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def array_literal(names: tuple[str, ...]) -> str:
+    """
+    The array_literal function formats names as a PostgreSQL text[] literal, every element is quoted so commas,
+    braces and spaces in the names are kept.
+    """
+    elements = (
+        '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"' for name in names
+    )
+
+    return "{" + ",".join(elements) + "}"
+
+
+class ChunkReader:
+    """
+    File-like object over an iterator of strings, so cursor.copy_expert streams the rows as they are produced instead
+    of loading them all in memory.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.current = io.StringIO()
+
+    def read(self, size: int = -1) -> str:
+        data = self.current.read(size)
+        while not data:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return ""
+            self.current = io.StringIO(chunk)
+            data = self.current.read(size)
+
+        return data
+
+
+class CopyPlanetWriter(BulkPlanetWriter):
+    """
+    Writes planet records on PostgreSQL by streaming them with COPY FROM STDIN into a temporary staging table (one row
+    per record, the terrain and climate names as arrays) and merging it into the terrains, climates, planets and
+    through tables with one set-based statement each, all in one transaction. The last occurrence of a planet wins and
+    existing links are kept, as with BulkPlanetWriter, which it falls back to on the other databases.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, using: str = "default"):
+        super().__init__(batch_size=batch_size, using=using)
+        self.connection = connections[using]
+
+    def write(self, records: Iterable[PlanetRecord]) -> IngestStats:
+        if self.connection.vendor != "postgresql":
+            return super().write(records)
+
+        stats = IngestStats()
+        started_at = time.perf_counter()
+
+        with transaction.atomic(using=self.using), aggregates.suspended():
+            with self.connection.cursor() as cursor:
+                self.copy(cursor, records, stats)
+                self.merge(cursor, stats)
+            self.invalidate_cache(stats)
+            self.refresh_aggregates()
+
+        stats.elapsed = time.perf_counter() - started_at
+        return stats
+
+    def csv_chunks(
+        self, records: Iterable[PlanetRecord], stats: IngestStats
+    ) -> Iterator[str]:
+        """
+        The csv_chunks function renders the records as CSV rows, `batch_size` rows per chunk. An empty field is NULL
+        in the CSV format of COPY, which is how an unknown population is sent.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        rows = 0
+        for seq, record in enumerate(records):
+            if not record.name:
+                stats.skipped += 1
+                continue
+
+            writer.writerow(
+                (
+                    seq,
+                    record.name,
+                    record.population,
+                    array_literal(record.terrains),
+                    array_literal(record.climates),
+                )
+            )
+            rows += 1
+            if rows % self.batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    def copy(self, cursor, records: Iterable[PlanetRecord], stats: IngestStats):
+        # ON COMMIT DROP cleans up after a failed run, merge drops the tables when the writer runs inside an outer
+        # transaction.
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+            "seq bigint NOT NULL, name text NOT NULL, population bigint, "
+            "terrains text[] NOT NULL, climates text[] NOT NULL"
+            ") ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} (seq, name, population, terrains, climates) "
+            "FROM STDIN WITH (FORMAT csv)",
+            ChunkReader(self.csv_chunks(records, stats)),
+            size=COPY_BUFFER_SIZE,
+        )
+
+    def merge(self, cursor, stats: IngestStats):
+        quote = self.connection.ops.quote_name
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {PLANETS_TABLE} ON COMMIT DROP AS "
+            "SELECT DISTINCT ON (name) name, population, terrains, climates "
+            f"FROM {STAGING_TABLE} ORDER BY name, seq DESC"
+        )
+        # Temporary tables are not analyzed by autovacuum, the joins below need the statistics.
+        cursor.execute(f"ANALYZE {PLANETS_TABLE}")
+
+        stats.terrains += self.insert_names(cursor, models.Terrain, "terrains")
+        stats.climates += self.insert_names(cursor, models.Climate, "climates")
+
+        # The ids of the inserted planets and of those whose population changed.
+        planet_table = quote(models.Planet._meta.db_table)
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {CHANGED_TABLE} (id bigint PRIMARY KEY) ON COMMIT DROP"
+        )
+        cursor.execute(
+            f"WITH changed AS (INSERT INTO {planet_table} (name, population) "
+            f"SELECT name, population FROM {PLANETS_TABLE} "
+            "ON CONFLICT (name) DO UPDATE SET population = EXCLUDED.population "
+            f"WHERE {planet_table}.population IS DISTINCT FROM EXCLUDED.population "
+            f"RETURNING id) INSERT INTO {CHANGED_TABLE} SELECT id FROM changed"
+        )
+        stats.planets += cursor.rowcount
+
+        stats.terrain_links += self.merge_links(
+            cursor,
+            aggregates.TERRAIN,
+            models.Planet.terrains.through,
+            models.Terrain,
+            "terrains",
+        )
+        stats.climate_links += self.merge_links(
+            cursor,
+            aggregates.CLIMATE,
+            models.Planet.climates.through,
+            models.Climate,
+            "climates",
+        )
+        self.touch_changed(cursor)
+
+        cursor.execute(f"DROP TABLE {CHANGED_TABLE}, {PLANETS_TABLE}, {STAGING_TABLE}")
+
+    def insert_names(self, cursor, model, column: str) -> int:
+        """
+        The insert_names function creates the terrains or climates named by the staged planets that don't exist yet
+        and returns how many were created.
+        """
+        cursor.execute(
+            f"INSERT INTO {self.connection.ops.quote_name(model._meta.db_table)} (name) "
+            f"SELECT DISTINCT linked.name FROM {PLANETS_TABLE} AS staged "
+            f"CROSS JOIN LATERAL unnest(staged.{column}) AS linked(name) "
+            "ON CONFLICT (name) DO NOTHING"
+        )
+
+        return cursor.rowcount
+
+    def merge_links(self, cursor, dimension: str, through, target, column: str) -> int:
+        """
+        The merge_links function inserts the missing rows of a through table for the staged planets, marks the linked
+        terrains or climates as touched and returns how many rows were inserted. The new links are grouped by target
+        on the server, only the distinct targets come back.
+        """
+        quote = self.connection.ops.quote_name
+        planet_column = quote(through._meta.get_field("planet").column)
+        target_column = quote(through._meta.get_field(target._meta.model_name).column)
+        cursor.execute(
+            f"WITH inserted AS (INSERT INTO {quote(through._meta.db_table)} ({planet_column}, {target_column}) "
+            "SELECT planet.id, named.id "
+            f"FROM {PLANETS_TABLE} AS staged "
+            f"CROSS JOIN LATERAL unnest(staged.{column}) AS linked(name), "
+            f"{quote(models.Planet._meta.db_table)} AS planet, {quote(target._meta.db_table)} AS named "
+            "WHERE planet.name = staged.name AND named.name = linked.name "
+            f"ON CONFLICT ({planet_column}, {target_column}) DO NOTHING "
+            f"RETURNING {target_column}) "
+            f"SELECT {target_column}, count(*) FROM inserted GROUP BY {target_column}"
+        )
+        inserted = 0
+        for target_id, links in cursor.fetchall():
+            self.touched[dimension].add(target_id)
+            inserted += links
+
+        return inserted
+
+    def touch_changed(self, cursor):
+        """
+        The touch_changed function marks the terrains and climates linked to the inserted or updated planets as
+        touched.
+        """
+        quote = self.connection.ops.quote_name
+        for dimension, (_, through, target_field) in aggregates.DIMENSIONS.items():
+            planet_column = quote(through._meta.get_field("planet").column)
+            target_column = quote(through._meta.get_field(target_field).column)
+            cursor.execute(
+                f"SELECT DISTINCT link.{target_column} FROM {quote(through._meta.db_table)} AS link "
+                f"JOIN {CHANGED_TABLE} AS changed ON changed.id = link.{planet_column}"
+            )
+            self.touched[dimension].update(
+                target_id for (target_id,) in cursor.fetchall()
+            )
@@ -0,0 +1,170 @@
+import base64
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SWAPI_GRAPHQL_URL = "https://swapi-graphql.netlify.app/.netlify/functions/index"
+PLANETS_PAGE_QUERY = (
+    "query Planets($first: Int, $after: String) {"
+    " allPlanets(first: $first, after: $after) {"
+    " totalCount pageInfo { hasNextPage endCursor }"
+    " planets { name population terrains climates } } }"
+)
+# Relay array connections (used by SWAPI) encode the offset of an item in its cursor.
+ARRAY_CONNECTION_PREFIX = "arrayconnection:"
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+def offset_cursor(offset: int) -> str:
+    return base64.b64encode(f"{ARRAY_CONNECTION_PREFIX}{offset}".encode()).decode()
+
+
+def cursor_offset(cursor: Optional[str]) -> Optional[int]:
+    """
+    The cursor_offset function returns the offset encoded in a relay array connection cursor, or None when the
+    cursor has another format.
+    """
+    try:
+        decoded = base64.b64decode(cursor or "", validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    prefix, _, offset = decoded.partition(":")
+    if f"{prefix}:" != ARRAY_CONNECTION_PREFIX:
+        return None
+
+    try:
+        return int(offset)
+    except ValueError:
+        return None
+
+
+class GraphQLPlanetFetcher:
+    """
+    Fetches the planets from a GraphQL API page by page.
+    All requests share one pooled session, every request has a timeout and failed requests (network errors, 429 and
+    5xx responses) are retried with exponential backoff and full jitter. After the first page, when the API uses
+    relay array cursors, the remaining pages are fetched concurrently by `workers` threads, otherwise the pages are
+    followed one by one. Planets are yielded in source order as soon as their page arrives.
+    """
+
+    def __init__(
+        self,
+        url: str = SWAPI_GRAPHQL_URL,
+        page_size: int = 100,
+        workers: int = 4,
+        timeout: float = 10.0,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        session: Optional[requests.Session] = None,
+    ):
+        self.url = url
+        self.page_size = page_size
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = session or self.build_session()
+
+    def build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def post(self, variables: dict) -> dict:
+        """
+        The post function runs the planets query with the given variables, retrying transient failures.
+        """
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(
+                    self.url,
+                    json={"query": PLANETS_PAGE_QUERY, "variables": variables},
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                failure = str(error)
+            else:
+                if response.status_code == 200:
+                    payload = response.json()
+                    if payload.get("errors"):
+                        raise FetchError(f"GraphQL query failed: {payload['errors']}")
+                    return payload["data"]["allPlanets"]
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise FetchError(
+                        f"GraphQL query failed with status {response.status_code}: {response.text}"
+                    )
+                failure = f"status {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.retries:
+                time.sleep(self.backoff_delay(attempt, retry_after))
+
+        raise FetchError(
+            f"GraphQL query failed after {self.retries + 1} attempts: {failure}"
+        )
+
+    def fetch_page(self, after: Optional[str] = None) -> dict:
+        return self.post({"first": self.page_size, "after": after})
+
+    def iter_pages(self) -> Iterator[dict]:
+        first_page = self.fetch_page()
+        yield first_page
+
+        page_info = first_page.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return
+
+        total = first_page.get("totalCount")
+        offset = cursor_offset(page_info.get("endCursor"))
+        if total is None or offset is None or self.workers <= 1:
+            yield from self.iter_following_pages(page_info.get("endCursor"))
+            return
+
+        cursors = (
+            offset_cursor(start - 1)
+            for start in range(offset + 1, total, self.page_size)
+        )
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Keep a bounded window of requests in flight so memory does not grow with the number of pages.
+            pending = deque()
+            for cursor in cursors:
+                pending.append(executor.submit(self.fetch_page, cursor))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def iter_following_pages(self, cursor: str) -> Iterator[dict]:
+        while cursor:
+            page = self.fetch_page(cursor)
+            yield page
+            page_info = page.get("pageInfo") or {}
+            cursor = (
+                page_info.get("endCursor") if page_info.get("hasNextPage") else None
+            )
+
+    def iter_planets(self) -> Iterator[dict]:
+        for page in self.iter_pages():
+            yield from page.get("planets") or []
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+UNKNOWN_VALUE = "unknown"
+
+
+def clean_names(names: Optional[Iterable[str]]) -> tuple[str, ...]:
+    """
+    The clean_names function normalizes a list of terrain or climate names coming from a source, dropping empty and
+    "unknown" values and duplicates while keeping the original order.
+    """
+    cleaned = {}
+    for name in names or ():
+        if not isinstance(name, str):
+            continue
+        name = name.strip()
+        if name and name != UNKNOWN_VALUE:
+            cleaned[name] = None
+
+    return tuple(cleaned)
+
+
+def clean_population(population) -> Optional[int]:
+    """
+    The clean_population function converts the population of a source record to an integer, the sources may send it
+    as a float or as a string, and unknown values become None.
+    """
+    if population is None or population == UNKNOWN_VALUE:
+        return None
+
+    try:
+        return int(float(population))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class PlanetRecord:
+    """
+    Normalized planet coming from any ingestion source, it is the unit consumed by the planet writers.
+    """
+
+    name: str
+    population: Optional[int] = None
+    terrains: tuple[str, ...] = ()
+    climates: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlanetRecord":
+        return cls(
+            name=str(data.get("name") or "").strip(),
+            population=clean_population(data.get("population")),
+            terrains=clean_names(data.get("terrains")),
+            climates=clean_names(data.get("climates")),
+        )
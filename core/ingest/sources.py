@@ -0,0 +1,161 @@
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Iterator, TextIO, Union
+
+GZIP_MAGIC = b"\x1f\x8b"
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+# Start of the planets array in a GraphQL response, e.g. {"data": {"allPlanets": {"planets": [...]}}}.
+PLANETS_KEY = '"planets"'
+PLANETS_ARRAY_PATTERN = re.compile(r'"planets"\s*:\s*\[')
+# The start of the planets array cut by the end of the buffer.
+PLANETS_ARRAY_PREFIX_PATTERN = re.compile(r'"planets"\s*(?::\s*)?\Z')
+# The longest token a read can cut short, an error in the last characters of the buffer may be a truncation.
+TRUNCATED_TOKEN_LENGTH = len("-Infinity")
+WHITESPACE_AND_COMMAS = " \t\r\n,"
+
+
+class SourceFormatError(ValueError):
+    pass
+
+
+def open_source_file(path: Union[str, Path]) -> TextIO:
+    """
+    The open_source_file function opens a source file as text, transparently decompressing it when it is gzipped.
+    The compression is detected from the file content, so the file name does not need the .gz suffix.
+    """
+    with open(path, "rb") as file:
+        magic = file.read(len(GZIP_MAGIC))
+
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, "r", encoding="utf-8")
+
+
+def is_ndjson(path: Union[str, Path]) -> bool:
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+
+    return bool(suffixes) and suffixes[-1] in NDJSON_SUFFIXES
+
+
+def iter_ndjson(stream: TextIO) -> Iterator[dict]:
+    """
+    The iter_ndjson function yields one planet per non-empty line of a newline-delimited JSON stream.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise SourceFormatError(f"Invalid JSON on line {line_number}: {error}")
+
+
+def is_truncated(error: json.JSONDecodeError) -> bool:
+    """
+    The is_truncated function tells whether a decoding error may come from the end of the buffer cutting the planet
+    short (reading more may complete it) rather than from malformed JSON: the error is in the last token of the buffer
+    or in a string that runs to its end.
+    """
+    return len(error.doc) - error.pos <= TRUNCATED_TOKEN_LENGTH or error.msg.startswith(
+        "Unterminated string"
+    )
+
+
+def iter_json_array(
+    stream: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_element_size: int = DEFAULT_MAX_ELEMENT_SIZE,
+) -> Iterator[dict]:
+    """
+    The iter_json_array function incrementally parses a JSON document holding the planets, either a top level array
+    or a GraphQL response, yielding the planets one by one.
+    Only the current chunk and the planet being decoded are kept in memory, so the size of the document does not
+    matter. A planet longer than `max_element_size` characters is rejected.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        if len(buffer) - position > max_element_size:
+            raise SourceFormatError(
+                f"A planet is longer than {max_element_size} characters."
+            )
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    # Find where the planets array starts, only keeping the end of the buffer that may hold the start of its key.
+    document_started = False
+    while True:
+        stripped = buffer.lstrip()
+        if not document_started and stripped:
+            document_started = True
+            if stripped.startswith("["):
+                position = len(buffer) - len(stripped) + 1
+                break
+        match = PLANETS_ARRAY_PATTERN.search(buffer)
+        if match:
+            position = match.end()
+            break
+        prefix = PLANETS_ARRAY_PREFIX_PATTERN.search(buffer)
+        keep_from = prefix.start() if prefix else 1 - len(PLANETS_KEY)
+        buffer = buffer[keep_from:]
+        if not read_more():
+            raise SourceFormatError("Could not find the planets array in the file.")
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE_AND_COMMAS:
+            position += 1
+
+        if position >= len(buffer):
+            if not read_more():
+                raise SourceFormatError("Unexpected end of file inside planets array.")
+            continue
+
+        if buffer[position] == "]":
+            return
+
+        try:
+            planet, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if eof or not is_truncated(error) or not read_more():
+                raise SourceFormatError(f"Invalid JSON in planets array: {error}")
+            continue
+
+        if end == len(buffer) and not eof:
+            # A value that ends exactly at the end of the buffer may be truncated (e.g. a number), read more first.
+            if read_more():
+                continue
+
+        position = end
+        yield planet
+
+
+def iter_planets_from_file(
+    path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    The iter_planets_from_file function yields the planets stored in a local JSON or NDJSON file, optionally gzipped.
+    Files ending in .ndjson or .jsonl (optionally followed by .gz) are read line by line, any other file is parsed as
+    a JSON document.
+    """
+    with open_source_file(path) as stream:
+        if is_ndjson(path):
+            yield from iter_ndjson(stream)
+        else:
+            yield from iter_json_array(stream, chunk_size=chunk_size)
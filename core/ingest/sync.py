@@ -0,0 +1,210 @@
+import hashlib
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from django.db import transaction
+
+from core import aggregates, models
+from core.ingest.bulk import DEFAULT_BATCH_SIZE, BulkPlanetWriter, IngestStats, chunked
+from core.ingest.records import PlanetRecord
+
+# (population, terrains fingerprint, climates fingerprint)
+Fingerprint = tuple[Optional[int], int, int]
+
+
+def names_fingerprint(names: Iterable[str]) -> int:
+    """
+    The names_fingerprint function returns a compact hash of a set of terrain or climate names, independent of order.
+    """
+    digest = hashlib.blake2b(
+        "\x1f".join(sorted(names)).encode("utf-8"), digest_size=8
+    ).digest()
+
+    return int.from_bytes(digest, "big")
+
+
+def record_fingerprint(record: PlanetRecord) -> Fingerprint:
+    return (
+        record.population,
+        names_fingerprint(record.terrains),
+        names_fingerprint(record.climates),
+    )
+
+
+@dataclass
+class SyncStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Inserted {self.inserted}, updated {self.updated}, unchanged {self.unchanged}, "
+            f"deleted {self.deleted} planets ({self.skipped} skipped) in {self.elapsed:.2f}s"
+        )
+
+
+class PlanetSynchronizer:
+    """
+    Incrementally synchronizes the stored planets with a source.
+    The stored state is loaded once as one fingerprint per planet name, every source record is fingerprinted and
+    compared against it, and only new or changed planets are written (through the BulkPlanetWriter). The terrain or
+    climate links of a changed planet are only rewritten when that set changed. Planets missing from the source are
+    deleted unless `delete_missing` is False.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        delete_missing: bool = True,
+        using: str = "default",
+    ):
+        self.batch_size = batch_size
+        self.delete_missing = delete_missing
+        self.using = using
+        self.writer = BulkPlanetWriter(batch_size=batch_size, using=using)
+        self.state: dict[str, tuple[int, Fingerprint]] = {}
+        self.write_stats = IngestStats()
+
+    def load_state(self):
+        """
+        The load_state function reads every stored planet with its terrain and climate names with three queries and
+        keeps only their fingerprints in memory. The name to id maps of terrains and climates are reused by the writer.
+        """
+        self.writer.terrain_ids = dict(
+            models.Terrain.objects.using(self.using).values_list("name", "id")
+        )
+        self.writer.climate_ids = dict(
+            models.Climate.objects.using(self.using).values_list("name", "id")
+        )
+
+        terrains = self.load_names(
+            models.Planet.terrains.through, "terrain_id", self.writer.terrain_ids
+        )
+        climates = self.load_names(
+            models.Planet.climates.through, "climate_id", self.writer.climate_ids
+        )
+
+        planets = (
+            models.Planet.objects.using(self.using)
+            .values_list("id", "name", "population")
+            .iterator(chunk_size=self.batch_size)
+        )
+        self.state = {
+            name: (
+                planet_id,
+                (
+                    population,
+                    names_fingerprint(terrains.pop(planet_id, ())),
+                    names_fingerprint(climates.pop(planet_id, ())),
+                ),
+            )
+            for planet_id, name, population in planets
+        }
+
+    def load_names(
+        self, through, target_field: str, ids_by_name: dict[str, int]
+    ) -> dict[int, list[str]]:
+        names_by_id = {target_id: name for name, target_id in ids_by_name.items()}
+        names_by_planet = defaultdict(list)
+        rows = (
+            through.objects.using(self.using)
+            .values_list("planet_id", target_field)
+            .iterator(chunk_size=self.batch_size)
+        )
+        for planet_id, target_id in rows:
+            names_by_planet[planet_id].append(names_by_id[target_id])
+
+        return names_by_planet
+
+    def sync(self, records: Iterable[PlanetRecord]) -> SyncStats:
+        stats = SyncStats()
+        started_at = time.perf_counter()
+
+        with transaction.atomic(using=self.using), aggregates.suspended():
+            self.load_state()
+
+            for batch in chunked(records, self.batch_size):
+                self.sync_batch(batch, stats)
+
+            if self.delete_missing:
+                stats.deleted = self.delete_planets(
+                    [planet_id for planet_id, _ in self.state.values()]
+                )
+
+            self.write_stats.planets += stats.deleted
+            self.writer.invalidate_cache(self.write_stats)
+            self.writer.refresh_aggregates()
+
+        stats.elapsed = time.perf_counter() - started_at
+        return stats
+
+    def sync_batch(self, batch: list[PlanetRecord], stats: SyncStats):
+        records = {}
+        for record in batch:
+            if not record.name:
+                stats.skipped += 1
+                continue
+            records[record.name] = record
+
+        changed = []
+        new = []
+        stale_terrains = []
+        stale_climates = []
+        for record in records.values():
+            stored = self.state.pop(record.name, None)
+            if stored is None:
+                new.append(record.name)
+                changed.append(record)
+                continue
+
+            planet_id, (population, terrains, climates) = stored
+            fingerprint = record_fingerprint(record)
+            if fingerprint == (population, terrains, climates):
+                stats.unchanged += 1
+                continue
+
+            stats.updated += 1
+            changed.append(record)
+            if fingerprint[1] != terrains:
+                stale_terrains.append(planet_id)
+            if fingerprint[2] != climates:
+                stale_climates.append(planet_id)
+
+        if new:
+            # A planet missing from the state may have been written by an earlier batch of the run: it is updated, its
+            # links are replaced so the last occurrence wins.
+            written = list(
+                models.Planet.objects.using(self.using)
+                .filter(name__in=new)
+                .values_list("id", flat=True)
+            )
+            stats.inserted += len(new) - len(written)
+            stats.updated += len(written)
+            stale_terrains += written
+            stale_climates += written
+
+        # The terrains and climates losing links, before the links are deleted.
+        self.writer.touch_linked(set(stale_terrains + stale_climates))
+        if stale_terrains:
+            models.Planet.terrains.through.objects.using(self.using).filter(
+                planet_id__in=stale_terrains
+            ).delete()
+        if stale_climates:
+            models.Planet.climates.through.objects.using(self.using).filter(
+                planet_id__in=stale_climates
+            ).delete()
+        if changed:
+            self.writer.write_batch(changed, self.write_stats)
+
+    def delete_planets(self, planet_ids: list[int]) -> int:
+        for chunk in chunked(planet_ids, self.batch_size):
+            self.writer.touch_linked(chunk)
+            models.Planet.objects.using(self.using).filter(id__in=chunk).delete()
+
+        return len(planet_ids)
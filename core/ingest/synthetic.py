@@ -0,0 +1,164 @@
+import bisect
+import itertools
+import math
+import random
+from typing import Iterator
+
+from core.ingest.records import PlanetRecord
+
+# The terrains and climates of the SWAPI planets, the generated vocabularies start with them.
+BASE_TERRAINS = (
+    "desert",
+    "grasslands",
+    "mountains",
+    "jungle",
+    "rainforests",
+    "tundra",
+    "ice caves",
+    "mountain ranges",
+    "swamp",
+    "gas giant",
+    "forests",
+    "lakes",
+    "grassy hills",
+    "cityscape",
+    "ocean",
+    "rock",
+    "barren",
+    "scrublands",
+    "savannas",
+    "canyons",
+    "sinkholes",
+    "volcanoes",
+    "lava rivers",
+    "caves",
+    "rivers",
+    "airless asteroid",
+    "glaciers",
+    "ice canyons",
+    "fungus forests",
+    "fields",
+    "rock arches",
+    "plains",
+    "urban",
+    "hills",
+    "bogs",
+    "islands",
+    "seas",
+    "mesas",
+    "reefs",
+    "valleys",
+)
+BASE_CLIMATES = (
+    "arid",
+    "temperate",
+    "tropical",
+    "frozen",
+    "murky",
+    "windy",
+    "hot",
+    "artificial temperate",
+    "frigid",
+    "humid",
+    "moist",
+    "polluted",
+    "superheated",
+    "subarctic",
+    "artic",
+    "rocky",
+    "cold",
+    "mild",
+    "dry",
+    "stormy",
+)
+
+# Share of the planets with 1, 2, 3 and 4 terrains and with 1, 2 and 3 climates, as in the SWAPI catalog.
+TERRAIN_COUNT_WEIGHTS = (45, 35, 15, 5)
+CLIMATE_COUNT_WEIGHTS = (75, 20, 5)
+
+
+def vocabulary(base: tuple[str, ...], size: int) -> list[str]:
+    """
+    The vocabulary function returns `size` distinct names, the base names first and then numbered variants of them.
+    """
+    names = list(base)
+    suffix = 2
+    while len(names) < size:
+        names.extend(f"{name} {suffix}" for name in base)
+        suffix += 1
+
+    return names[:size]
+
+
+def zipf_weights(size: int, exponent: float) -> list[float]:
+    """
+    The zipf_weights function returns cumulative weights where the name of rank r is picked in proportion to
+    1 / r ** exponent, a few terrains and climates are common and most of them are rare.
+    """
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, size + 1)))
+
+
+class SyntheticCatalog:
+    """
+    Generates a deterministic catalog of planet records: the same arguments always produce the same planets.
+    Terrains and climates are drawn from vocabularies of `terrains` and `climates` names with a Zipf popularity, the
+    populations follow a log-normal distribution (median about 10 million, with a long tail of trillions) and
+    `unknown_population` of them are unknown.
+    """
+
+    def __init__(
+        self,
+        planets: int,
+        seed: int = 0,
+        terrains: int = len(BASE_TERRAINS),
+        climates: int = len(BASE_CLIMATES),
+        unknown_population: float = 0.15,
+        prefix: str = "planet",
+        zipf_exponent: float = 1.1,
+    ):
+        self.planets = planets
+        self.seed = seed
+        self.terrains = vocabulary(BASE_TERRAINS, terrains)
+        self.climates = vocabulary(BASE_CLIMATES, climates)
+        self.unknown_population = unknown_population
+        self.prefix = prefix
+        self.terrain_weights = zipf_weights(len(self.terrains), zipf_exponent)
+        self.climate_weights = zipf_weights(len(self.climates), zipf_exponent)
+        self.terrain_counts = list(itertools.accumulate(TERRAIN_COUNT_WEIGHTS))
+        self.climate_counts = list(itertools.accumulate(CLIMATE_COUNT_WEIGHTS))
+
+    @staticmethod
+    def pick(rng: random.Random, names: list, weights: list, counts: list) -> tuple:
+        """
+        The pick function draws the distinct names of one planet, it bisects the cumulative weights itself because
+        random.choices is the bottleneck of large catalogs.
+        """
+        count = bisect.bisect(counts, rng.random() * counts[-1]) + 1
+        count = min(count, len(names))
+        total = weights[-1]
+        picked = {}
+        while len(picked) < count:
+            picked[names[bisect.bisect(weights, rng.random() * total)]] = None
+
+        return tuple(picked)
+
+    def __iter__(self) -> Iterator[PlanetRecord]:
+        rng = random.Random(self.seed)
+        width = max(8, len(str(self.planets)))
+        mu = math.log(10_000_000)
+
+        for index in range(self.planets):
+            population = None
+            if rng.random() >= self.unknown_population:
+                population = min(int(rng.lognormvariate(mu, 3)), 10**15)
+
+            yield PlanetRecord(
+                name=f"{self.prefix}-{index:0{width}}",
+                population=population,
+                terrains=self.pick(
+                    rng, self.terrains, self.terrain_weights, self.terrain_counts
+                ),
+                climates=self.pick(
+                    rng, self.climates, self.climate_weights, self.climate_counts
+                ),
+            )
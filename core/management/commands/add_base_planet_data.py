@@ -1,10 +1,16 @@
-from typing import Union
+from typing import Iterable, Union
 
 import requests
 
 from django.core.management.base import BaseCommand
 
 from core import models
+from core.ingest.bulk import DEFAULT_BATCH_SIZE, BulkPlanetWriter
+from core.ingest.copy_writer import CopyPlanetWriter
+from core.ingest.fetch import SWAPI_GRAPHQL_URL, GraphQLPlanetFetcher
+from core.ingest.records import PlanetRecord
+from core.ingest.sources import iter_planets_from_file
+from core.ingest.sync import PlanetSynchronizer
 
 
 class Command(BaseCommand):
@@ -14,7 +20,7 @@ class Command(BaseCommand):
 
     @property
     def graphql_url(self) -> str:
-        return "https://swapi-graphql.netlify.app/.netlify/functions/index"
+        return SWAPI_GRAPHQL_URL
 
     @property
     def graphql_query(self) -> str:
@@ -34,9 +40,12 @@ class Command(BaseCommand):
 
     def create_planet_data(self, name: str, population: int = None) -> models.Planet:
         """
-        The create_planet_data function get or create the planet based on the graphql response.
+        The create_planet_data function create or update the planet based on the graphql response, the name is unique
+        so it is the lookup key and the population is updated when it changes.
         """
-        return models.Planet.objects.get_or_create(name=name, population=population)
+        return models.Planet.objects.update_or_create(
+            name=name, defaults={"population": population}
+        )
 
     def add_terrains_data(self, terrains: list) -> list[models.Terrain]:
         """
@@ -75,16 +84,121 @@ class Command(BaseCommand):
         planet.climates.add(*climates)
         planet.save()
 
-    def handle(self, *args, **options):
-        """Entrypoint for command."""
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Write terrains, climates, planets and links with set-based statements in one transaction.",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help=(
+                "Stream the planets with COPY into staging tables merged with set-based statements in one transaction "
+                "(PostgreSQL, the other databases use the --bulk writer)."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of planets written per statement in bulk mode, or per COPY chunk in copy mode.",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Only write planets that changed since the last run and delete the ones missing from the source.",
+        )
+        parser.add_argument(
+            "--keep-missing",
+            action="store_true",
+            help="In sync mode, keep the stored planets that are missing from the source.",
+        )
+        parser.add_argument(
+            "--file",
+            help="Read the planets from a local JSON or NDJSON file (optionally gzipped) instead of the GraphQL API.",
+        )
+
+        parser.add_argument(
+            "--concurrent",
+            action="store_true",
+            help="Fetch the GraphQL API page by page with concurrent, retrying requests over a pooled session.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of pages fetched at the same time in concurrent mode.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Number of planets requested per page in concurrent mode.",
+        )
+
+    def get_planets_data(self, options) -> Iterable[dict]:
+        """
+        The get_planets_data function returns the planets from the selected source, files are streamed lazily.
+        """
+        if options["file"]:
+            self.stdout.write(f"Adding the base data from {options['file']}...")
+            return iter_planets_from_file(options["file"])
+
         self.stdout.write("Adding the base data from GraphQL API...")
+        if options["concurrent"]:
+            fetcher = GraphQLPlanetFetcher(
+                url=self.graphql_url,
+                page_size=options["page_size"],
+                workers=options["workers"],
+            )
+            return fetcher.iter_planets()
 
         response = self.get_graphql_response()
 
-        planets_data = self.get_planets_from_response(response)
+        return self.get_planets_from_response(response)
+
+    def bulk_ingest(self, planets_data, batch_size: int, writer_class=BulkPlanetWriter):
+        """
+        The bulk_ingest function writes all planets with the BulkPlanetWriter (or the CopyPlanetWriter) and reports
+        the throughput.
+        """
+        records = (PlanetRecord.from_dict(planet_data) for planet_data in planets_data)
+        stats = writer_class(batch_size=batch_size).write(records)
+        self.stdout.write(stats.summary())
+
+    def sync(self, planets_data, batch_size: int, delete_missing: bool):
+        """
+        The sync function incrementally synchronizes the stored planets with the source and reports what changed.
+        """
+        records = (PlanetRecord.from_dict(planet_data) for planet_data in planets_data)
+        synchronizer = PlanetSynchronizer(
+            batch_size=batch_size, delete_missing=delete_missing
+        )
+        stats = synchronizer.sync(records)
+        self.stdout.write(stats.summary())
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        planets_data = self.get_planets_data(options)
         if not planets_data:
             return
 
+        if options["sync"]:
+            self.sync(planets_data, options["batch_size"], not options["keep_missing"])
+            self.stdout.write(self.style.SUCCESS("Done!"))
+            return
+
+        if options["copy"]:
+            self.bulk_ingest(planets_data, options["batch_size"], CopyPlanetWriter)
+            self.stdout.write(self.style.SUCCESS("Done!"))
+            return
+
+        if options["bulk"]:
+            self.bulk_ingest(planets_data, options["batch_size"])
+            self.stdout.write(self.style.SUCCESS("Done!"))
+            return
+
         for planet_data in planets_data:
             terrains = self.add_terrains_data(planet_data.get("terrains"))
             climates = self.add_climates_data(planet_data.get("climates"))
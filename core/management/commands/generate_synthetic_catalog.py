@@ -0,0 +1,100 @@
+import time
+from typing import Iterable, Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ingest.copy_writer import CopyPlanetWriter
+from core.ingest.records import PlanetRecord
+from core.ingest.synthetic import BASE_CLIMATES, BASE_TERRAINS, SyntheticCatalog
+
+
+class Command(BaseCommand):
+    """
+    Django command to fill the database with a deterministic synthetic catalog (e.g. 10k to 10M planets), to measure
+    performance changes at production scale. The same seed always generates the same planets, running the command
+    again upserts them.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--planets", type=int, default=10_000, help="Number of planets."
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the random generator."
+        )
+        parser.add_argument(
+            "--terrains",
+            type=int,
+            default=len(BASE_TERRAINS),
+            help="Number of distinct terrains.",
+        )
+        parser.add_argument(
+            "--climates",
+            type=int,
+            default=len(BASE_CLIMATES),
+            help="Number of distinct climates.",
+        )
+        parser.add_argument(
+            "--unknown-population",
+            type=float,
+            default=0.15,
+            help="Share of the planets with an unknown population.",
+        )
+        parser.add_argument(
+            "--prefix", default="planet", help="Prefix of the planet names."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of planets per COPY chunk (per statement on the databases without COPY).",
+        )
+        parser.add_argument(
+            "--progress-every",
+            type=int,
+            default=100_000,
+            help="Report the progress every this many planets, 0 to turn it off.",
+        )
+
+    def progress(
+        self, records: Iterable[PlanetRecord], total: int, every: int
+    ) -> Iterator[PlanetRecord]:
+        """
+        The progress function reports how many planets were handed to the writer and at which rate, as they are
+        generated lazily.
+        """
+        started_at = time.perf_counter()
+        for count, record in enumerate(records, start=1):
+            yield record
+            if every and count % every == 0 and count < total:
+                rate = count / (time.perf_counter() - started_at)
+                self.stdout.write(f"{count}/{total} planets - {rate:.0f} planets/s")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options["planets"] < 1:
+            raise CommandError("--planets must be at least 1.")
+        if options["terrains"] < 1 or options["climates"] < 1:
+            raise CommandError("--terrains and --climates must be at least 1.")
+        if not 0 <= options["unknown_population"] <= 1:
+            raise CommandError("--unknown-population must be between 0 and 1.")
+
+        catalog = SyntheticCatalog(
+            planets=options["planets"],
+            seed=options["seed"],
+            terrains=options["terrains"],
+            climates=options["climates"],
+            unknown_population=options["unknown_population"],
+            prefix=options["prefix"],
+        )
+        records = self.progress(catalog, options["planets"], options["progress_every"])
+        stats = CopyPlanetWriter(batch_size=options["batch_size"]).write(records)
+
+        self.stdout.write(stats.summary())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! {stats.planets / stats.elapsed:.0f} planets/s"
+                if stats.elapsed
+                else "Done!"
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import models
+
+
+class Command(BaseCommand):
+    """
+    Django command to delete the revoked tokens that have expired, they are rejected by their expiry anyway.
+    """
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        deleted, _ = models.RevokedToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired revoked tokens")
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import aggregates
+
+
+class Command(BaseCommand):
+    """
+    Django command to rebuild the population summaries by terrain and climate from the planets.
+    """
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        started_at = time.perf_counter()
+        aggregates.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Population summaries rebuilt in {time.perf_counter() - started_at:.2f}s"
+            )
+        )
@@ -0,0 +1,55 @@
+import textwrap
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import slow_queries
+
+
+class Command(BaseCommand):
+    """
+    Django command to list the slow queries logged by every process, the fingerprints with the highest total time
+    first, with their views, the code calling them and their last captured plan.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of fingerprints listed."
+        )
+        parser.add_argument(
+            "--no-plans", action="store_true", help="Leave the query plans out."
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="Empty the slow-query log."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options["clear"]:
+            slow_queries.clear_slow_queries()
+            self.stdout.write(self.style.SUCCESS("Slow-query log cleared"))
+            return
+        if options["limit"] < 1:
+            raise CommandError("--limit must be at least 1.")
+
+        entries = slow_queries.slow_queries(options["limit"])
+        if not entries:
+            self.stdout.write("No slow queries logged.")
+            return
+
+        for rank, entry in enumerate(entries, start=1):
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{rank}. {entry['total_ms']:.1f}ms total, {entry['count']} calls, "
+                    f"{entry['mean_ms']:.1f}ms mean, {entry['max_ms']:.1f}ms max [{entry['fingerprint']}]"
+                )
+            )
+            self.stdout.write(textwrap.indent(entry["sql"], "   "))
+            self.stdout.write(f"   views: {self.counts(entry['views'])}")
+            if entry["callers"]:
+                self.stdout.write(f"   callers: {self.counts(entry['callers'])}")
+            if entry["plan"] and not options["no_plans"]:
+                self.stdout.write("   plan:")
+                self.stdout.write(textwrap.indent(entry["plan"], "     "))
+
+    def counts(self, counter: dict) -> str:
+        return ", ".join(f"{name} ({count})" for name, count in counter.items())
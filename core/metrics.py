@@ -0,0 +1,331 @@
+"""
+Request metrics of the API, exposed in the Prometheus text format at /metrics (see monitoring.views.MetricsView).
+core.middleware.MetricsMiddleware records the count, latency, database queries, database time and response size of
+the requests of the routes in METRICS_NAMESPACES, the queries are timed by an execute wrapper installed on every
+database connection. The samples live in the memory of the process, with METRICS_DIR set every process also writes
+them to its own file there (at most every METRICS_FLUSH_INTERVAL seconds) and the endpoint sums the files of all the
+processes, like the multiprocess mode of the Prometheus client.
+"""
+
+import atexit
+import bisect
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# name: (type, help, buckets)
+METRICS = {
+    "http_requests_total": (
+        COUNTER,
+        "Requests served, by route, method and status.",
+        None,
+    ),
+    "http_request_duration_seconds": (
+        HISTOGRAM,
+        "Time spent serving a request.",
+        DURATION_BUCKETS,
+    ),
+    "http_request_db_queries": (
+        HISTOGRAM,
+        "Database queries run by a request.",
+        QUERY_BUCKETS,
+    ),
+    "http_request_db_duration_seconds": (
+        HISTOGRAM,
+        "Time a request spent waiting on the database.",
+        DURATION_BUCKETS,
+    ),
+    "http_response_size_bytes": (
+        HISTOGRAM,
+        "Size of the response body.",
+        SIZE_BUCKETS,
+    ),
+}
+
+_db_usage = contextvars.ContextVar("metrics_db_usage", default=None)
+
+
+class DatabaseUsage:
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+
+class Registry:
+    """
+    Holds the samples of the process: a counter is stored as `[value]`, a histogram as the count of every bucket
+    (the last one is +Inf) followed by the sum, so the samples of several processes add up element by element.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Also run in the child after a fork, the samples of the parent must not be counted twice.
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.samples = {}
+        self.token = uuid.uuid4().hex
+        self.flushed_at = 0.0
+
+    def sample(self, name: str, labels: tuple) -> list:
+        key = (name, labels)
+        values = self.samples.get(key)
+        if values is None:
+            buckets = METRICS[name][2]
+            values = [0] if buckets is None else [0] * (len(buckets) + 2)
+            self.samples[key] = values
+
+        return values
+
+    def inc(self, name: str, labels: tuple, amount: float = 1):
+        self.sample(name, labels)[0] += amount
+
+    def observe(self, name: str, labels: tuple, value: float):
+        values = self.sample(name, labels)
+        values[bisect.bisect_left(METRICS[name][2], value)] += 1
+        values[-1] += value
+
+    def record_request(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        duration: float,
+        usage: DatabaseUsage,
+        size: Optional[int],
+    ):
+        labels = (("route", route), ("method", method))
+        with self.lock:
+            self.inc("http_requests_total", labels + (("status", str(status)),))
+            self.observe("http_request_duration_seconds", labels, duration)
+            self.observe("http_request_db_queries", labels, usage.queries)
+            self.observe("http_request_db_duration_seconds", labels, usage.duration)
+            if size is not None:
+                self.observe("http_response_size_bytes", labels, size)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {key: list(values) for key, values in self.samples.items()}
+
+    def path(self, directory: str) -> str:
+        return os.path.join(directory, f"metrics-{os.getpid()}-{self.token}.json")
+
+    def flush(self, directory: str, force: bool = False):
+        """
+        The flush function writes the samples of the process to its file in `directory`, unless they were written
+        less than METRICS_FLUSH_INTERVAL seconds ago. The file is replaced atomically, so a scrape never reads half
+        of it.
+        """
+        now = time.monotonic()
+        if not force and now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        if not self.flush_lock.acquire(blocking=force):
+            return
+
+        try:
+            self.flushed_at = now
+            path = self.path(directory)
+            samples = [
+                [name, [list(label) for label in labels], values]
+                for (name, labels), values in self.snapshot().items()
+            ]
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(samples, file)
+            os.replace(f"{path}.tmp", path)
+        finally:
+            self.flush_lock.release()
+
+
+registry = Registry()
+os.register_at_fork(after_in_child=registry.reset)
+
+
+def get_metrics_dir() -> str:
+    return settings.METRICS_DIR
+
+
+def read_samples(directory: str) -> dict:
+    """
+    The read_samples function sums the samples written to `directory` by every process, including the ones that have
+    exited, so the counters never go back.
+    """
+    merged = {}
+    for entry in os.scandir(directory):
+        if not (entry.name.startswith("metrics-") and entry.name.endswith(".json")):
+            continue
+        with open(entry.path, encoding="utf-8") as file:
+            samples = json.load(file)
+        for name, labels, values in samples:
+            if name not in METRICS:
+                continue
+            key = (name, tuple(tuple(label) for label in labels))
+            total = merged.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+
+    return merged
+
+
+def collect() -> dict:
+    directory = get_metrics_dir()
+    if not directory:
+        return registry.snapshot()
+
+    registry.flush(directory, force=True)
+
+    return read_samples(directory)
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(samples: dict) -> str:
+    """
+    The render function formats the samples in the Prometheus text exposition format (version 0.0.4), histogram
+    buckets are cumulative.
+    """
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (sample_name, labels), values in sorted(samples.items()):
+            if sample_name != name:
+                continue
+            if kind == COUNTER:
+                lines.append(f"{name}{format_labels(labels)} {format_value(values[0])}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), values[:-1]):
+                cumulative += count
+                bucket_labels = format_labels(labels + (("le", str(bound)),))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{name}_sum{format_labels(labels)} {format_value(values[-1])}"
+            )
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+def route_of(request) -> Optional[str]:
+    """
+    The route_of function labels a request with the name of its view (e.g. "planet:planet-list"), None for the views
+    outside of METRICS_NAMESPACES and the paths that did not resolve, which are not recorded.
+    """
+    match = request.resolver_match
+    if match is None or match.namespace not in settings.METRICS_NAMESPACES:
+        return None
+
+    return match.view_name
+
+
+@contextlib.contextmanager
+def tracking_queries() -> Iterator[DatabaseUsage]:
+    """
+    The tracking_queries function counts and times the queries run in its block, including the ones run by
+    sync_to_async in other threads, which inherit the context.
+    """
+    usage = DatabaseUsage()
+    token = _db_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _db_usage.reset(token)
+
+
+@contextlib.contextmanager
+def untracked_queries():
+    """
+    The untracked_queries function leaves the queries run in its block out of the usage of the request, e.g. the
+    EXPLAIN statements of the slow-query log, which the request didn't ask for.
+    """
+    token = _db_usage.set(None)
+    try:
+        yield
+    finally:
+        _db_usage.reset(token)
+
+
+def time_queries(execute, sql, params, many, context):
+    usage = _db_usage.get()
+    if usage is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        usage.queries += 1
+        usage.duration += time.perf_counter() - started_at
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # connection_created is sent every time the wrapper reconnects.
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+def record_request(request, response, duration: float, usage: DatabaseUsage):
+    route = route_of(request)
+    if route is None:
+        return
+
+    size = None if response.streaming else len(response.content)
+    registry.record_request(
+        route, request.method, response.status_code, duration, usage, size
+    )
+
+    directory = get_metrics_dir()
+    if directory:
+        registry.flush(directory)
+
+
+@atexit.register
+def flush_at_exit():
+    directory = getattr(settings, "METRICS_DIR", "") if settings.configured else ""
+    if directory:
+        registry.flush(directory, force=True)
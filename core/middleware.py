@@ -0,0 +1,179 @@
+import cProfile
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from core import metrics, profiling
+from core.db import replicas, slow_queries
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes the catalog reads of the safe requests on DATABASE_REPLICA_PATHS to a replica (see
+    core.db.routers.ReplicaRouter). A successful write on those paths pins its client to the primary for
+    DATABASE_REPLICA_PIN_SECONDS, so it reads its own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replicas.routes_to_replica(request):
+            return self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            alias = None if replicas.is_pinned(request) else replicas.select_replica()
+            with replicas.selector.reading_from(alias):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            replicas.pin(response)
+
+        return response
+
+    async def __acall__(self, request):
+        if not replicas.routes_to_replica(request):
+            return await self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            alias = None if replicas.is_pinned(request) else replicas.select_replica()
+            with replicas.selector.reading_from(alias):
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if response.status_code < 400:
+            replicas.pin(response)
+
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Records the count, latency, database queries and time and response size of the requests (see core.metrics). It
+    comes first in MIDDLEWARE, so the latency covers the whole middleware chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started_at = time.perf_counter()
+        with metrics.tracking_queries() as usage:
+            response = self.get_response(request)
+        metrics.record_request(
+            request, response, time.perf_counter() - started_at, usage
+        )
+
+        return response
+
+    async def __acall__(self, request):
+        started_at = time.perf_counter()
+        with metrics.tracking_queries() as usage:
+            response = await self.get_response(request)
+        metrics.record_request(
+            request, response, time.perf_counter() - started_at, usage
+        )
+
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Makes the request known to the slow-query log, which names the view of the slow queries it runs (see
+    core.db.slow_queries).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with slow_queries.tracking_request(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with slow_queries.tracking_request(request):
+            return await self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Runs the requests of staff users that ask for it under cProfile and stores the profile (see core.profiling).
+    Under ASGI the profiler only sees the event loop thread: the time spent in sync_to_async threads shows as waiting,
+    and the other requests served by the loop meanwhile are profiled too, so only one request is profiled at a time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.event_loop_lock = threading.Lock()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not profiling.wants_profile(request) or not profiling.is_staff(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started_at = time.perf_counter()
+        response = profiler.runcall(self.get_response, request)
+        profiling.save_profile(
+            profiler, request, response, time.perf_counter() - started_at
+        )
+
+        return response
+
+    async def __acall__(self, request):
+        if not profiling.wants_profile(request):
+            return await self.get_response(request)
+        if not await sync_to_async(profiling.is_staff)(request):
+            return await self.get_response(request)
+        if not self.event_loop_lock.acquire(blocking=False):
+            return await self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            started_at = time.perf_counter()
+            profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+        finally:
+            self.event_loop_lock.release()
+
+        await sync_to_async(profiling.save_profile)(
+            profiler, request, response, time.perf_counter() - started_at
+        )
+
+        return response
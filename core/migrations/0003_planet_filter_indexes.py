@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_climate_terrain_planet"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="planet",
+            index=models.Index(
+                fields=["population"], name="core_planet_population_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="planet",
+            index=models.Index(
+                fields=["name"],
+                name="core_planet_name_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        # The auto-created through tables are only indexed by (planet_id, target_id) and target_id, these indexes let
+        # the terrain/climate filters find the planets of a terrain or climate with index-only scans.
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX core_planet_terrains_terrain_planet_idx "
+                "ON core_planet_terrains (terrain_id, planet_id)"
+            ),
+            reverse_sql="DROP INDEX core_planet_terrains_terrain_planet_idx",
+        ),
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX core_planet_climates_climate_planet_idx "
+                "ON core_planet_climates (climate_id, planet_id)"
+            ),
+            reverse_sql="DROP INDEX core_planet_climates_climate_planet_idx",
+        ),
+    ]
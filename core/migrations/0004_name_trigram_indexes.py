@@ -0,0 +1,49 @@
+from django.db import DatabaseError, migrations, transaction
+
+TRIGRAM_INDEXES = {
+    "core_planet_name_trgm_idx": "core_planet",
+    "core_terrain_name_trgm_idx": "core_terrain",
+    "core_climate_name_trgm_idx": "core_climate",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    The create_trigram_indexes function installs pg_trgm and indexes the planet, terrain and climate names with
+    gin_trgm_ops for planet.search. Databases that are not PostgreSQL, or roles that can't create the extension, are
+    skipped: the search falls back to a substring match.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return
+
+    for name, table in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON {table} USING gin (name gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_planet_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
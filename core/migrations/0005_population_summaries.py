@@ -0,0 +1,88 @@
+# Generated by Django 5.0.14 on 2026-10-17 17:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_population_summaries(apps, schema_editor):
+    """
+    The fill_population_summaries function computes the summaries of the existing planets, from then on they are
+    maintained by core.aggregates.
+    """
+    using = schema_editor.connection.alias
+    Planet = apps.get_model("core", "Planet")
+    for model_name, through, target_field in (
+        ("TerrainPopulation", Planet.terrains.through, "terrain_id"),
+        ("ClimatePopulation", Planet.climates.through, "climate_id"),
+    ):
+        model = apps.get_model("core", model_name)
+        rows = (
+            through.objects.using(using)
+            .values(target_field)
+            .annotate(
+                planets=Count("planet_id"),
+                populated_planets=Count("planet__population"),
+                total_population=Coalesce(Sum("planet__population"), 0),
+                max_population=Max("planet__population"),
+            )
+        )
+        model.objects.using(using).bulk_create(
+            [model(**row) for row in rows], batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_name_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClimatePopulation",
+            fields=[
+                ("planets", models.IntegerField(default=0)),
+                ("populated_planets", models.IntegerField(default=0)),
+                ("total_population", models.BigIntegerField(default=0)),
+                ("max_population", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "climate",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="population",
+                        serialize=False,
+                        to="core.climate",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="TerrainPopulation",
+            fields=[
+                ("planets", models.IntegerField(default=0)),
+                ("populated_planets", models.IntegerField(default=0)),
+                ("total_population", models.BigIntegerField(default=0)),
+                ("max_population", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "terrain",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="population",
+                        serialize=False,
+                        to="core.terrain",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(fill_population_summaries, migrations.RunPython.noop),
+    ]
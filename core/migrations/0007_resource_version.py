@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-17 18:31
+
+import time
+
+from django.db import migrations, models
+
+
+def create_resource_versions(apps, schema_editor):
+    """
+    The create_resource_versions function starts the versions from the current time in nanoseconds, so they never go
+    back to a value used by the responses cached before the migration.
+    """
+    ResourceVersion = apps.get_model("core", "ResourceVersion")
+    ResourceVersion.objects.using(schema_editor.connection.alias).bulk_create(
+        [
+            ResourceVersion(resource=resource, version=time.time_ns())
+            for resource in ("planet", "terrain", "climate")
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_revoked_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResourceVersion",
+            fields=[
+                (
+                    "resource",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(create_resource_versions, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -57,6 +58,35 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
+class RevokedToken(models.Model):
+    """
+    A revoked JWT, identified by its jti. Rows are read by user.revocation, and can be purged once expired.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        User, blank=True, null=True, on_delete=models.CASCADE, related_name="+"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class ResourceVersion(models.Model):
+    """
+    The change marker of a cached resource (planet, terrain or climate), read by core.cache. It is bumped in the
+    transaction of every write, so every process sees it move when the write commits.
+    """
+
+    resource = models.CharField(max_length=32, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.resource}:{self.version}"
+
+
 class Terrain(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
@@ -76,3 +106,48 @@ class Planet(models.Model):
     population = models.BigIntegerField(blank=True, null=True)
     terrains = models.ManyToManyField(Terrain, blank=True, related_name="planets")
     climates = models.ManyToManyField(Climate, blank=True, related_name="planets")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["population"], name="core_planet_population_idx"),
+            # The unique index on name can't serve LIKE 'prefix%' under a non-C collation in PostgreSQL, the
+            # pattern operator class can (other databases ignore opclasses).
+            models.Index(
+                fields=["name"],
+                name="core_planet_name_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+
+class PopulationSummary(models.Model):
+    """
+    Population aggregates of the planets linked to one terrain or climate, maintained by core.aggregates.
+    The average is total_population / populated_planets, planets with an unknown population only count in `planets`.
+    """
+
+    planets = models.IntegerField(default=0)
+    populated_planets = models.IntegerField(default=0)
+    total_population = models.BigIntegerField(default=0)
+    max_population = models.BigIntegerField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+
+class TerrainPopulation(PopulationSummary):
+    terrain = models.OneToOneField(
+        Terrain,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="population",
+    )
+
+
+class ClimatePopulation(PopulationSummary):
+    climate = models.OneToOneField(
+        Climate,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="population",
+    )
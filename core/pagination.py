@@ -0,0 +1,22 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key.
+    Pages are fetched with `WHERE id > <cursor>` on the primary key index, so deep pages cost the same as the first
+    one, and no COUNT(*) is issued. Cursors are opaque base64 tokens returned in the `next`/`previous` links.
+    """
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        The apaginate_queryset function is the async counterpart of paginate_queryset. Like the async methods of
+        QuerySet, it runs the page query in the thread of the request's database connection.
+        """
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
@@ -0,0 +1,32 @@
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON with orjson. Like the strict DRF JSONParser it rejects NaN and Infinity, the body must be UTF-8.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except Exception as exc:
+            # Hostile input raises more than ValueError, e.g. TypeError for a map keyed by an array.
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,110 @@
+"""
+Per-request profiling for staff users (see core.middleware.ProfilingMiddleware). A request sending the PROFILING_HEADER
+header or the PROFILING_QUERY_PARAM query parameter, authenticated as a staff user (JWT or session), runs under
+cProfile. The profile is kept in the "profiles" cache for PROFILING_TIMEOUT seconds, its id is returned in the
+X-Profile-Id response header and staff users download it from /api/monitoring/profiles/<id>/, as a pstats file
+(`python -m pstats`, snakeviz, flameprof) or as text.
+The other requests only pay for the header and query parameter lookups.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import APIException
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def get_profile_cache():
+    return caches[settings.PROFILING_CACHE_ALIAS]
+
+
+def profile_key(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+def wants_profile(request) -> bool:
+    return settings.PROFILING_ENABLED and (
+        settings.PROFILING_HEADER in request.headers
+        or settings.PROFILING_QUERY_PARAM in request.GET
+    )
+
+
+def is_staff(request) -> bool:
+    """
+    The is_staff function authenticates the request like the API does, the middleware runs before DRF so the JWT
+    user is not known yet. Invalid credentials are left to the view to reject.
+    """
+    from user.authentication import CachedJWTAuthentication
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    try:
+        authenticated = CachedJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+
+    return authenticated is not None and authenticated[0].is_staff
+
+
+def save_profile(profiler: cProfile.Profile, request, response, duration: float):
+    """
+    The save_profile function stores the profile of a request with its method, path, status and duration, and tags
+    the response with its id.
+    """
+    profiler.create_stats()
+    profile_id = uuid.uuid4().hex
+    get_profile_cache().set(
+        profile_key(profile_id),
+        {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration": duration,
+            "created_at": time.time(),
+            "stats": marshal.dumps(profiler.stats),
+        },
+        timeout=settings.PROFILING_TIMEOUT,
+    )
+    response[PROFILE_ID_HEADER] = profile_id
+
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    return get_profile_cache().get(profile_key(profile_id))
+
+
+def as_text(profile: dict, sort: str = "cumulative", limit: int = 50) -> str:
+    """
+    The as_text function formats a stored profile like `python -m pstats` does, the `limit` most expensive functions
+    by `sort`.
+    """
+    stream = io.StringIO()
+    stream.write(
+        f"{profile['method']} {profile['path']} -> {profile['status']} "
+        f"in {profile['duration'] * 1000:.1f}ms\n\n"
+    )
+    stats = pstats.Stats(ProfileData(profile["stats"]), stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+
+    return stream.getvalue()
+
+
+class ProfileData:
+    """
+    Stands for a profiler in pstats.Stats, which loads the stats of objects with a create_stats method.
+    """
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
@@ -0,0 +1,58 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson writes these characters as is, the JSON renderer of DRF escapes them so the output is a JavaScript subset.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders compact JSON with orjson, byte for byte like the DRF JSONRenderer for the data the API renders.
+    Datetimes and the types orjson doesn't know go through the DRF encoder, indented output (`; indent=` or the
+    browsable API) is left to the DRF renderer.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options
+        )
+        for character, escaped in LINE_SEPARATORS:
+            ret = ret.replace(character, escaped)
+
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders MessagePack, for service-to-service consumers that opt in with `Accept: application/msgpack`.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        return msgpack.packb(data, default=JSONEncoder().default, use_bin_type=True)
@@ -0,0 +1,164 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core import aggregates, cache, metrics, models
+from core.db import slow_queries
+
+RESOURCES_BY_MODEL = {
+    models.Planet: cache.PLANET,
+    models.Terrain: cache.TERRAIN,
+    models.Climate: cache.CLIMATE,
+}
+
+
+@receiver(post_save, sender=models.Planet)
+@receiver(post_save, sender=models.Terrain)
+@receiver(post_save, sender=models.Climate)
+@receiver(post_delete, sender=models.Planet)
+@receiver(post_delete, sender=models.Terrain)
+@receiver(post_delete, sender=models.Climate)
+def invalidate_cached_responses(sender, using: str, **kwargs):
+    """
+    The invalidate_cached_responses function bumps the version of the cached responses of the saved or deleted model.
+    """
+    cache.bump_version(RESOURCES_BY_MODEL[sender], using)
+
+
+@receiver(m2m_changed, sender=models.Planet.terrains.through)
+@receiver(m2m_changed, sender=models.Planet.climates.through)
+def invalidate_cached_planets(sender, action: str, using: str, **kwargs):
+    """
+    The invalidate_cached_planets function bumps the planets version when their terrains or climates change, from
+    either side of the relation.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        cache.bump_version(cache.PLANET, using)
+
+
+connection_created.connect(metrics.instrument_connection)
+connection_created.connect(slow_queries.instrument_connection)
+
+
+DIMENSIONS_BY_THROUGH = {
+    models.Planet.terrains.through: aggregates.TERRAIN,
+    models.Planet.climates.through: aggregates.CLIMATE,
+}
+
+
+@receiver(pre_save, sender=models.Planet)
+def remember_population(sender, instance, raw: bool, using: str, **kwargs):
+    """
+    The remember_population function keeps the stored population of a planet about to be updated, so the population
+    summaries can move it from the old value to the new one.
+    """
+    if raw or instance.pk is None or aggregates.is_suspended():
+        return
+
+    instance._stored_population = (
+        sender.objects.using(using)
+        .filter(pk=instance.pk)
+        .values_list("population", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=models.Planet)
+def update_population_summaries(sender, instance, created: bool, using: str, **kwargs):
+    """
+    The update_population_summaries function applies a population change to the summaries of the planet terrains and
+    climates. A new planet has no terrains or climates yet, they are counted when linked.
+    """
+    if created or not hasattr(instance, "_stored_population"):
+        return
+
+    stored = instance.__dict__.pop("_stored_population")
+    if stored == instance.population:
+        return
+
+    for dimension, target_ids in aggregates.planet_links(instance.pk, using).items():
+        aggregates.remove(
+            dimension, target_ids, aggregates.Delta.of_planet(stored), using
+        )
+        aggregates.add(
+            dimension,
+            target_ids,
+            aggregates.Delta.of_planet(instance.population),
+            using,
+        )
+
+
+@receiver(pre_delete, sender=models.Planet)
+def remember_planet_links(sender, instance, using: str, **kwargs):
+    """
+    The remember_planet_links function reads the terrains and climates of a planet before its links are deleted in
+    cascade, which doesn't send m2m_changed.
+    """
+    if not aggregates.is_suspended():
+        instance._stored_links = aggregates.planet_links(instance.pk, using)
+
+
+@receiver(post_delete, sender=models.Planet)
+def remove_planet_from_summaries(sender, instance, using: str, **kwargs):
+    if not hasattr(instance, "_stored_links"):
+        return
+
+    delta = aggregates.Delta.of_planet(instance.population)
+    for dimension, target_ids in instance.__dict__.pop("_stored_links").items():
+        aggregates.remove(dimension, target_ids, delta, using)
+
+
+@receiver(m2m_changed, sender=models.Planet.terrains.through)
+@receiver(m2m_changed, sender=models.Planet.climates.through)
+def update_linked_summaries(
+    sender, instance, action: str, reverse: bool, pk_set, using: str, **kwargs
+):
+    """
+    The update_linked_summaries function keeps the population summaries in line with the terrain and climate links,
+    from either side of the relation.
+    pk_set only holds the new links on post_add, but it holds every requested id on remove, so the links that really
+    exist are read before a remove or clear and applied once they are deleted.
+    """
+    if aggregates.is_suspended():
+        return
+
+    dimension = DIMENSIONS_BY_THROUGH[sender]
+    _, through, target_field = aggregates.DIMENSIONS[dimension]
+    source_field, other_field = (
+        (target_field, "planet_id") if reverse else ("planet_id", target_field)
+    )
+
+    if action in ("pre_remove", "pre_clear"):
+        links = through.objects.using(using).filter(**{source_field: instance.pk})
+        if action == "pre_remove":
+            links = links.filter(**{f"{other_field}__in": pk_set})
+        instance._removed_links = set(links.values_list(other_field, flat=True))
+        return
+
+    if action == "post_add":
+        linked = pk_set
+    elif action in ("post_remove", "post_clear"):
+        linked = instance.__dict__.pop("_removed_links", None)
+    else:
+        return
+
+    if not linked:
+        return
+
+    if reverse:
+        target_ids = [instance.pk]
+        delta = aggregates.Delta.of_planets(linked, using)
+    else:
+        target_ids = linked
+        delta = aggregates.Delta.of_planet(instance.population)
+
+    if action == "post_add":
+        aggregates.add(dimension, target_ids, delta, using)
+    else:
+        aggregates.remove(dimension, target_ids, delta, using)
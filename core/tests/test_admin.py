@@ -1,6 +1,7 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 
 from core import models
 
@@ -244,3 +245,23 @@ class AdminSiteTests(TestCase):
         self.assertContains(res, 'name="population"')
         self.assertContains(res, 'name="terrains"')
         self.assertContains(res, 'name="climates"')
+
+    def test_revoked_tokens_list(self):
+        """
+        The test_revoked_tokens_list function tests that the revoked tokens are listed, and that they can't be added
+        from the admin, since revoking needs a real token.
+
+        :param self: Access the attributes and methods of the class in python
+        :return: The status codes, 200 and 403
+        :doc-author: Trelent
+        """
+        models.RevokedToken.objects.create(
+            jti="revoked-jti", user=self.user, expires_at=timezone.now()
+        )
+
+        res = self.client.get(reverse("admin:core_revokedtoken_changelist"))
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, "revoked-jti")
+
+        res = self.client.get(reverse("admin:core_revokedtoken_add"))
+        self.assertEqual(res.status_code, 403)
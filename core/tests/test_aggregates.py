@@ -0,0 +1,174 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core import aggregates, models
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from core.ingest.sync import PlanetSynchronizer
+
+
+def stored_summaries() -> dict:
+    return {
+        dimension: {
+            summary.pk: (
+                summary.planets,
+                summary.populated_planets,
+                summary.total_population,
+                summary.max_population,
+            )
+            for summary in model.objects.filter(planets__gt=0)
+        }
+        for dimension, (model, _, _) in aggregates.DIMENSIONS.items()
+    }
+
+
+def computed_summaries() -> dict:
+    return {
+        dimension: {
+            row[target_field]: (
+                row["planets"],
+                row["populated_planets"],
+                row["total_population"],
+                row["max_population"],
+            )
+            for row in aggregates.summarize(dimension)
+        }
+        for dimension, (_, _, target_field) in aggregates.DIMENSIONS.items()
+    }
+
+
+class PopulationSummaryTests(TestCase):
+    def setUp(self):
+        self.desert = models.Terrain.objects.create(name="desert")
+        self.mountains = models.Terrain.objects.create(name="mountains")
+        self.arid = models.Climate.objects.create(name="arid")
+        self.tatooine = models.Planet.objects.create(name="Tatooine", population=200)
+        self.geonosis = models.Planet.objects.create(name="Geonosis", population=500)
+        self.hoth = models.Planet.objects.create(name="Hoth")
+
+    def assertSummariesConsistent(self):
+        self.assertEqual(stored_summaries(), computed_summaries())
+
+    def test_links_are_counted(self):
+        self.tatooine.terrains.add(self.desert, self.mountains)
+        self.geonosis.terrains.add(self.desert)
+        self.hoth.terrains.add(self.mountains)
+        self.tatooine.climates.add(self.arid)
+
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.desert.pk], (2, 2, 700, 500)
+        )
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.mountains.pk], (2, 1, 200, 200)
+        )
+        self.assertSummariesConsistent()
+
+    def test_links_from_the_reverse_side(self):
+        self.desert.planets.add(self.tatooine, self.geonosis, self.hoth)
+        self.assertSummariesConsistent()
+
+        self.desert.planets.remove(self.geonosis)
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.desert.pk], (2, 1, 200, 200)
+        )
+
+        self.desert.planets.clear()
+        self.assertSummariesConsistent()
+
+    def test_removing_the_maximum(self):
+        self.desert.planets.add(self.tatooine, self.geonosis)
+
+        self.geonosis.terrains.remove(self.desert, self.mountains)
+
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.desert.pk], (1, 1, 200, 200)
+        )
+        self.assertSummariesConsistent()
+
+    def test_population_change(self):
+        self.desert.planets.add(self.tatooine, self.geonosis, self.hoth)
+
+        self.geonosis.population = 100
+        self.geonosis.save()
+        self.hoth.population = 50
+        self.hoth.save()
+
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.desert.pk], (3, 3, 350, 200)
+        )
+        self.assertSummariesConsistent()
+
+    def test_planet_and_terrain_deletes(self):
+        self.desert.planets.add(self.tatooine, self.geonosis)
+        self.mountains.planets.add(self.geonosis)
+        self.geonosis.climates.add(self.arid)
+
+        self.geonosis.delete()
+        self.assertSummariesConsistent()
+
+        self.desert.delete()
+        self.assertFalse(models.TerrainPopulation.objects.filter(pk=self.desert.pk))
+
+    def test_bulk_writes_refresh_summaries(self):
+        BulkPlanetWriter().write(
+            [
+                PlanetRecord("Tatooine", 300, ("desert", "dunes"), ("arid",)),
+                PlanetRecord("Bespin", 6000, ("gas giant",), ("temperate",)),
+            ]
+        )
+        self.assertSummariesConsistent()
+
+        PlanetSynchronizer().sync([PlanetRecord("Bespin", 10, ("desert",), ())])
+        self.assertSummariesConsistent()
+        self.assertEqual(
+            stored_summaries()[aggregates.TERRAIN][self.desert.pk], (1, 1, 10, 10)
+        )
+
+    def test_bulk_writes_only_refresh_touched_summaries(self):
+        records = [
+            PlanetRecord("Tatooine", 300, ("desert",), ("arid",)),
+            PlanetRecord("Bespin", 6000, ("gas giant",), ("temperate",)),
+            PlanetRecord("Hoth", 50, ("tundra",), ("frozen",)),
+        ]
+        PlanetSynchronizer().sync(records)
+        # Left alone by the runs below, a full rebuild would correct it.
+        models.TerrainPopulation.objects.filter(terrain__name="gas giant").update(
+            planets=99
+        )
+
+        PlanetSynchronizer().sync(
+            [
+                PlanetRecord("Tatooine", 400, ("desert",), ("arid",)),
+                records[1],
+                PlanetRecord("Jakku", 10, ("desert",), ()),
+            ]
+        )
+
+        summaries = {
+            summary.terrain.name: (summary.planets, summary.total_population)
+            for summary in models.TerrainPopulation.objects.select_related("terrain")
+        }
+        self.assertEqual(summaries["gas giant"], (99, 6000))
+        self.assertEqual(summaries["desert"], (2, 410))
+        # Hoth was deleted from the catalog.
+        self.assertNotIn("tundra", summaries)
+
+    def test_sync_refreshes_the_summaries_of_replaced_links(self):
+        PlanetSynchronizer().sync([PlanetRecord("Bespin", 10, ("desert",), ("arid",))])
+
+        PlanetSynchronizer().sync([PlanetRecord("Bespin", 10, ("dunes",), ("arid",))])
+
+        self.assertSummariesConsistent()
+        self.assertNotIn(self.desert.pk, stored_summaries()[aggregates.TERRAIN])
+
+    def test_rebuild_command(self):
+        self.desert.planets.add(self.tatooine, self.geonosis)
+        models.TerrainPopulation.objects.update(planets=0, total_population=0)
+
+        out = StringIO()
+        call_command("rebuild_population_summaries", stdout=out)
+
+        self.assertIn("Population summaries rebuilt", out.getvalue())
+        self.assertSummariesConsistent()
@@ -0,0 +1,147 @@
+import inspect
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from climate.views import ClimateViewSet
+from core import cache
+from core.models import Climate, Terrain
+from terrain.views import TerrainViewSet
+from user.tests.test_user_api import create_user
+
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+CLIMATE_LIST_URL = reverse("climate:climate-list")
+
+
+def terrain_detail_url(terrain_id):
+    return reverse("terrain:terrain-detail", args=[terrain_id])
+
+
+def async_views(viewset):
+    with override_settings(API_ASYNC_VIEWS=True):
+        return (
+            viewset.as_view({"get": "list", "post": "create"}),
+            viewset.as_view({"get": "retrieve", "delete": "destroy"}),
+        )
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear_response_cache()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        self.terrains = [Terrain.objects.create(name=f"terrain-{i}") for i in range(3)]
+        Climate.objects.create(name="arid")
+        self.factory = APIRequestFactory()
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def call(self, view, request, authenticate=True, **kwargs):
+        if authenticate:
+            force_authenticate(request, user=self.user)
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+
+        return response
+
+    def test_views_are_sync_unless_enabled(self):
+        with override_settings(API_ASYNC_VIEWS=False):
+            view = TerrainViewSet.as_view({"get": "list"})
+
+        self.assertFalse(inspect.iscoroutinefunction(view))
+        self.assertTrue(inspect.iscoroutinefunction(async_views(TerrainViewSet)[0]))
+
+    def test_write_only_views_stay_sync(self):
+        with override_settings(API_ASYNC_VIEWS=True):
+            view = TerrainViewSet.as_view({"post": "create"})
+
+        self.assertFalse(inspect.iscoroutinefunction(view))
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_async_list_matches_sync_list(self):
+        list_view, _ = async_views(TerrainViewSet)
+        expected = self.client_api.get(f"{TERRAIN_LIST_URL}?page_size=2")
+
+        res = self.call(list_view, self.factory.get(f"{TERRAIN_LIST_URL}?page_size=2"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(res["ETag"], expected["ETag"])
+
+    def test_async_retrieve(self):
+        _, detail_view = async_views(ClimateViewSet)
+        climate = Climate.objects.get()
+
+        res = self.call(
+            detail_view,
+            self.factory.get(reverse("climate:climate-detail", args=[climate.id])),
+            pk=str(climate.id),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"id": climate.id, "name": "arid"})
+
+    def test_async_retrieve_not_found(self):
+        _, detail_view = async_views(TerrainViewSet)
+
+        for pk in ("0", "not-a-number"):
+            res = self.call(detail_view, self.factory.get("/"), pk=pk)
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_async_views_require_authentication(self):
+        list_view, _ = async_views(TerrainViewSet)
+
+        res = self.call(list_view, self.factory.get(TERRAIN_LIST_URL), False)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_async_views_authenticate_jwt(self):
+        list_view, _ = async_views(ClimateViewSet)
+        token = AccessToken.for_user(self.user)
+        request = self.factory.get(
+            CLIMATE_LIST_URL, HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+        res = self.call(list_view, request, authenticate=False)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([climate["name"] for climate in res.data["results"]], ["arid"])
+
+    def test_async_list_is_cached_and_conditional(self):
+        list_view, _ = async_views(TerrainViewSet)
+
+        first = self.call(list_view, self.factory.get(TERRAIN_LIST_URL))
+        second = self.call(list_view, self.factory.get(TERRAIN_LIST_URL))
+        not_modified = self.call(
+            list_view,
+            self.factory.get(TERRAIN_LIST_URL, HTTP_IF_NONE_MATCH=first["ETag"]),
+        )
+
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_fall_back_to_sync_views(self):
+        list_view, detail_view = async_views(TerrainViewSet)
+
+        created = self.call(
+            list_view, self.factory.post(TERRAIN_LIST_URL, {"name": "x"})
+        )
+        deleted = self.call(
+            detail_view,
+            self.factory.delete(terrain_detail_url(self.terrains[0].id)),
+            pk=str(self.terrains[0].id),
+        )
+
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(deleted.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            sorted(Terrain.objects.values_list("name", flat=True)),
+            ["terrain-1", "terrain-2", "x"],
+        )
@@ -0,0 +1,228 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import cache
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from core.models import Climate, Planet, ResourceVersion, Terrain
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+
+
+def planet_detail_url(planet_id):
+    return reverse("planet:planet-detail", args=[planet_id])
+
+
+def terrain_detail_url(terrain_id):
+    return reverse("terrain:terrain-detail", args=[terrain_id])
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear_response_cache()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        self.terrain = Terrain.objects.create(name="desert")
+        self.climate = Climate.objects.create(name="arid")
+        self.planet = Planet.objects.create(name="Tatooine", population=200000)
+        self.planet.terrains.add(self.terrain)
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client_api.get(PLANET_LIST_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        # The resource version only.
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(
+            cache.response_cache_stats()["planet"], {"hits": 1, "misses": 1}
+        )
+
+    def test_query_parameters_are_part_of_the_key(self):
+        self.client_api.get(f"{PLANET_LIST_URL}?page_size=1&format=json")
+
+        same = self.client_api.get(f"{PLANET_LIST_URL}?format=json&page_size=1")
+        other = self.client_api.get(f"{PLANET_LIST_URL}?page_size=2")
+
+        self.assertEqual(same["X-Cache"], "HIT")
+        self.assertEqual(other["X-Cache"], "MISS")
+
+    def test_create_invalidates_list(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        self.client_api.post(PLANET_LIST_URL, {"name": "Hoth"})
+        res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertIn("Hoth", [planet["name"] for planet in res.data["results"]])
+
+    def test_many_to_many_update_invalidates_detail(self):
+        self.client_api.get(planet_detail_url(self.planet.id))
+
+        self.client_api.patch(
+            planet_detail_url(self.planet.id),
+            {"climates": [self.climate.name]},
+            format="json",
+        )
+        res = self.client_api.get(planet_detail_url(self.planet.id))
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["climates"], [self.climate.name])
+
+    def test_terrain_rename_invalidates_planets(self):
+        self.client_api.get(PLANET_LIST_URL)
+        self.client_api.get(TERRAIN_LIST_URL)
+
+        self.client_api.patch(terrain_detail_url(self.terrain.id), {"name": "dunes"})
+        planets = self.client_api.get(PLANET_LIST_URL)
+        terrains = self.client_api.get(TERRAIN_LIST_URL)
+
+        self.assertEqual(planets.data["results"][0]["terrains"], ["dunes"])
+        self.assertEqual(terrains.data["results"][0]["name"], "dunes")
+
+    def test_planet_write_keeps_terrain_cache(self):
+        self.client_api.get(TERRAIN_LIST_URL)
+
+        self.client_api.post(PLANET_LIST_URL, {"name": "Hoth"})
+        res = self.client_api.get(TERRAIN_LIST_URL)
+
+        self.assertEqual(res["X-Cache"], "HIT")
+
+    def test_bulk_ingest_invalidates(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        BulkPlanetWriter().write([PlanetRecord("Hoth", terrains=("tundra",))])
+        res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_unauthenticated_requests_are_not_served_from_cache(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        res = APIClient().get(PLANET_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_missing_version_turns_the_cache_off_until_the_next_write(self):
+        first_version = cache.get_version(cache.PLANET)
+        ResourceVersion.objects.filter(resource=cache.PLANET).delete()
+
+        self.client_api.get(PLANET_LIST_URL)
+        res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertNotIn("X-Cache", res)
+        self.assertNotIn("ETag", res)
+        Planet.objects.create(name="Hoth")
+        # Restarted from the current time, it doesn't reuse the versions of the cached entries.
+        self.assertGreater(cache.get_version(cache.PLANET), first_version)
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_cache_can_be_disabled(self):
+        self.client_api.get(PLANET_LIST_URL)
+        res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertNotIn("X-Cache", res)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear_response_cache()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        self.climate = Climate.objects.create(name="arid")
+        self.planet = Planet.objects.create(name="Tatooine", population=200000)
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def test_matching_etag_returns_not_modified_without_reading_the_resource(self):
+        etag = self.client_api.get(PLANET_LIST_URL)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client_api.get(PLANET_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+        self.assertEqual(len(queries), 1)
+        self.assertIn("core_resourceversion", queries[0]["sql"])
+
+    def test_weak_and_multiple_etags_match(self):
+        etag = self.client_api.get(planet_detail_url(self.planet.id))["ETag"]
+
+        res = self.client_api.get(
+            planet_detail_url(self.planet.id), HTTP_IF_NONE_MATCH=f'"other", W/{etag}'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_depends_on_location(self):
+        list_etag = self.client_api.get(PLANET_LIST_URL)["ETag"]
+        page_etag = self.client_api.get(f"{PLANET_LIST_URL}?page_size=1")["ETag"]
+
+        res = self.client_api.get(
+            f"{PLANET_LIST_URL}?page_size=1", HTTP_IF_NONE_MATCH=list_etag
+        )
+
+        self.assertNotEqual(list_etag, page_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_planet_write_through_serializer_moves_the_etag(self):
+        etag = self.client_api.get(planet_detail_url(self.planet.id))["ETag"]
+
+        self.client_api.patch(
+            planet_detail_url(self.planet.id),
+            {"climates": [self.climate.name]},
+            format="json",
+        )
+        res = self.client_api.get(
+            planet_detail_url(self.planet.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        self.assertEqual(res.data["climates"], [self.climate.name])
+
+    def test_many_to_many_change_from_the_other_side_moves_the_etag(self):
+        etag = self.client_api.get(PLANET_LIST_URL)["ETag"]
+
+        self.climate.planets.add(self.planet)
+        res = self.client_api.get(PLANET_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_writes_of_other_processes_move_the_etag(self):
+        etag = self.client_api.get(PLANET_LIST_URL)["ETag"]
+
+        # Another process (a worker, an ingest command) has its own local "api" cache.
+        with patch("core.cache.get_api_cache", return_value=LocMemCache("other", {})):
+            Planet.objects.create(name="Hoth")
+        res = self.client_api.get(PLANET_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("Hoth", [planet["name"] for planet in res.data["results"]])
+
+    def test_errors_have_no_etag(self):
+        res = self.client_api.get(planet_detail_url(self.planet.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", res)
@@ -1,10 +1,13 @@
+import datetime
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.db.utils import OperationalError
 from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
 
 from core import models
 
@@ -84,3 +87,124 @@ class TestAddBasePlanetDataCommand(TestCase):
         self.assertEqual(planet.name, "Tatooine")
         self.assertIn(terrain, planet.terrains.all())
         self.assertIn(climate, planet.climates.all())
+
+    def test_add_base_planet_data_bulk(self, patched_get_graphql_response):
+        patched_get_graphql_response.return_value = {
+            "data": {
+                "allPlanets": {
+                    "planets": [
+                        {
+                            "name": "Tatooine",
+                            "population": 200000,
+                            "terrains": ["desert"],
+                            "climates": ["arid"],
+                        },
+                        {
+                            "name": "Hoth",
+                            "population": None,
+                            "terrains": ["tundra", "ice caves"],
+                            "climates": ["frozen"],
+                        },
+                    ]
+                }
+            }
+        }
+        out = StringIO()
+
+        call_command("add_base_planet_data", "--bulk", stdout=out)
+
+        planet = models.Planet.objects.get(name="Hoth")
+        self.assertIsNone(planet.population)
+        self.assertEqual(
+            set(planet.terrains.values_list("name", flat=True)),
+            {"tundra", "ice caves"},
+        )
+        self.assertIn(
+            "desert",
+            models.Planet.objects.get(name="Tatooine").terrains.values_list(
+                "name", flat=True
+            ),
+        )
+        self.assertIn("rows/s", out.getvalue())
+
+    def test_add_base_planet_data_copy(self, patched_get_graphql_response):
+        patched_get_graphql_response.return_value = {
+            "data": {
+                "allPlanets": {
+                    "planets": [
+                        {
+                            "name": "Hoth",
+                            "population": None,
+                            "terrains": ["tundra", "ice caves"],
+                            "climates": ["frozen"],
+                        },
+                    ]
+                }
+            }
+        }
+        out = StringIO()
+
+        call_command("add_base_planet_data", "--copy", stdout=out)
+
+        planet = models.Planet.objects.get(name="Hoth")
+        self.assertEqual(
+            set(planet.terrains.values_list("name", flat=True)),
+            {"tundra", "ice caves"},
+        )
+        self.assertIn("rows/s", out.getvalue())
+
+
+class TestPurgeRevokedTokensCommand(TestCase):
+    def test_purge_revoked_tokens(self):
+        now = timezone.now()
+        models.RevokedToken.objects.create(
+            jti="expired", expires_at=now - datetime.timedelta(minutes=1)
+        )
+        models.RevokedToken.objects.create(
+            jti="active", expires_at=now + datetime.timedelta(minutes=5)
+        )
+        out = StringIO()
+
+        call_command("purge_revoked_tokens", stdout=out)
+
+        self.assertEqual(
+            list(models.RevokedToken.objects.values_list("jti", flat=True)), ["active"]
+        )
+        self.assertIn("Deleted 1 expired revoked tokens", out.getvalue())
+
+
+class TestGenerateSyntheticCatalogCommand(TestCase):
+    def test_generate_synthetic_catalog(self):
+        out = StringIO()
+
+        call_command(
+            "generate_synthetic_catalog",
+            "--planets=300",
+            "--terrains=12",
+            "--climates=4",
+            "--progress-every=100",
+            stdout=out,
+        )
+
+        self.assertEqual(models.Planet.objects.count(), 300)
+        self.assertLessEqual(models.Terrain.objects.count(), 12)
+        self.assertLessEqual(models.Climate.objects.count(), 4)
+        self.assertEqual(
+            models.TerrainPopulation.objects.count(), models.Terrain.objects.count()
+        )
+        self.assertIn("200/300 planets", out.getvalue())
+        self.assertIn("planets/s", out.getvalue())
+
+    def test_generate_synthetic_catalog_again_upserts(self):
+        call_command("generate_synthetic_catalog", "--planets=50", stdout=StringIO())
+        populations = dict(models.Planet.objects.values_list("name", "population"))
+
+        call_command("generate_synthetic_catalog", "--planets=50", stdout=StringIO())
+
+        self.assertEqual(
+            dict(models.Planet.objects.values_list("name", "population")), populations
+        )
+
+    def test_generate_synthetic_catalog_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command("generate_synthetic_catalog", "--planets=0")
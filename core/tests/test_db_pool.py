@@ -0,0 +1,205 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.db import pool
+from core.db.backends.postgresql.base import check_connection, reset_connection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.info = SimpleNamespace(transaction_status=0)
+        self.rollbacks = 0
+
+    def close(self):
+        self.closed = True
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = 0
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def execute(self, sql):
+                if connection.closed:
+                    raise RuntimeError("connection already closed")
+                connection.info.transaction_status = 2
+
+        return Cursor()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.connections = []
+        self.clock = Clock()
+        patcher = patch("core.db.pool.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def connect(self):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+    def make_pool(self, **kwargs) -> pool.ConnectionPool:
+        kwargs.setdefault("check", check_connection)
+        kwargs.setdefault("reset", reset_connection)
+        return pool.ConnectionPool(connect=self.connect, **kwargs)
+
+    def test_returned_connection_is_reused(self):
+        connections = self.make_pool()
+
+        first = connections.checkout()
+        connections.checkin(first)
+        second = connections.checkout()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(connections.snapshot()["checkouts"], 2)
+
+    def test_open_creates_min_size_connections(self):
+        connections = self.make_pool(min_size=2)
+
+        connections.open()
+
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(connections.snapshot()["idle"], 2)
+
+    def test_checkout_times_out_when_exhausted(self):
+        connections = self.make_pool(max_size=1, timeout=0)
+        connections.checkout()
+
+        with self.assertRaises(pool.PoolTimeout):
+            connections.checkout()
+
+        self.assertEqual(connections.snapshot()["timeouts"], 1)
+
+    def test_checkout_waits_for_a_returned_connection(self):
+        connections = pool.ConnectionPool(connect=self.connect, max_size=1)
+        connection = connections.checkout()
+        checked_out = []
+
+        waiter = threading.Thread(
+            target=lambda: checked_out.append(connections.checkout())
+        )
+        waiter.start()
+        connections.checkin(connection)
+        waiter.join(5)
+
+        self.assertEqual(checked_out, [connection])
+        self.assertEqual(len(self.connections), 1)
+
+    def test_unhealthy_connection_is_replaced(self):
+        connections = self.make_pool()
+        first = connections.checkout()
+        connections.checkin(first)
+        first.closed = True
+
+        second = connections.checkout()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(connections.snapshot()["health_check_failures"], 1)
+        self.assertEqual(connections.snapshot()["size"], 1)
+
+    def test_health_check_leaves_connection_idle(self):
+        connections = self.make_pool()
+        connections.checkin(connections.checkout())
+
+        connection = connections.checkout()
+
+        self.assertEqual(connection.info.transaction_status, 0)
+
+    def test_checkin_rolls_back_open_transaction(self):
+        connections = self.make_pool()
+        connection = connections.checkout()
+        connection.info.transaction_status = 2
+
+        connections.checkin(connection)
+
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertFalse(connection.closed)
+        self.assertEqual(connections.snapshot()["idle"], 1)
+
+    def test_closed_connection_is_discarded_on_checkin(self):
+        connections = self.make_pool()
+        connection = connections.checkout()
+        connection.close()
+
+        connections.checkin(connection)
+
+        self.assertEqual(connections.snapshot()["size"], 0)
+
+    def test_connection_past_max_lifetime_is_closed(self):
+        connections = self.make_pool(max_lifetime=60)
+        first = connections.checkout()
+        self.clock.now += 61
+
+        connections.checkin(first)
+        second = connections.checkout()
+
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, second)
+
+    def test_idle_connections_above_min_size_are_evicted(self):
+        connections = self.make_pool(min_size=1, max_idle=10)
+        first, second = connections.checkout(), connections.checkout()
+        connections.checkin(first)
+        connections.checkin(second)
+        self.clock.now += 11
+
+        connections.checkin(connections.checkout())
+
+        self.assertEqual(sum(c.closed for c in self.connections), 1)
+        self.assertEqual(connections.snapshot()["size"], 1)
+
+    def test_failed_connect_releases_its_slot(self):
+        connections = pool.ConnectionPool(connect=lambda: 1 / 0, max_size=1, timeout=0)
+
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                connections.checkout()
+
+        self.assertEqual(connections.snapshot()["size"], 0)
+
+    def test_snapshot_reports_utilization(self):
+        connections = self.make_pool(max_size=4)
+        connections.checkout()
+
+        snapshot = connections.snapshot()
+
+        self.assertEqual(snapshot["in_use"], 1)
+        self.assertEqual(snapshot["utilization"], 0.25)
+        self.assertGreaterEqual(snapshot["wait_time_max_ms"], 0)
+
+    def test_close_pools(self):
+        connections = pool.get_pool(
+            "test", ("test", "close_pools"), lambda: self.make_pool(min_size=1)
+        )
+        self.assertIs(
+            pool.get_pool("test", ("test", "close_pools"), lambda: None), connections
+        )
+        self.assertIn("test", pool.pool_stats())
+
+        pool.close_pools("test")
+
+        self.assertTrue(self.connections[0].closed)
+        self.assertNotIn("test", pool.pool_stats())
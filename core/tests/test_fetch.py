@@ -0,0 +1,210 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import PropertyMock, patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core import models
+from core.ingest.fetch import (
+    FetchError,
+    GraphQLPlanetFetcher,
+    cursor_offset,
+    offset_cursor,
+)
+
+
+class FakeSwapiServer:
+    """
+    Local stand-in for the SWAPI GraphQL API, serving `allPlanets(first, after)` with relay array cursors.
+    The first `failures` requests answer with `failure_status` to exercise the retries.
+    """
+
+    def __init__(
+        self,
+        planets: list[dict],
+        failures: int = 0,
+        failure_status: int = 503,
+        delay: float = 0.0,
+        relay_cursors: bool = True,
+    ):
+        self.planets = planets
+        self.failures = failures
+        self.failure_status = failure_status
+        self.delay = delay
+        self.relay_cursors = relay_cursors
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/graphql"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def cursor(self, offset: int) -> str:
+        return offset_cursor(offset) if self.relay_cursors else f"opaque-{offset}"
+
+    def offset(self, cursor: str) -> int:
+        if self.relay_cursors:
+            return cursor_offset(cursor)
+        return int(cursor.split("-")[1])
+
+    def page(self, variables: dict) -> dict:
+        start = 0 if not variables.get("after") else self.offset(variables["after"]) + 1
+        end = min(start + variables["first"], len(self.planets))
+        return {
+            "data": {
+                "allPlanets": {
+                    "totalCount": len(self.planets),
+                    "pageInfo": {
+                        "hasNextPage": end < len(self.planets),
+                        "endCursor": self.cursor(end - 1),
+                    },
+                    "planets": self.planets[start:end],
+                }
+            }
+        }
+
+    def build_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake.lock:
+                    fake.requests += 1
+                    fail = fake.requests <= fake.failures
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    time.sleep(fake.delay)
+                    if fail:
+                        status, payload = fake.failure_status, {"error": "unavailable"}
+                    else:
+                        status, payload = 200, fake.page(body["variables"])
+                    content = json.dumps(payload).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                finally:
+                    with fake.lock:
+                        fake.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def make_planets(amount: int) -> list[dict]:
+    return [
+        {
+            "name": f"planet-{index}",
+            "population": index,
+            "terrains": ["desert"],
+            "climates": ["arid"],
+        }
+        for index in range(amount)
+    ]
+
+
+class GraphQLPlanetFetcherTests(SimpleTestCase):
+    def test_cursor_offset(self):
+        self.assertEqual(cursor_offset(offset_cursor(42)), 42)
+        self.assertIsNone(cursor_offset("opaque-42"))
+        self.assertIsNone(cursor_offset(None))
+
+    def test_fetches_all_pages_concurrently_in_order(self):
+        planets = make_planets(95)
+
+        with FakeSwapiServer(planets, delay=0.05) as server:
+            fetcher = GraphQLPlanetFetcher(server.url, page_size=10, workers=4)
+            fetched = list(fetcher.iter_planets())
+
+        self.assertEqual(fetched, planets)
+        self.assertEqual(server.requests, 10)
+        self.assertGreater(server.max_in_flight, 1)
+
+    def test_follows_opaque_cursors_sequentially(self):
+        planets = make_planets(25)
+
+        with FakeSwapiServer(planets, relay_cursors=False) as server:
+            fetcher = GraphQLPlanetFetcher(server.url, page_size=10, workers=4)
+            fetched = list(fetcher.iter_planets())
+
+        self.assertEqual(fetched, planets)
+        self.assertEqual(server.max_in_flight, 1)
+
+    def test_retries_transient_failures(self):
+        planets = make_planets(5)
+
+        with FakeSwapiServer(planets, failures=3) as server:
+            fetcher = GraphQLPlanetFetcher(server.url, retries=3, backoff=0.001)
+            fetched = list(fetcher.iter_planets())
+
+        self.assertEqual(fetched, planets)
+        self.assertEqual(server.requests, 4)
+
+    def test_gives_up_after_retries(self):
+        with FakeSwapiServer(make_planets(5), failures=10) as server:
+            fetcher = GraphQLPlanetFetcher(server.url, retries=2, backoff=0.001)
+            with self.assertRaises(FetchError):
+                list(fetcher.iter_planets())
+
+        self.assertEqual(server.requests, 3)
+
+    def test_does_not_retry_client_errors(self):
+        with FakeSwapiServer(
+            make_planets(5), failures=10, failure_status=400
+        ) as server:
+            fetcher = GraphQLPlanetFetcher(server.url, retries=2, backoff=0.001)
+            with self.assertRaises(FetchError):
+                list(fetcher.iter_planets())
+
+        self.assertEqual(server.requests, 1)
+
+    def test_backoff_is_exponential_with_jitter(self):
+        fetcher = GraphQLPlanetFetcher(backoff=1, max_backoff=5)
+
+        for attempt, ceiling in enumerate([1, 2, 4, 5, 5]):
+            delays = [fetcher.backoff_delay(attempt) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+        self.assertEqual(fetcher.backoff_delay(0, retry_after="3"), 3)
+
+
+class AddBasePlanetDataConcurrentTests(TestCase):
+    def test_add_base_planet_data_concurrent(self):
+        planets = make_planets(30)
+
+        with FakeSwapiServer(planets) as server, patch(
+            "core.management.commands.add_base_planet_data.Command.graphql_url",
+            new_callable=PropertyMock,
+            return_value=server.url,
+        ):
+            call_command(
+                "add_base_planet_data",
+                "--concurrent",
+                "--bulk",
+                "--page-size",
+                "7",
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(models.Planet.objects.count(), 30)
+        self.assertEqual(models.Terrain.objects.get().planets.count(), 30)
@@ -0,0 +1,314 @@
+import csv
+import io
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core import cache, models
+from core.ingest.bulk import BulkPlanetWriter, IngestStats
+from core.ingest.copy_writer import ChunkReader, CopyPlanetWriter, array_literal
+from core.ingest.records import PlanetRecord
+from core.ingest.synthetic import SyntheticCatalog, vocabulary
+
+
+def make_records(amount: int) -> list[PlanetRecord]:
+    return [
+        PlanetRecord(
+            name=f"planet-{index}",
+            population=index * 10,
+            terrains=(f"terrain-{index % 4}", f"terrain-{(index + 1) % 4}"),
+            climates=(f"climate-{index % 3}",),
+        )
+        for index in range(amount)
+    ]
+
+
+class PlanetRecordTests(TestCase):
+    def test_from_dict_normalizes_source_values(self):
+        record = PlanetRecord.from_dict(
+            {
+                "name": " Tatooine ",
+                "population": 200000.0,
+                "terrains": ["desert", "unknown", "desert", None],
+                "climates": None,
+            }
+        )
+
+        self.assertEqual(record.name, "Tatooine")
+        self.assertEqual(record.population, 200000)
+        self.assertEqual(record.terrains, ("desert",))
+        self.assertEqual(record.climates, ())
+
+    def test_from_dict_unknown_population(self):
+        record = PlanetRecord.from_dict({"name": "Hoth", "population": "unknown"})
+
+        self.assertIsNone(record.population)
+
+
+class BulkPlanetWriterTests(TestCase):
+    def test_write_creates_planets_and_links(self):
+        stats = BulkPlanetWriter().write(make_records(10))
+
+        self.assertEqual(stats.planets, 10)
+        self.assertEqual(stats.terrains, 4)
+        self.assertEqual(stats.climates, 3)
+        self.assertEqual(stats.terrain_links, 20)
+        self.assertEqual(stats.climate_links, 10)
+        self.assertEqual(models.Planet.objects.count(), 10)
+        planet = models.Planet.objects.get(name="planet-1")
+        self.assertEqual(planet.population, 10)
+        self.assertEqual(
+            set(planet.terrains.values_list("name", flat=True)),
+            {"terrain-1", "terrain-2"},
+        )
+        self.assertEqual(
+            list(planet.climates.values_list("name", flat=True)), ["climate-1"]
+        )
+
+    def test_write_is_idempotent_and_updates_population(self):
+        BulkPlanetWriter().write(make_records(5))
+        BulkPlanetWriter().write(
+            [PlanetRecord(name="planet-1", population=999, terrains=("terrain-1",))]
+        )
+
+        self.assertEqual(models.Planet.objects.count(), 5)
+        self.assertEqual(models.Terrain.objects.count(), 4)
+        self.assertEqual(models.Planet.objects.get(name="planet-1").population, 999)
+        self.assertEqual(models.Planet.terrains.through.objects.count(), 10)
+
+    def test_write_skips_records_without_name_and_deduplicates(self):
+        stats = BulkPlanetWriter().write(
+            [
+                PlanetRecord(name=""),
+                PlanetRecord(name="Hoth", population=1),
+                PlanetRecord(name="Hoth", population=2),
+            ]
+        )
+
+        self.assertEqual(stats.skipped, 1)
+        self.assertEqual(stats.planets, 1)
+        self.assertEqual(models.Planet.objects.get(name="Hoth").population, 2)
+
+    def test_existing_names_are_not_counted(self):
+        models.Terrain.objects.create(name="terrain-0")
+        models.Climate.objects.bulk_create(
+            [models.Climate(name=f"climate-{index}") for index in range(3)]
+        )
+
+        stats = BulkPlanetWriter().write(make_records(10))
+
+        self.assertEqual(stats.terrains, 3)
+        self.assertEqual(stats.climates, 0)
+        self.assertEqual(models.Terrain.objects.count(), 4)
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        """
+        A batch costs a fixed number of statements, no matter how many planets it holds.
+        """
+        with CaptureQueriesContext(connection) as small_batch:
+            BulkPlanetWriter().write(make_records(10))
+
+        # Known names are not inserted again, both runs start from an empty catalog.
+        models.Planet.objects.all().delete()
+        models.Terrain.objects.all().delete()
+        models.Climate.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as large_batch:
+            BulkPlanetWriter().write(make_records(100))
+
+        self.assertEqual(len(small_batch), len(large_batch))
+
+
+class CopyHelpersTests(SimpleTestCase):
+    def test_array_literal(self):
+        self.assertEqual(array_literal(()), "{}")
+        self.assertEqual(
+            array_literal(("ice caves", 'a,"b"', "c\\d")),
+            '{"ice caves","a,\\"b\\"","c\\\\d"}',
+        )
+
+    def test_chunk_reader(self):
+        reader = ChunkReader(["abc", "", "defgh"])
+
+        self.assertEqual(
+            [reader.read(2), reader.read(2), reader.read(2), reader.read(2)],
+            ["ab", "c", "de", "fg"],
+        )
+        self.assertEqual(reader.read(), "h")
+        self.assertEqual(reader.read(), "")
+
+    def test_csv_chunks(self):
+        stats = IngestStats()
+        records = [
+            PlanetRecord(name="Hoth", terrains=("tundra", "ice caves")),
+            PlanetRecord(name=""),
+            PlanetRecord(name='Tatooine, "the" desert', population=200000),
+        ]
+
+        chunks = list(CopyPlanetWriter(batch_size=1).csv_chunks(records, stats))
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(stats.skipped, 1)
+        self.assertEqual(
+            rows,
+            [
+                ["0", "Hoth", "", '{"tundra","ice caves"}', "{}"],
+                ["2", 'Tatooine, "the" desert', "200000", "{}", "{}"],
+            ],
+        )
+
+
+class CopyPlanetWriterTests(TestCase):
+    """
+    Runs the COPY path on PostgreSQL and the BulkPlanetWriter fallback on the other databases, with the same results.
+    """
+
+    def test_write_creates_planets_and_links(self):
+        stats = CopyPlanetWriter().write(make_records(10))
+
+        self.assertEqual(stats.planets, 10)
+        self.assertEqual(stats.terrains, 4)
+        self.assertEqual(stats.climates, 3)
+        self.assertEqual(stats.terrain_links, 20)
+        self.assertEqual(stats.climate_links, 10)
+        planet = models.Planet.objects.get(name="planet-1")
+        self.assertEqual(planet.population, 10)
+        self.assertEqual(
+            set(planet.terrains.values_list("name", flat=True)),
+            {"terrain-1", "terrain-2"},
+        )
+        self.assertEqual(
+            models.TerrainPopulation.objects.get(terrain__name="terrain-1").planets, 6
+        )
+
+    def test_write_is_idempotent_and_updates_population(self):
+        CopyPlanetWriter().write(make_records(5))
+        CopyPlanetWriter().write(
+            [PlanetRecord(name="planet-1", population=999, terrains=("terrain-1",))]
+        )
+
+        self.assertEqual(models.Planet.objects.count(), 5)
+        self.assertEqual(models.Terrain.objects.count(), 4)
+        self.assertEqual(models.Planet.objects.get(name="planet-1").population, 999)
+        self.assertEqual(models.Planet.terrains.through.objects.count(), 10)
+
+    def test_write_skips_records_without_name_and_deduplicates(self):
+        stats = CopyPlanetWriter().write(
+            [
+                PlanetRecord(name=""),
+                PlanetRecord(name="Hoth", population=1, climates=("frozen",)),
+                PlanetRecord(name="Hoth", population=None, climates=("frozen",)),
+            ]
+        )
+
+        self.assertEqual(stats.skipped, 1)
+        self.assertEqual(stats.planets, 1)
+        self.assertIsNone(models.Planet.objects.get(name="Hoth").population)
+        self.assertEqual(models.Planet.climates.through.objects.count(), 1)
+
+    def test_write_keeps_special_characters(self):
+        name = 'Tatooine, "the" {desert} \\ planet'
+        CopyPlanetWriter().write(
+            [PlanetRecord(name=name, terrains=('dunes, "sand"', "{rock}"))]
+        )
+
+        planet = models.Planet.objects.get(name=name)
+        self.assertEqual(
+            set(planet.terrains.values_list("name", flat=True)),
+            {'dunes, "sand"', "{rock}"},
+        )
+
+    def test_new_links_of_existing_planets_invalidate_the_planets(self):
+        CopyPlanetWriter().write(make_records(5))
+        version = cache.get_version(cache.PLANET)
+
+        stats = CopyPlanetWriter().write(
+            [PlanetRecord(name="planet-1", population=10, terrains=("terrain-3",))]
+        )
+
+        self.assertEqual(stats.terrain_links, 1)
+        self.assertGreater(cache.get_version(cache.PLANET), version)
+
+    @skipIf(connection.vendor == "postgresql", "COPY is used on PostgreSQL")
+    def test_falls_back_to_the_bulk_writer(self):
+        with patch.object(
+            BulkPlanetWriter, "write", return_value=IngestStats()
+        ) as write:
+            CopyPlanetWriter().write(make_records(1))
+
+        write.assert_called_once()
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY is only used on PostgreSQL")
+class CopyMergeTests(TestCase):
+    """
+    Runs the statements of the COPY path, which the other databases never reach.
+    """
+
+    def setUp(self):
+        patcher = patch.object(BulkPlanetWriter, "write", side_effect=AssertionError)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_only_changed_planets_are_counted(self):
+        CopyPlanetWriter().write(make_records(5))
+
+        stats = CopyPlanetWriter().write(
+            [
+                PlanetRecord(name="planet-1", population=10, terrains=("terrain-3",)),
+                PlanetRecord(name="planet-2", population=999),
+            ]
+        )
+
+        self.assertEqual(stats.planets, 1)
+        self.assertEqual(stats.terrains, 0)
+        self.assertEqual(stats.terrain_links, 1)
+        self.assertEqual(models.Planet.objects.get(name="planet-2").population, 999)
+
+    def test_links_only_run_invalidates_and_refreshes(self):
+        CopyPlanetWriter().write(make_records(5))
+        version = cache.get_version(cache.PLANET)
+
+        stats = CopyPlanetWriter().write(
+            [PlanetRecord(name="planet-1", population=10, terrains=("terrain-3",))]
+        )
+
+        self.assertEqual(stats.planets, 0)
+        self.assertGreater(cache.get_version(cache.PLANET), version)
+        self.assertEqual(
+            models.TerrainPopulation.objects.get(terrain__name="terrain-3").planets,
+            models.Planet.objects.filter(terrains__name="terrain-3").count(),
+        )
+
+
+class SyntheticCatalogTests(SimpleTestCase):
+    def test_catalog_is_deterministic(self):
+        first = list(SyntheticCatalog(500, seed=7))
+
+        self.assertEqual(first, list(SyntheticCatalog(500, seed=7)))
+        self.assertNotEqual(first, list(SyntheticCatalog(500, seed=8)))
+        self.assertEqual(first[0].name, "planet-00000000")
+        self.assertEqual(len({record.name for record in first}), 500)
+
+    def test_catalog_cardinality_and_populations(self):
+        records = list(
+            SyntheticCatalog(2000, terrains=100, climates=5, unknown_population=0.25)
+        )
+
+        terrains = {name for record in records for name in record.terrains}
+        climates = {name for record in records for name in record.climates}
+        self.assertLessEqual(len(terrains), 100)
+        self.assertGreater(len(terrains), 40)
+        self.assertLessEqual(len(climates), 5)
+        self.assertTrue(all(1 <= len(record.terrains) <= 4 for record in records))
+        self.assertTrue(all(1 <= len(record.climates) <= 3 for record in records))
+        unknown = sum(record.population is None for record in records)
+        self.assertAlmostEqual(unknown / len(records), 0.25, delta=0.05)
+
+    def test_vocabulary(self):
+        self.assertEqual(vocabulary(("a", "b"), 5), ["a", "b", "a 2", "b 2", "a 3"])
+        self.assertEqual(vocabulary(("a", "b"), 1), ["a"])
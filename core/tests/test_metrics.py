@@ -0,0 +1,143 @@
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import metrics
+from core.models import Planet
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+CACHE_STATS_URL = reverse("monitoring:cache")
+LABELS = (("route", "planet:planet-list"), ("method", "GET"))
+
+
+class RegistryTests(SimpleTestCase):
+    def test_histogram_buckets(self):
+        registry = metrics.Registry()
+
+        for queries in (0, 1, 4, 500):
+            registry.observe("http_request_db_queries", LABELS, queries)
+
+        values = registry.snapshot()[("http_request_db_queries", LABELS)]
+        # Buckets 0, 1, 2, 3, 5, 10, 25, 50, 100 and +Inf, then the sum.
+        self.assertEqual(values, [1, 1, 0, 0, 1, 0, 0, 0, 0, 1, 505])
+
+    def test_render(self):
+        registry = metrics.Registry()
+        registry.inc("http_requests_total", LABELS + (("status", "200"),), 2)
+        registry.observe("http_response_size_bytes", LABELS, 150)
+        registry.observe("http_response_size_bytes", LABELS, 50_000)
+
+        text = metrics.render(registry.snapshot())
+
+        self.assertIn("# TYPE http_requests_total counter\n", text)
+        self.assertIn(
+            'http_requests_total{route="planet:planet-list",method="GET",status="200"} 2\n',
+            text,
+        )
+        self.assertIn(
+            'http_response_size_bytes_bucket{route="planet:planet-list",method="GET",le="1000"} 1\n',
+            text,
+        )
+        self.assertIn(
+            'http_response_size_bytes_bucket{route="planet:planet-list",method="GET",le="+Inf"} 2\n',
+            text,
+        )
+        self.assertIn(
+            'http_response_size_bytes_sum{route="planet:planet-list",method="GET"} 50150\n',
+            text,
+        )
+        self.assertIn(
+            'http_response_size_bytes_count{route="planet:planet-list",method="GET"} 2\n',
+            text,
+        )
+
+    def test_label_values_are_escaped(self):
+        self.assertEqual(
+            metrics.format_labels((("route", 'a"b\\c\n'),)), '{route="a\\"b\\\\c\\n"}'
+        )
+
+    @override_settings(METRICS_FLUSH_INTERVAL=60)
+    def test_samples_of_every_process_are_summed(self):
+        first, second = metrics.Registry(), metrics.Registry()
+        first.observe("http_request_duration_seconds", LABELS, 0.02)
+        second.observe("http_request_duration_seconds", LABELS, 0.2)
+        second.inc("http_requests_total", LABELS + (("status", "200"),))
+
+        with tempfile.TemporaryDirectory() as directory:
+            first.flush(directory)
+            second.flush(directory)
+            # Written less than METRICS_FLUSH_INTERVAL ago, the file is kept.
+            first.observe("http_request_duration_seconds", LABELS, 0.02)
+            first.flush(directory)
+            merged = metrics.read_samples(directory)
+
+        values = merged[("http_request_duration_seconds", LABELS)]
+        self.assertEqual(sum(values[:-1]), 2)
+        self.assertAlmostEqual(values[-1], 0.22)
+        self.assertEqual(
+            merged[("http_requests_total", LABELS + (("status", "200"),))], [1]
+        )
+
+    def test_reset_drops_the_samples(self):
+        registry = metrics.Registry()
+        registry.inc("http_requests_total", LABELS)
+        token = registry.token
+
+        registry.reset()
+
+        self.assertEqual(registry.snapshot(), {})
+        self.assertNotEqual(registry.token, token)
+
+
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        self.user = create_user(email="test@example.com", password="testpass123")
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(self.user)
+
+    def test_records_requests(self):
+        Planet.objects.create(name="Tatooine")
+
+        res = self.client_api.get(PLANET_LIST_URL)
+        self.client_api.post(PLANET_LIST_URL, {"population": "abc"})
+
+        samples = metrics.registry.snapshot()
+        self.assertEqual(
+            samples[("http_requests_total", LABELS + (("status", "200"),))], [1]
+        )
+        post_labels = (("route", "planet:planet-list"), ("method", "POST"))
+        self.assertEqual(
+            samples[("http_requests_total", post_labels + (("status", "400"),))], [1]
+        )
+        self.assertEqual(
+            samples[("http_response_size_bytes", LABELS)][-1], len(res.content)
+        )
+        self.assertGreater(samples[("http_request_db_queries", LABELS)][-1], 0)
+        self.assertGreater(samples[("http_request_db_duration_seconds", LABELS)][-1], 0)
+        self.assertGreater(samples[("http_request_duration_seconds", LABELS)][-1], 0)
+
+    def test_ignores_other_routes(self):
+        self.client_api.get(CACHE_STATS_URL)
+        self.client_api.get("/api/unknown/")
+
+        self.assertEqual(metrics.registry.snapshot(), {})
+
+    async def test_async_requests(self):
+        await Planet.objects.acreate(name="Tatooine")
+
+        with override_settings(API_CACHE_ENABLED=False):
+            await self.async_client.get(
+                PLANET_LIST_URL,
+                headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+            )
+
+        samples = metrics.registry.snapshot()
+        self.assertEqual(
+            sum(samples[("http_request_duration_seconds", LABELS)][:-1]), 1
+        )
+        self.assertGreater(samples[("http_request_db_queries", LABELS)][-1], 0)
@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import clear_response_cache
+from core.models import Terrain
+from user.tests.test_user_api import create_user
+
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+
+
+class IdCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        Terrain.objects.bulk_create(
+            [Terrain(name=f"terrain-{index:03}") for index in range(25)]
+        )
+
+        clear_response_cache()
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def test_pages_are_stable_and_complete(self):
+        """
+        Following the `next` links must visit every row exactly once, in primary key order.
+        """
+        seen = []
+        url = f"{TERRAIN_LIST_URL}?page_size=10"
+        while url:
+            res = self.client_api.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(
+            seen, list(Terrain.objects.order_by("id").values_list("id", flat=True))
+        )
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client_api.get(f"{TERRAIN_LIST_URL}?page_size=10")
+        second = self.client_api.get(first.data["next"])
+        back = self.client_api.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_cursor_is_opaque(self):
+        res = self.client_api.get(f"{TERRAIN_LIST_URL}?page_size=10")
+
+        self.assertNotIn("offset", res.data["next"])
+        self.assertIn("cursor=", res.data["next"])
+        self.assertNotIn("count", res.data)
+
+    def test_invalid_cursor(self):
+        res = self.client_api.get(f"{TERRAIN_LIST_URL}?cursor=invalid")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_uses_keyset_without_offset_or_count(self):
+        first = self.client_api.get(f"{TERRAIN_LIST_URL}?page_size=10")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client_api.get(first.data["next"])
+
+        # The resource version, then the page.
+        self.assertEqual(len(queries), 2)
+        sql = queries[1]["sql"].upper()
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+        self.assertIn('"ID" >', sql)
@@ -0,0 +1,88 @@
+import marshal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import profiling
+from user.tests.test_user_api import create_user
+
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+
+
+def profile_url(profile_id: str) -> str:
+    return reverse("monitoring:profile", args=[profile_id])
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        profiling.get_profile_cache().clear()
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@example.com", "pass123"
+        )
+        self.staff = APIClient(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}"
+        )
+
+    def test_profiles_staff_requests_with_the_header(self):
+        res = self.staff.get(TERRAIN_LIST_URL, HTTP_X_PROFILE="1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        profile = profiling.get_profile(res[profiling.PROFILE_ID_HEADER])
+        self.assertEqual(profile["method"], "GET")
+        self.assertEqual(profile["path"], TERRAIN_LIST_URL)
+        self.assertEqual(profile["status"], status.HTTP_200_OK)
+        functions = {name for _, _, name in marshal.loads(profile["stats"])}
+        self.assertIn("initial", functions)
+
+    def test_profiles_staff_requests_with_the_query_parameter(self):
+        res = self.staff.get(TERRAIN_LIST_URL, {"profile": "1"})
+
+        self.assertIn(profiling.PROFILE_ID_HEADER, res)
+
+    def test_profiles_session_staff_users(self):
+        client = APIClient()
+        client.force_login(self.admin)
+
+        res = client.get(TERRAIN_LIST_URL, HTTP_X_PROFILE="1")
+
+        self.assertIn(profiling.PROFILE_ID_HEADER, res)
+
+    @patch("core.middleware.cProfile.Profile")
+    def test_does_not_profile_other_requests(self, profile):
+        user = create_user(email="test@example.com", password="testpass123")
+        client = APIClient(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        regular = client.get(TERRAIN_LIST_URL, HTTP_X_PROFILE="1")
+        invalid = APIClient(HTTP_AUTHORIZATION="Bearer invalid").get(
+            TERRAIN_LIST_URL, HTTP_X_PROFILE="1"
+        )
+        without_flag = self.staff.get(TERRAIN_LIST_URL)
+        with override_settings(PROFILING_ENABLED=False):
+            disabled = self.staff.get(TERRAIN_LIST_URL, HTTP_X_PROFILE="1")
+
+        self.assertEqual(regular.status_code, status.HTTP_200_OK)
+        self.assertEqual(invalid.status_code, status.HTTP_401_UNAUTHORIZED)
+        for res in (regular, invalid, without_flag, disabled):
+            self.assertNotIn(profiling.PROFILE_ID_HEADER, res)
+        profile.assert_not_called()
+
+    async def test_profiles_async_requests(self):
+        res = await self.async_client.get(
+            TERRAIN_LIST_URL,
+            headers={
+                "Authorization": f"Bearer {AccessToken.for_user(self.admin)}",
+                "X-Profile": "1",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(
+            await profiling.get_profile_cache().aget(
+                profiling.profile_key(res[profiling.PROFILE_ID_HEADER])
+            )
+        )
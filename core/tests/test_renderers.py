@@ -0,0 +1,135 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import msgpack
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from core.parsers import MessagePackParser, ORJSONParser
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+MSGPACK = "application/msgpack"
+
+DATA = {
+    "results": ReturnList(
+        [
+            ReturnDict(
+                {"id": 1, "name": 'Kashyyyk ✨ "wookiee"', "population": None},
+                serializer=None,
+            ),
+            {"name": "line\u2028separator\u2029", "population": 10**15},
+        ],
+        serializer=None,
+    ),
+    "next": "http://testserver/api/planet/planet/?cursor=cD0x",
+    "ratio": 0.1,
+    "price": decimal.Decimal("12.50"),
+    "created": datetime.datetime(2024, 5, 4, 10, 20, 30, 123456, datetime.timezone.utc),
+    "day": datetime.date(2024, 5, 4),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "detail": ErrorDetail("Not found.", code="not_found"),
+    7: "non string key",
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_renders_like_drf_json_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+
+    def test_indented_output(self):
+        self.assertEqual(
+            ORJSONRenderer().render(DATA, "application/json; indent=4"),
+            JSONRenderer().render(DATA, "application/json; indent=4"),
+        )
+
+    def test_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ParserTests(SimpleTestCase):
+    def test_orjson_parser_like_drf_json_parser(self):
+        body = JSONRenderer().render({"name": "Hoth ❄", "population": None})
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_invalid_json(self):
+        for body in (b"{", b'{"population": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_messagepack_round_trip(self):
+        data = {"name": "Hoth", "population": None, "terrains": ["tundra"]}
+        body = MessagePackRenderer().render(data)
+
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(body)), data)
+
+    def test_invalid_messagepack(self):
+        # An invalid byte, and a map keyed by an array.
+        for body in (b"\xc1", b"\x81\x91\x01\x02"):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                MessagePackParser().parse(io.BytesIO(body))
+
+
+class ContentNegotiationApiTests(TestCase):
+    def setUp(self):
+        BulkPlanetWriter().write(
+            [PlanetRecord("Tatooine", 200000, ("desert",), ("arid",))]
+        )
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+
+    def test_planets_in_messagepack(self):
+        res = self.client_api.get(PLANET_LIST_URL, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], MSGPACK)
+        self.assertEqual(
+            msgpack.unpackb(res.content)["results"],
+            self.client_api.get(PLANET_LIST_URL).json()["results"],
+        )
+
+    def test_create_planet_in_messagepack(self):
+        res = self.client_api.post(
+            PLANET_LIST_URL,
+            msgpack.packb({"name": "Hoth", "terrains": ["desert"]}),
+            content_type=MSGPACK,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["terrains"], ["desert"])
+
+    def test_unhashable_messagepack_key_is_a_bad_request(self):
+        res = self.client_api.post(
+            PLANET_LIST_URL, b"\x81\x91\x01\x02", content_type=MSGPACK
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_json_is_the_default(self):
+        res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.json()["results"][0]["name"], "Tatooine")
+
+    def test_messagepack_is_planet_only(self):
+        res = self.client_api.get(TERRAIN_LIST_URL, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_406_NOT_ACCEPTABLE)
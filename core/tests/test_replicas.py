@@ -0,0 +1,192 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import cache
+from core.db import replicas
+from core.db.routers import ReplicaRouter
+from core.models import Planet, RevokedToken, Terrain
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+REPLICA = "replica"
+
+
+class ReplicaSelectorTests(SimpleTestCase):
+    def test_round_robin(self):
+        selector = replicas.ReplicaSelector()
+
+        selected = [
+            selector.select(["a", "b", "c"], replicas.ROUND_ROBIN) for _ in range(6)
+        ]
+
+        self.assertEqual(selected, ["a", "b", "c", "a", "b", "c"])
+
+    def test_least_loaded(self):
+        selector = replicas.ReplicaSelector()
+
+        with selector.reading_from("a"), selector.reading_from("b"):
+            with selector.reading_from("b"):
+                self.assertEqual(selector.load(), {"a": 1, "b": 2})
+                self.assertEqual(
+                    selector.select(["a", "b", "c"], replicas.LEAST_LOADED), "c"
+                )
+            self.assertEqual(
+                {selector.select(["a", "b"], replicas.LEAST_LOADED) for _ in range(2)},
+                {"a", "b"},
+            )
+
+        self.assertEqual(selector.load(), {"a": 0, "b": 0})
+
+    def test_router_sends_catalog_reads_to_the_selected_replica(self):
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Planet))
+        with replicas.selector.reading_from(REPLICA):
+            self.assertEqual(router.db_for_read(Planet), REPLICA)
+            self.assertEqual(router.db_for_read(Planet.terrains.through), REPLICA)
+            self.assertEqual(router.db_for_read(Terrain), REPLICA)
+            self.assertIsNone(router.db_for_read(RevokedToken))
+            self.assertEqual(router.db_for_write(Planet), "default")
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA],
+    DATABASE_REPLICA_PIN_SECONDS=60,
+    API_CACHE_ENABLED=False,
+)
+class ReplicaRoutingTests(TestCase):
+    """
+    Runs the API against two databases: the test database of the primary and a SQLite replica stand-in, which holds a
+    different catalog so the responses tell where they were read from. The replica is added once the test databases
+    are set up, outside of the transactions of the test case.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA] = connections.configure_settings(
+            {
+                "default": {},
+                REPLICA: {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(cls.replica_dir.name, "replica.sqlite3"),
+                },
+            }
+        )[REPLICA]
+        call_command("migrate", database=REPLICA, verbosity=0)
+        Planet.objects.using(REPLICA).create(name="Replica")
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.replica_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        Planet.objects.create(name="Primary")
+        cache.clear_response_cache()
+
+        self.writer_authorization = self.authorization("writer@example.com")
+        self.writer = APIClient(HTTP_AUTHORIZATION=self.writer_authorization)
+        self.reader = APIClient(
+            HTTP_AUTHORIZATION=self.authorization("reader@example.com")
+        )
+
+    @staticmethod
+    def authorization(email: str) -> str:
+        user = create_user(email=email, password="testpass123")
+
+        return f"Bearer {AccessToken.for_user(user)}"
+
+    @staticmethod
+    def names(res) -> list[str]:
+        return [planet["name"] for planet in res.data["results"]]
+
+    def test_reads_go_to_the_replica(self):
+        res = self.reader.get(PLANET_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(res), ["Replica"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_go_to_the_primary_without_replicas(self):
+        self.assertEqual(self.names(self.reader.get(PLANET_LIST_URL)), ["Primary"])
+
+    def test_writer_reads_its_writes_from_the_primary(self):
+        res = self.writer.post(PLANET_LIST_URL, {"name": "Naboo"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(
+            self.names(self.writer.get(PLANET_LIST_URL)), ["Primary", "Naboo"]
+        )
+        self.assertEqual(self.names(self.reader.get(PLANET_LIST_URL)), ["Replica"])
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_pin_window_is_configurable(self):
+        self.writer.post(PLANET_LIST_URL, {"name": "Naboo"})
+
+        self.assertEqual(self.names(self.writer.get(PLANET_LIST_URL)), ["Replica"])
+
+    def test_failed_write_does_not_pin(self):
+        res = self.writer.post(PLANET_LIST_URL, {"population": "abc"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.names(self.writer.get(PLANET_LIST_URL)), ["Replica"])
+
+    def test_pin_is_carried_by_the_client(self):
+        res = self.writer.post(PLANET_LIST_URL, {"name": "Naboo"})
+        self.assertIn(replicas.PIN_COOKIE, res.cookies)
+
+        # A client without cookies sends the pin back as a header, to any worker.
+        headers = {replicas.PIN_HEADER: res[replicas.PIN_HEADER]}
+        res = self.reader.get(PLANET_LIST_URL, headers=headers)
+
+        self.assertEqual(self.names(res), ["Primary", "Naboo"])
+
+    def test_forged_pin_is_ignored(self):
+        headers = {replicas.PIN_HEADER: replicas.PIN_VALUE}
+
+        res = self.reader.get(PLANET_LIST_URL, headers=headers)
+
+        self.assertEqual(self.names(res), ["Replica"])
+
+    @override_settings(API_CACHE_ENABLED=True)
+    def test_replica_responses_are_not_served_to_pinned_clients(self):
+        self.assertEqual(self.names(self.reader.get(PLANET_LIST_URL)), ["Replica"])
+        self.writer.post(PLANET_LIST_URL, {"name": "Naboo"})
+
+        res = self.writer.get(PLANET_LIST_URL)
+
+        self.assertEqual(self.names(res), ["Primary", "Naboo"])
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    @override_settings(API_CACHE_ENABLED=True)
+    def test_replica_reads_are_cached_without_recent_writes(self):
+        first = self.reader.get(PLANET_LIST_URL)
+        second = self.reader.get(PLANET_LIST_URL)
+
+        self.assertIn("ETag", first)
+        self.assertEqual(second["X-Cache"], "HIT")
+
+    async def test_async_middleware(self):
+        client = AsyncClient()
+        headers = {"Authorization": self.writer_authorization}
+
+        res = await client.post(PLANET_LIST_URL, {"name": "Naboo"}, headers=headers)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        res = await client.get(PLANET_LIST_URL, headers=headers)
+
+        self.assertEqual(
+            [planet["name"] for planet in res.json()["results"]], ["Primary", "Naboo"]
+        )
@@ -0,0 +1,246 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.db import slow_queries
+from core.models import Planet
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+SELECT = "SELECT id FROM core_planet WHERE name = %s"
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_values_are_normalized(self):
+        self.assertEqual(
+            slow_queries.fingerprint(
+                "SELECT *  FROM core_planet\n WHERE id IN (%s, %s, %s) AND name = 'Tatooine' LIMIT 21"
+            ),
+            "SELECT * FROM core_planet WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+
+    def test_executions_with_other_values_share_a_fingerprint(self):
+        self.assertEqual(
+            slow_queries.fingerprint(
+                'INSERT INTO "core_planet" ("name") VALUES (%s), (%s)'
+            ),
+            slow_queries.fingerprint('INSERT INTO "core_planet" ("name") VALUES (%s)'),
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertEqual(
+            slow_queries.fingerprint('SELECT "t1"."id" FROM "table2" t1 LIMIT 5'),
+            'SELECT "t1"."id" FROM "table2" t1 LIMIT ?',
+        )
+
+
+@override_settings(SLOW_QUERY_CACHE_ALIAS="default", SLOW_QUERY_FLUSH_INTERVAL=60)
+class SlowQueryLogTests(SimpleTestCase):
+    def setUp(self):
+        slow_queries.clear_slow_queries()
+
+    def test_logs_of_every_process_are_merged(self):
+        first, second = slow_queries.SlowQueryLog(), slow_queries.SlowQueryLog()
+        first.record(SELECT, 120, "planet:planet-list", None, None)
+        first.record(SELECT, 300, "planet:planet-detail", None, "SCAN core_planet")
+        second.record(SELECT, 180, "planet:planet-list", "core/views.py:1 in f", None)
+        second.record("SELECT 1", 50, slow_queries.NO_VIEW, None, None)
+
+        first.flush()
+        second.flush()
+        # Written less than SLOW_QUERY_FLUSH_INTERVAL ago, the log in the cache is kept.
+        first.record(SELECT, 1000, "planet:planet-list", None, None)
+        first.flush()
+        entries = slow_queries.slow_queries()
+
+        self.assertEqual([entry["count"] for entry in entries], [3, 1])
+        self.assertEqual(entries[0]["total_ms"], 600)
+        self.assertEqual(entries[0]["mean_ms"], 200)
+        self.assertEqual(entries[0]["max_ms"], 300)
+        self.assertEqual(
+            entries[0]["views"], {"planet:planet-list": 2, "planet:planet-detail": 1}
+        )
+        self.assertEqual(entries[0]["callers"], {"core/views.py:1 in f": 1})
+        self.assertEqual(entries[0]["plan"], "SCAN core_planet")
+        self.assertEqual(entries[1]["sql"], "SELECT ?")
+
+    def test_limit(self):
+        first = slow_queries.SlowQueryLog()
+        first.record(SELECT, 120, "planet:planet-list", None, None)
+        first.record("SELECT 1", 50, slow_queries.NO_VIEW, None, None)
+        first.flush()
+
+        entries = slow_queries.slow_queries(limit=1)
+
+        self.assertEqual([entry["total_ms"] for entry in entries], [120])
+
+    @override_settings(SLOW_QUERY_MAX_FINGERPRINTS=2)
+    def test_fastest_fingerprint_is_dropped(self):
+        log = slow_queries.SlowQueryLog()
+        log.record("SELECT 1 FROM core_planet", 500, "-", None, None)
+        log.record("SELECT 1 FROM core_terrain", 100, "-", None, None)
+        log.record("SELECT 1 FROM core_climate", 200, "-", None, None)
+
+        self.assertEqual(
+            sorted(entry["sql"] for entry in log.snapshot().values()),
+            ["SELECT ? FROM core_climate", "SELECT ? FROM core_planet"],
+        )
+
+    def test_clear(self):
+        log = slow_queries.SlowQueryLog()
+        log.record(SELECT, 120, "planet:planet-list", None, None)
+        log.flush()
+
+        slow_queries.clear_slow_queries()
+
+        self.assertEqual(slow_queries.slow_queries(), [])
+
+
+@override_settings(
+    SLOW_QUERY_CACHE_ALIAS="default",
+    SLOW_QUERY_THRESHOLD_MS=0,
+    SLOW_QUERY_EXPLAIN_RATE=1,
+)
+class SlowQueryCaptureTests(TestCase):
+    def setUp(self):
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(
+            create_user(email="test@example.com", password="testpass123")
+        )
+        Planet.objects.create(name="Tatooine")
+        slow_queries.clear_slow_queries()
+
+    def entries_of(self, sql_start: str) -> list[dict]:
+        return [
+            entry
+            for entry in slow_queries.slow_queries()
+            if entry["sql"].startswith(sql_start)
+        ]
+
+    def test_queries_of_a_view_are_logged(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        entries = self.entries_of('SELECT "core_planet"."id"')
+        self.assertTrue(entries)
+        self.assertIn("planet:planet-list", entries[0]["views"])
+        # The async views await the queries, their callers are not on the stack.
+        if not settings.API_ASYNC_VIEWS:
+            self.assertTrue(entries[0]["callers"])
+        self.assertTrue(
+            all(caller.startswith("planet/") for caller in entries[0]["callers"])
+        )
+        self.assertIsNotNone(entries[0]["plan"])
+        self.assertIn("core_planet", entries[0]["plan"])
+
+    def test_queries_outside_of_a_request_have_no_view(self):
+        Planet.objects.filter(name="Tatooine").count()
+
+        (entry,) = self.entries_of("SELECT COUNT(*)")
+        self.assertEqual(entry["views"], {slow_queries.NO_VIEW: 1})
+        self.assertTrue(
+            next(iter(entry["callers"])).startswith("core/tests/test_slow_queries.py:")
+        )
+
+    def test_writes_are_not_explained(self):
+        Planet.objects.create(name="Alderaan")
+
+        (entry,) = self.entries_of('INSERT INTO "core_planet"')
+        self.assertEqual(entry["count"], 1)
+        self.assertIsNone(entry["plan"])
+
+    def test_explain_is_not_counted_in_the_request_metrics(self):
+        with metrics.tracking_queries() as usage:
+            Planet.objects.filter(name="Tatooine").count()
+
+        self.assertEqual(usage.queries, 1)
+        (entry,) = self.entries_of("SELECT COUNT(*)")
+        self.assertIsNotNone(entry["plan"])
+
+    @override_settings(SLOW_QUERY_EXPLAIN_RATE=0)
+    def test_plans_are_sampled(self):
+        Planet.objects.filter(name="Tatooine").count()
+
+        (entry,) = self.entries_of("SELECT COUNT(*)")
+        self.assertIsNone(entry["plan"])
+
+    def test_failed_explain_keeps_the_transaction(self):
+        with patch.object(
+            connection.ops, "explain_query_prefix", return_value="NOT AN EXPLAIN"
+        ):
+            count = Planet.objects.filter(name="Tatooine").count()
+
+        self.assertEqual(count, 1)
+        (entry,) = self.entries_of("SELECT COUNT(*)")
+        self.assertIsNone(entry["plan"])
+        self.assertTrue(Planet.objects.filter(name="Tatooine").exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_are_not_logged(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(slow_queries.slow_queries(), [])
+
+    @override_settings(SLOW_QUERY_LOG_ENABLED=False)
+    def test_disabled(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(slow_queries.slow_queries(), [])
+
+
+@override_settings(SLOW_QUERY_CACHE_ALIAS="default", SLOW_QUERY_FLUSH_INTERVAL=60)
+class SlowQueriesCommandTests(SimpleTestCase):
+    def setUp(self):
+        slow_queries.clear_slow_queries()
+
+    def test_slow_queries_ranked_by_total_time(self):
+        log = slow_queries.SlowQueryLog()
+        log.record("SELECT 1", 50, slow_queries.NO_VIEW, None, None)
+        log.record(SELECT, 400, "planet:planet-list", None, "SCAN core_planet")
+        log.flush()
+        out = StringIO()
+
+        call_command("slow_queries", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("1. 400.0ms total, 1 calls, 400.0ms mean, 400.0ms max", output)
+        self.assertIn("   SELECT id FROM core_planet WHERE name = ?", output)
+        self.assertIn("   views: planet:planet-list (1)", output)
+        self.assertIn("     SCAN core_planet", output)
+        self.assertLess(output.index("core_planet"), output.index("2. 50.0ms total"))
+
+    def test_no_plans(self):
+        log = slow_queries.SlowQueryLog()
+        log.record(SELECT, 400, "planet:planet-list", None, "SCAN core_planet")
+        log.flush()
+        out = StringIO()
+
+        call_command("slow_queries", "--no-plans", stdout=out)
+
+        self.assertNotIn("SCAN core_planet", out.getvalue())
+
+    def test_no_slow_queries(self):
+        out = StringIO()
+
+        call_command("slow_queries", stdout=out)
+
+        self.assertIn("No slow queries logged.", out.getvalue())
+
+    def test_clear(self):
+        log = slow_queries.SlowQueryLog()
+        log.record(SELECT, 400, "planet:planet-list", None, None)
+        log.flush()
+
+        call_command("slow_queries", "--clear", stdout=StringIO())
+
+        self.assertEqual(slow_queries.slow_queries(), [])
+
+    def test_invalid_limit(self):
+        with self.assertRaises(CommandError):
+            call_command("slow_queries", "--limit", "0")
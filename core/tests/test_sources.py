@@ -0,0 +1,156 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core import models
+from core.ingest.sources import (
+    SourceFormatError,
+    iter_json_array,
+    iter_planets_from_file,
+)
+
+PLANETS = [
+    {
+        "name": "Tatooine",
+        "population": 200000,
+        "terrains": ["desert"],
+        "climates": ["arid"],
+    },
+    {
+        "name": "Alderaan",
+        "population": 2000000000,
+        "terrains": ["grasslands", "mountains"],
+        "climates": ["temperate"],
+    },
+    {"name": "Hoth", "population": None, "terrains": ["tundra"], "climates": []},
+]
+
+
+class SourceFileTestMixin:
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name: str, content: str, compress: bool = False) -> Path:
+        path = Path(self.directory.name) / name
+        if compress:
+            with gzip.open(path, "wt", encoding="utf-8") as file:
+                file.write(content)
+        else:
+            path.write_text(content, encoding="utf-8")
+
+        return path
+
+
+class IterPlanetsFromFileTests(SourceFileTestMixin, SimpleTestCase):
+    def test_json_array(self):
+        path = self.write_file("planets.json", json.dumps(PLANETS))
+
+        self.assertEqual(list(iter_planets_from_file(path)), PLANETS)
+
+    def test_graphql_response(self):
+        content = json.dumps({"data": {"allPlanets": {"planets": PLANETS}}}, indent=2)
+        path = self.write_file("planets.json", content)
+
+        self.assertEqual(list(iter_planets_from_file(path)), PLANETS)
+
+    def test_ndjson(self):
+        content = "\n".join(json.dumps(planet) for planet in PLANETS) + "\n\n"
+        path = self.write_file("planets.ndjson", content)
+
+        self.assertEqual(list(iter_planets_from_file(path)), PLANETS)
+
+    def test_gzipped_files(self):
+        json_path = self.write_file("planets.json.gz", json.dumps(PLANETS), True)
+        ndjson_path = self.write_file(
+            "planets.jsonl.gz",
+            "\n".join(json.dumps(planet) for planet in PLANETS),
+            True,
+        )
+        # Compression is detected from the content, not from the file name.
+        unnamed_path = self.write_file("planets.json", json.dumps(PLANETS), True)
+
+        self.assertEqual(list(iter_planets_from_file(json_path)), PLANETS)
+        self.assertEqual(list(iter_planets_from_file(ndjson_path)), PLANETS)
+        self.assertEqual(list(iter_planets_from_file(unnamed_path)), PLANETS)
+
+    def test_records_split_across_chunks(self):
+        """
+        Tiny chunks force every planet, key and number to be split between reads.
+        """
+        content = json.dumps({"data": {"allPlanets": {"planets": PLANETS}}})
+
+        for chunk_size in (1, 2, 3, 7, 16):
+            planets = list(iter_json_array(StringIO(content), chunk_size=chunk_size))
+            self.assertEqual(planets, PLANETS)
+
+    def test_is_lazy(self):
+        content = json.dumps(PLANETS)[:-1] + ", {broken"
+
+        planets = iter_json_array(StringIO(content), chunk_size=8)
+
+        self.assertEqual(next(planets), PLANETS[0])
+        with self.assertRaises(SourceFormatError):
+            list(planets)
+
+    def test_malformed_planet_is_rejected_without_reading_on(self):
+        content = (
+            '[{"name": "Tatooine"}, {"name": Alderaan}, ' + json.dumps(PLANETS)[1:]
+        )
+        stream = StringIO(content * 100)
+
+        with self.assertRaises(SourceFormatError):
+            list(iter_json_array(stream, chunk_size=64))
+        self.assertLess(stream.tell(), len(content))
+
+    def test_planet_size_is_capped(self):
+        content = '[{"name": "' + "a" * 1000 + '"}]'
+
+        with self.assertRaises(SourceFormatError):
+            list(
+                iter_json_array(StringIO(content), chunk_size=16, max_element_size=100)
+            )
+
+    def test_content_before_the_planets_array_is_not_kept(self):
+        content = json.dumps({"meta": "a" * 1000, "data": {"planets": PLANETS}})
+
+        planets = iter_json_array(
+            StringIO(content), chunk_size=16, max_element_size=200
+        )
+
+        self.assertEqual(list(planets), PLANETS)
+
+    def test_missing_planets_array(self):
+        with self.assertRaises(SourceFormatError):
+            list(iter_json_array(StringIO('{"data": {}}')))
+
+
+class AddBasePlanetDataFromFileTests(SourceFileTestMixin, TestCase):
+    def test_add_base_planet_data_from_file(self):
+        path = self.write_file(
+            "planets.ndjson.gz",
+            "\n".join(json.dumps(planet) for planet in PLANETS),
+            True,
+        )
+
+        for extra_args in ([], ["--bulk"]):
+            call_command(
+                "add_base_planet_data",
+                "--file",
+                str(path),
+                *extra_args,
+                stdout=StringIO()
+            )
+
+            self.assertEqual(models.Planet.objects.count(), len(PLANETS))
+            alderaan = models.Planet.objects.get(name="Alderaan")
+            self.assertEqual(alderaan.population, 2000000000)
+            self.assertEqual(
+                set(alderaan.terrains.values_list("name", flat=True)),
+                {"grasslands", "mountains"},
+            )
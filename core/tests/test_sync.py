@@ -0,0 +1,164 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core import models
+from core.ingest.records import PlanetRecord
+from core.ingest.sync import PlanetSynchronizer, names_fingerprint
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Alderaan", 2000000000, ("grasslands", "mountains"), ("temperate",)),
+    PlanetRecord("Hoth", None, ("tundra", "ice caves"), ("frozen",)),
+]
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def replace_record(records: list[PlanetRecord], name: str, **changes):
+    return [
+        (
+            PlanetRecord(
+                name=record.name,
+                population=changes.get("population", record.population),
+                terrains=changes.get("terrains", record.terrains),
+                climates=changes.get("climates", record.climates),
+            )
+            if record.name == name
+            else record
+        )
+        for record in records
+    ]
+
+
+class PlanetSynchronizerTests(TestCase):
+    def setUp(self):
+        PlanetSynchronizer().sync(RECORDS)
+
+    def test_names_fingerprint_ignores_order(self):
+        self.assertEqual(
+            names_fingerprint(["grasslands", "mountains"]),
+            names_fingerprint(["mountains", "grasslands"]),
+        )
+        self.assertNotEqual(names_fingerprint(["a", "b"]), names_fingerprint(["ab"]))
+
+    def test_first_sync_inserts(self):
+        models.Planet.objects.all().delete()
+
+        stats = PlanetSynchronizer().sync(RECORDS)
+
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (3, 0, 0))
+        self.assertEqual(models.Planet.objects.count(), 3)
+
+    def test_planet_repeated_across_batches_is_inserted_once(self):
+        models.Planet.objects.all().delete()
+        records = RECORDS + [
+            PlanetRecord("Tatooine", 300000, ("dunes",), ("arid",)),
+        ]
+
+        stats = PlanetSynchronizer(batch_size=3).sync(records)
+
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (3, 1, 0))
+        tatooine = models.Planet.objects.get(name="Tatooine")
+        self.assertEqual(tatooine.population, 300000)
+        self.assertEqual(
+            list(tatooine.terrains.values_list("name", flat=True)), ["dunes"]
+        )
+
+    def test_unchanged_source_does_not_write(self):
+        with CaptureQueriesContext(connection) as queries:
+            stats = PlanetSynchronizer().sync(RECORDS)
+
+        self.assertEqual(stats.unchanged, 3)
+        self.assertEqual(stats.inserted + stats.updated + stats.deleted, 0)
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in queries
+                if query["sql"].lstrip().upper().startswith(WRITE_STATEMENTS)
+            ]
+        )
+
+    def test_changed_population_is_updated(self):
+        stats = PlanetSynchronizer().sync(
+            replace_record(RECORDS, "Tatooine", population=300000)
+        )
+
+        self.assertEqual((stats.updated, stats.unchanged), (1, 2))
+        self.assertEqual(models.Planet.objects.get(name="Tatooine").population, 300000)
+
+    def test_changed_terrains_are_replaced(self):
+        stats = PlanetSynchronizer().sync(
+            replace_record(RECORDS, "Hoth", terrains=("tundra", "mountains"))
+        )
+
+        hoth = models.Planet.objects.get(name="Hoth")
+        self.assertEqual(stats.updated, 1)
+        self.assertEqual(
+            set(hoth.terrains.values_list("name", flat=True)), {"tundra", "mountains"}
+        )
+        self.assertEqual(list(hoth.climates.values_list("name", flat=True)), ["frozen"])
+
+    def test_missing_planets(self):
+        stats = PlanetSynchronizer(delete_missing=False).sync(RECORDS[:2])
+        self.assertEqual(stats.deleted, 0)
+        self.assertTrue(models.Planet.objects.filter(name="Hoth").exists())
+
+        stats = PlanetSynchronizer().sync(RECORDS[:2])
+        self.assertEqual(stats.deleted, 1)
+        self.assertFalse(models.Planet.objects.filter(name="Hoth").exists())
+        self.assertFalse(
+            models.Planet.terrains.through.objects.filter(
+                terrain__name="tundra"
+            ).exists()
+        )
+
+
+@patch("core.management.commands.add_base_planet_data.Command.get_graphql_response")
+class AddBasePlanetDataSyncTests(TestCase):
+    def graphql_response(self, records: list[PlanetRecord]) -> dict:
+        return {
+            "data": {
+                "allPlanets": {
+                    "planets": [
+                        {
+                            "name": record.name,
+                            "population": record.population,
+                            "terrains": list(record.terrains),
+                            "climates": list(record.climates),
+                        }
+                        for record in records
+                    ]
+                }
+            }
+        }
+
+    def test_sync_summary(self, patched_get_graphql_response):
+        patched_get_graphql_response.return_value = self.graphql_response(RECORDS)
+        call_command("add_base_planet_data", "--sync", stdout=StringIO())
+
+        patched_get_graphql_response.return_value = self.graphql_response(
+            replace_record(RECORDS[1:], "Hoth", population=10)
+            + [PlanetRecord("Dagobah", None, ("swamp",), ("murky",))]
+        )
+        out = StringIO()
+        call_command("add_base_planet_data", "--sync", stdout=out)
+
+        self.assertIn(
+            "Inserted 1, updated 1, unchanged 1, deleted 1 planets", out.getvalue()
+        )
+
+    def test_legacy_mode_updates_population(self, patched_get_graphql_response):
+        patched_get_graphql_response.return_value = self.graphql_response(RECORDS)
+        call_command("add_base_planet_data", stdout=StringIO())
+
+        patched_get_graphql_response.return_value = self.graphql_response(
+            replace_record(RECORDS, "Tatooine", population=1)
+        )
+        call_command("add_base_planet_data", stdout=StringIO())
+
+        self.assertEqual(models.Planet.objects.get(name="Tatooine").population, 1)
@@ -0,0 +1,117 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class AsyncReadMixin:
+    """
+    Serves the list and retrieve actions of a viewset with async handlers (`alist` and `aretrieve`) when
+    API_ASYNC_VIEWS is on, as it is under ASGI (see app/asgi.py). Authentication, permissions, throttling and content
+    negotiation run as in the sync views, the queries go through the async ORM, so the event loop keeps serving other
+    requests while they wait on the database. The other actions run the sync view in a thread.
+    Under WSGI the setting is off and the viewset is served by the sync views only, an async view would pay for an
+    event loop per request there.
+    """
+
+    async_actions = ("list", "retrieve")
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        sync_view = super().as_view(actions, **initkwargs)
+        if not settings.API_ASYNC_VIEWS:
+            return sync_view
+
+        methods = dict(actions)
+        if "get" in methods and "head" not in methods:
+            methods["head"] = methods["get"]
+        async_methods = {
+            method: action
+            for method, action in methods.items()
+            if action in cls.async_actions
+        }
+        if not async_methods:
+            return sync_view
+
+        async def view(request, *args, **kwargs):
+            if request.method.lower() not in async_methods:
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = methods
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+
+            return await self.adispatch(request, *args, **kwargs)
+
+        # The router, the schema generator and csrf_exempt read the attributes set by ViewSetMixin.as_view.
+        update_wrapper(view, sync_view)
+
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        The adispatch function is the async counterpart of APIView.dispatch for the async actions.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+
+        return await self.paginator.apaginate_queryset(
+            queryset, self.request, view=self
+        )
+
+    async def aget_object(self):
+        """
+        The aget_object function is the async counterpart of GenericAPIView.get_object.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        self.check_object_permissions(self.request, instance)
+
+        return instance
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(
+            [instance async for instance in queryset], many=True
+        )
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+
+        return Response(serializer.data)
@@ -0,0 +1,236 @@
+import pstats
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import metrics, profiling
+from core.cache import clear_response_cache
+from core.db import slow_queries
+from user.tests.test_user_api import create_user
+
+CACHE_STATS_URL = reverse("monitoring:cache")
+DB_POOL_STATS_URL = reverse("monitoring:db-pool")
+TERRAIN_LIST_URL = reverse("terrain:terrain-list")
+METRICS_URL = reverse("metrics")
+SLOW_QUERIES_URL = reverse("monitoring:slow-queries")
+
+
+class CacheStatsApiTests(TestCase):
+    def setUp(self):
+        clear_response_cache()
+        self.client_api = APIClient()
+
+    def test_cache_stats_for_staff(self):
+        admin = get_user_model().objects.create_superuser(
+            "admin@example.com", "pass123"
+        )
+        self.client_api.force_authenticate(user=admin)
+        self.client_api.get(TERRAIN_LIST_URL)
+
+        res = self.client_api.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["terrain"], {"hits": 0, "misses": 1})
+
+    def test_cache_stats_forbidden_for_regular_users(self):
+        self.client_api.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+
+        res = self.client_api.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DatabasePoolStatsApiTests(TestCase):
+    def setUp(self):
+        self.client_api = APIClient()
+
+    def test_pool_stats_for_staff(self):
+        admin = get_user_model().objects.create_superuser(
+            "admin@example.com", "pass123"
+        )
+        self.client_api.force_authenticate(user=admin)
+
+        with patch(
+            "monitoring.views.pool_stats", return_value={"default": [{"size": 1}]}
+        ):
+            res = self.client_api.get(DB_POOL_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"default": [{"size": 1}]})
+
+    def test_pool_stats_forbidden_for_regular_users(self):
+        self.client_api.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+
+        res = self.client_api.get(DB_POOL_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class MetricsApiTests(TestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+        self.client_staff = APIClient()
+        self.client_staff.force_authenticate(
+            user=get_user_model().objects.create_superuser(
+                "admin@example.com", "pass123"
+            )
+        )
+
+    def test_metrics(self):
+        self.client_api.get(TERRAIN_LIST_URL)
+
+        res = self.client_staff.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'http_requests_total{route="terrain:terrain-list",method="GET",status="200"} 1\n',
+            res.content.decode(),
+        )
+
+    def test_metrics_without_token_for_staff_only(self):
+        self.assertEqual(
+            self.client.get(METRICS_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(
+            self.client_api.get(METRICS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        res = self.client.get(METRICS_URL, headers={"Authorization": "Bearer secret"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_metrics_of_every_process(self):
+        other = metrics.Registry()
+        other.inc(
+            "http_requests_total",
+            (("route", "terrain:terrain-list"), ("method", "GET"), ("status", "200")),
+            2,
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            other.flush(directory)
+            with override_settings(METRICS_DIR=directory):
+                self.client_api.get(TERRAIN_LIST_URL)
+                res = self.client_staff.get(METRICS_URL)
+
+        self.assertIn(
+            'http_requests_total{route="terrain:terrain-list",method="GET",status="200"} 3\n',
+            res.content.decode(),
+        )
+
+
+class ProfileApiTests(TestCase):
+    def setUp(self):
+        profiling.get_profile_cache().clear()
+        admin = get_user_model().objects.create_superuser(
+            "admin@example.com", "pass123"
+        )
+        # The profiling middleware runs before DRF, it needs real credentials.
+        self.client_api = APIClient(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+        )
+        self.profile_id = self.client_api.get(TERRAIN_LIST_URL, HTTP_X_PROFILE="1")[
+            profiling.PROFILE_ID_HEADER
+        ]
+        self.url = reverse("monitoring:profile", args=[self.profile_id])
+
+    def test_profile_as_pstats(self):
+        res = self.client_api.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/octet-stream")
+        self.assertIn(f"profile-{self.profile_id}.prof", res["Content-Disposition"])
+        with tempfile.NamedTemporaryFile(suffix=".prof") as file:
+            file.write(res.content)
+            file.flush()
+            self.assertGreater(pstats.Stats(file.name).total_calls, 0)
+
+    def test_profile_as_text(self):
+        res = self.client_api.get(self.url, {"output": "text"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            res.content.decode().startswith(f"GET {TERRAIN_LIST_URL} -> 200 in ")
+        )
+        self.assertIn("cumulative", res.content.decode())
+
+    def test_unknown_profile(self):
+        res = self.client_api.get(reverse("monitoring:profile", args=["unknown"]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profile_forbidden_for_regular_users(self):
+        client = APIClient()
+        client.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+
+        res = client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(SLOW_QUERY_CACHE_ALIAS="default", SLOW_QUERY_THRESHOLD_MS=0)
+class SlowQueriesApiTests(TestCase):
+    def setUp(self):
+        self.client_api = APIClient()
+        slow_queries.clear_slow_queries()
+
+    def test_slow_queries_for_staff(self):
+        admin = get_user_model().objects.create_superuser(
+            "admin@example.com", "pass123"
+        )
+        self.client_api.force_authenticate(user=admin)
+        clear_response_cache()
+        self.client_api.get(TERRAIN_LIST_URL)
+
+        res = self.client_api.get(SLOW_QUERIES_URL, {"limit": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        self.assertGreaterEqual(res.data[0]["total_ms"], res.data[1]["total_ms"])
+        self.assertTrue(
+            any(
+                "terrain:terrain-list" in entry["views"]
+                for entry in self.client_api.get(SLOW_QUERIES_URL).data
+            )
+        )
+
+    def test_invalid_limit(self):
+        self.client_api.force_authenticate(
+            user=get_user_model().objects.create_superuser(
+                "admin@example.com", "pass123"
+            )
+        )
+
+        res = self.client_api.get(SLOW_QUERIES_URL, {"limit": "many"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_slow_queries_forbidden_for_regular_users(self):
+        self.client_api.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+
+        res = self.client_api.get(SLOW_QUERIES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
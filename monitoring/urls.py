@@ -0,0 +1,13 @@
+from django.urls import path
+
+from monitoring import views
+
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("cache/", views.CacheStatsView.as_view(), name="cache"),
+    path("db-pool/", views.DatabasePoolStatsView.as_view(), name="db-pool"),
+    path("slow-queries/", views.SlowQueriesView.as_view(), name="slow-queries"),
+    path("profiles/<str:profile_id>/", views.ProfileView.as_view(), name="profile"),
+]
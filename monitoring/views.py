@@ -0,0 +1,141 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import permissions, views
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core import metrics, profiling
+from core.cache import response_cache_stats
+from core.db import slow_queries
+from core.db.pool import pool_stats
+
+
+class CacheStatsView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        """
+        The get function returns the response cache hit and miss counters of the process serving the request.
+        """
+        return Response(response_cache_stats())
+
+
+class DatabasePoolStatsView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        """
+        The get function returns the size, utilization and wait times of the database connection pools of the process
+        serving the request, by database alias.
+        """
+        return Response(pool_stats())
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """
+    Allows the requests with the METRICS_TOKEN bearer token, the staff users only when it is not set.
+    """
+
+    def has_permission(self, request, view):
+        if not settings.METRICS_TOKEN:
+            return bool(request.user and request.user.is_staff)
+
+        return hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+        )
+
+
+class MetricsView(views.APIView):
+    permission_classes = [HasMetricsToken]
+
+    def get_authenticators(self):
+        # The scraper sends the metrics token, not a JWT.
+        if settings.METRICS_TOKEN:
+            return []
+
+        return super().get_authenticators()
+
+    @extend_schema(
+        responses={(200, "text/plain"): OpenApiResponse(OpenApiTypes.STR)},
+    )
+    def get(self, request):
+        """
+        The get function returns the request metrics of all the worker processes in the Prometheus text format.
+        """
+        return HttpResponse(
+            metrics.render(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class ProfileView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                enum=["pstats", "text"],
+                default="pstats",
+                description="A pstats file or the most expensive functions as text.",
+            )
+        ],
+        responses={
+            (200, "application/octet-stream"): OpenApiResponse(OpenApiTypes.BINARY),
+            (200, "text/plain"): OpenApiResponse(OpenApiTypes.STR),
+        },
+    )
+    def get(self, request, profile_id: str):
+        """
+        The get function returns the profile of a request made with the profiling header or query parameter, by the id
+        of its X-Profile-Id response header.
+        """
+        profile = profiling.get_profile(profile_id)
+        if profile is None:
+            raise Http404
+
+        if request.query_params.get("output") == "text":
+            return HttpResponse(
+                profiling.as_text(profile), content_type="text/plain; charset=utf-8"
+            )
+
+        return HttpResponse(
+            profile["stats"],
+            content_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'
+            },
+        )
+
+
+class SlowQueriesView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                int,
+                default=50,
+                description="Number of fingerprints returned.",
+            )
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    def get(self, request):
+        """
+        The get function returns the slow queries logged by every process, the fingerprints with the highest total
+        time first, with their views, callers and last captured plan.
+        """
+        try:
+            limit = max(int(request.query_params.get("limit", 50)), 1)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+
+        return Response(slow_queries.slow_queries(limit))
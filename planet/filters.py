@@ -0,0 +1,131 @@
+from django.db.models import Count
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import Planet
+
+ANY = "any"
+ALL = "all"
+
+
+class PlanetFilterSerializer(serializers.Serializer):
+    terrain = serializers.ListField(child=serializers.CharField(), required=False)
+    terrain_match = serializers.ChoiceField(choices=[ANY, ALL], default=ANY)
+    climate = serializers.ListField(child=serializers.CharField(), required=False)
+    climate_match = serializers.ChoiceField(choices=[ANY, ALL], default=ANY)
+    population_min = serializers.IntegerField(required=False)
+    population_max = serializers.IntegerField(required=False)
+    name_prefix = serializers.CharField(required=False)
+
+    def to_internal_value(self, data):
+        """
+        The to_internal_value function accepts terrain and climate names both as repeated parameters
+        (`?terrain=a&terrain=b`) and as a comma separated list (`?terrain=a,b`).
+        """
+        values = {key: data.get(key) for key in self.fields if key in data}
+        for key in ("terrain", "climate"):
+            if key in data:
+                values[key] = [
+                    name.strip()
+                    for value in data.getlist(key)
+                    for name in value.split(",")
+                    if name.strip()
+                ]
+
+        return super().to_internal_value(values)
+
+    def validate(self, attrs):
+        population_min = attrs.get("population_min")
+        population_max = attrs.get("population_max")
+        if (
+            population_min is not None
+            and population_max is not None
+            and population_min > population_max
+        ):
+            raise serializers.ValidationError(
+                {"population_max": "Must be greater than or equal to population_min."}
+            )
+
+        return attrs
+
+
+def filter_by_names(queryset, through, target: str, names: list[str], match: str):
+    """
+    The filter_by_names function keeps the planets linked to any (or all) of the given terrain or climate names.
+    It uses a semi-join on the through table instead of a join, so no DISTINCT is needed, and the lookup is served by
+    the (target_id, planet_id) index of the through table.
+    """
+    links = through.objects.filter(**{f"{target}__name__in": names})
+    if match == ALL:
+        links = (
+            links.values("planet_id")
+            .annotate(matches=Count(f"{target}_id"))
+            .filter(matches=len(set(names)))
+        )
+
+    return queryset.filter(id__in=links.values("planet_id"))
+
+
+class PlanetFilterBackend(BaseFilterBackend):
+    """
+    Filters the planets by terrain, climate, population range and name prefix.
+
+    - `terrain` / `climate`: names, repeated or comma separated.
+    - `terrain_match` / `climate_match`: `any` (default) or `all` of the given names.
+    - `population_min` / `population_max`: inclusive bounds, served by the population index.
+    - `name_prefix`: case sensitive prefix, served by the name pattern index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action != "list":
+            return queryset
+
+        serializer = PlanetFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        if params.get("terrain"):
+            queryset = filter_by_names(
+                queryset,
+                Planet.terrains.through,
+                "terrain",
+                params["terrain"],
+                params["terrain_match"],
+            )
+        if params.get("climate"):
+            queryset = filter_by_names(
+                queryset,
+                Planet.climates.through,
+                "climate",
+                params["climate"],
+                params["climate_match"],
+            )
+        if params.get("population_min") is not None:
+            queryset = queryset.filter(population__gte=params["population_min"])
+        if params.get("population_max") is not None:
+            queryset = queryset.filter(population__lte=params["population_max"])
+        if params.get("name_prefix"):
+            queryset = queryset.filter(name__startswith=params["name_prefix"])
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        def parameter(name: str, description: str, schema: dict) -> dict:
+            return {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": schema,
+            }
+
+        match = {"type": "string", "enum": [ANY, ALL], "default": ANY}
+        return [
+            parameter("terrain", "Terrain names, comma separated.", {"type": "string"}),
+            parameter("terrain_match", "Match any or all terrains.", match),
+            parameter("climate", "Climate names, comma separated.", {"type": "string"}),
+            parameter("climate_match", "Match any or all climates.", match),
+            parameter("population_min", "Minimum population.", {"type": "integer"}),
+            parameter("population_max", "Maximum population.", {"type": "integer"}),
+            parameter("name_prefix", "Case sensitive name prefix.", {"type": "string"}),
+        ]
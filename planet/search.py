@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Value, When
+from django.db.models.functions import Length
+from rest_framework import serializers
+
+from core.models import Climate, Planet, Terrain
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+NAME = "name"
+TERRAIN = "terrain"
+CLIMATE = "climate"
+
+_trigram_available = {}
+
+
+class PlanetSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_LIMIT, default=DEFAULT_LIMIT
+    )
+    related = serializers.BooleanField(default=False)
+
+
+def trigram_available(using: str = "default") -> bool:
+    """
+    The trigram_available function tells whether the pg_trgm extension is installed in the database, the answer is
+    cached per process.
+    """
+    if using not in _trigram_available:
+        connection = connections[using]
+        available = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                available = cursor.fetchone() is not None
+        _trigram_available[using] = available
+
+    return _trigram_available[using]
+
+
+def trigram_matches(queryset, query: str):
+    """
+    The trigram_matches function keeps the rows whose name has a word similar to `query` (the `<%` operator, served by
+    the gin_trgm_ops indexes), ranked by word similarity.
+    """
+    return queryset.filter(name__trigram_word_similar=query).annotate(
+        rank=TrigramWordSimilarity(query, "name")
+    )
+
+
+def substring_matches(queryset, query: str):
+    """
+    The substring_matches function is the portable fallback of trigram_matches: it keeps the rows whose name contains
+    `query` (case insensitive), exact matches rank first, then prefixes, then any other position.
+    """
+    return queryset.filter(name__icontains=query).annotate(
+        rank=Case(
+            When(name__iexact=query, then=Value(1.0)),
+            When(name__istartswith=query, then=Value(0.75)),
+            default=Value(0.5),
+            output_field=FloatField(),
+        )
+    )
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    id: int
+    name: str
+    rank: float
+    match: str
+
+
+def search_planets(
+    query: str, limit: int = DEFAULT_LIMIT, related: bool = False
+) -> list[SearchResult]:
+    """
+    The search_planets function returns up to `limit` planets matching `query`, best first.
+    Planets whose name matches come first, then, when `related` is set, planets having a matching terrain or climate
+    (ranked by that terrain or climate). It uses pg_trgm when available and a substring search otherwise.
+    """
+    matches = trigram_matches if trigram_available() else substring_matches
+
+    planets = matches(Planet.objects.all(), query).order_by(
+        "-rank", Length("name"), "name"
+    )[:limit]
+    results = [
+        SearchResult(planet.id, planet.name, round(planet.rank, 4), NAME)
+        for planet in planets
+    ]
+    if not related or len(results) >= limit:
+        return results
+
+    # Terrains and climates are small tables: rank their names, then take the planets of the best ones first.
+    related_names = [
+        (match, target.rank, through, f"{match}_id", target.id)
+        for model, through, match in (
+            (Terrain, Planet.terrains.through, TERRAIN),
+            (Climate, Planet.climates.through, CLIMATE),
+        )
+        for target in matches(model.objects.all(), query)
+    ]
+    related_names.sort(key=lambda item: -item[1])
+
+    seen = {result.id for result in results}
+    for match, rank, through, target_field, target_id in related_names:
+        remaining = limit - len(results)
+        if remaining <= 0:
+            break
+        planets = (
+            Planet.objects.filter(
+                id__in=through.objects.filter(**{target_field: target_id}).values(
+                    "planet_id"
+                )
+            )
+            .exclude(id__in=seen)
+            .order_by("name")
+            .values_list("id", "name")[:remaining]
+        )
+        for planet_id, name in planets:
+            seen.add(planet_id)
+            results.append(SearchResult(planet_id, name, round(rank, 4), match))
+
+    return results
@@ -1,6 +1,10 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
 from rest_framework import serializers
 
 from core import models
+from planet import search
 
 
 class PlanetSerializer(serializers.ModelSerializer):
@@ -20,3 +24,130 @@ class PlanetSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Planet
         fields = ["id", "name", "population", "terrains", "climates"]
+
+    def __init__(self, *args, fields: Optional[Iterable[str]] = None, **kwargs):
+        """
+        The __init__ function accepts an optional sparse fieldset, the other fields are not rendered.
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class PlanetRowSerializer:
+    """
+    Read-only counterpart of PlanetSerializer(many=True) for list pages.
+    It renders the same data from `.values()` rows and the terrain and climate names grouped per planet with one query
+    each, without building a model instance or running serializer fields per row.
+    """
+
+    related_fields = {
+        "terrains": (models.Planet.terrains.through, "terrain"),
+        "climates": (models.Planet.climates.through, "climate"),
+    }
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        self.fields = [
+            name
+            for name in PlanetSerializer.Meta.fields
+            if fields is None or name in fields
+        ]
+
+    def rows(self, queryset):
+        """
+        The rows function turns a planet queryset into the `.values()` rows to render, the id is always selected to
+        group the related names and to paginate.
+        """
+        columns = [name for name in self.fields if name not in self.related_fields]
+
+        return queryset.prefetch_related(None).values(*dict.fromkeys(["id", *columns]))
+
+    @staticmethod
+    def related_links(through, target: str, planet_ids: list[int]):
+        """
+        The related_links function selects the (planet id, name) pairs of the terrains or climates of the planets,
+        sorted like the prefetch used by PlanetSerializer.
+        """
+        return (
+            through.objects.filter(planet_id__in=planet_ids)
+            .order_by(f"{target}__name")
+            .values_list("planet_id", f"{target}__name")
+        )
+
+    def names_by_planet(self, through, target: str, planet_ids: list[int]) -> dict:
+        names = defaultdict(list)
+        for planet_id, name in self.related_links(through, target, planet_ids):
+            names[planet_id].append(name)
+
+        return names
+
+    async def anames_by_planet(
+        self, through, target: str, planet_ids: list[int]
+    ) -> dict:
+        names = defaultdict(list)
+        async for planet_id, name in self.related_links(through, target, planet_ids):
+            names[planet_id].append(name)
+
+        return names
+
+    def to_representation(self, rows: list[dict]) -> list[dict]:
+        planet_ids = [row["id"] for row in rows]
+        related = {
+            name: self.names_by_planet(through, target, planet_ids)
+            for name, (through, target) in self.related_fields.items()
+            if name in self.fields and planet_ids
+        }
+
+        return self.render(rows, related)
+
+    async def ato_representation(self, rows: list[dict]) -> list[dict]:
+        planet_ids = [row["id"] for row in rows]
+        related = {
+            name: await self.anames_by_planet(through, target, planet_ids)
+            for name, (through, target) in self.related_fields.items()
+            if name in self.fields and planet_ids
+        }
+
+        return self.render(rows, related)
+
+    def render(self, rows: list[dict], related: dict) -> list[dict]:
+        return [
+            {
+                name: related[name].get(row["id"], []) if name in related else row[name]
+                for name in self.fields
+            }
+            for row in rows
+        ]
+
+
+class PlanetSearchResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    rank = serializers.FloatField()
+    match = serializers.ChoiceField(
+        choices=[search.NAME, search.TERRAIN, search.CLIMATE]
+    )
+
+
+class PopulationSummarySerializer(serializers.Serializer):
+    name = serializers.CharField()
+    planets = serializers.IntegerField()
+    populated_planets = serializers.IntegerField()
+    total_population = serializers.IntegerField()
+    average_population = serializers.SerializerMethodField()
+    max_population = serializers.IntegerField(allow_null=True)
+
+    def get_average_population(self, summary: dict) -> Optional[float]:
+        """
+        The get_average_population function averages over the planets with a known population only.
+        """
+        if not summary["populated_planets"]:
+            return None
+
+        return round(summary["total_population"] / summary["populated_planets"], 2)
+
+
+class PopulationStatisticsSerializer(serializers.Serializer):
+    terrains = PopulationSummarySerializer(many=True)
+    climates = PopulationSummarySerializer(many=True)
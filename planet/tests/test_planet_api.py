@@ -100,4 +100,4 @@ class PrivateProductApiTests(TestCase):
         res = self.client_api.get(CREATE_GET_PLANET_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data[0]["id"], self.planet.id)
+        self.assertEqual(res.data["results"][0]["id"], self.planet.id)
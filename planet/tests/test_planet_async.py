@@ -0,0 +1,102 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from core.models import Planet
+from planet.views import PlanetViewSet
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Alderaan", 2000000000, ("mountains", "grasslands"), ("temperate",)),
+    PlanetRecord("Hoth", None, ("tundra", "ice caves", "mountains"), ("frozen",)),
+    PlanetRecord("Yavin IV", 1000, ("jungle", "rainforests"), ()),
+]
+
+
+def planet_detail_url(planet_id):
+    return reverse("planet:planet-detail", args=[planet_id])
+
+
+@override_settings(API_CACHE_ENABLED=False)
+class AsyncPlanetApiTests(TestCase):
+    """
+    The async list and retrieve views must answer exactly like the sync ones.
+    """
+
+    def setUp(self):
+        BulkPlanetWriter().write(RECORDS)
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+        self.factory = APIRequestFactory()
+
+        with override_settings(API_ASYNC_VIEWS=True):
+            self.list_view = PlanetViewSet.as_view({"get": "list", "post": "create"})
+            self.detail_view = PlanetViewSet.as_view({"get": "retrieve"})
+
+    def call(self, view, url, **kwargs):
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.user)
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+
+        return response
+
+    def assertSameResponse(self, res, expected):
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(res.get("ETag"), expected.get("ETag"))
+
+    def test_list(self):
+        for query in (
+            "",
+            "?page_size=2",
+            "?fields=id,terrains",
+            "?omit=climates,population",
+            "?terrain=mountains&population_min=1000",
+            "?format=msgpack",
+        ):
+            with self.subTest(query=query):
+                url = f"{PLANET_LIST_URL}{query}"
+                self.assertSameResponse(
+                    self.call(self.list_view, url), self.client_api.get(url)
+                )
+
+    def test_list_next_page(self):
+        first = self.call(self.list_view, f"{PLANET_LIST_URL}?page_size=2")
+        url = first.data["next"]
+
+        self.assertSameResponse(
+            self.call(self.list_view, url), self.client_api.get(url)
+        )
+
+    def test_list_invalid_parameters(self):
+        for query in ("?population_min=abc", "?fields=unknown"):
+            with self.subTest(query=query):
+                res = self.call(self.list_view, f"{PLANET_LIST_URL}{query}")
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve(self):
+        planet = Planet.objects.get(name="Alderaan")
+        for query in ("", "?fields=name,climates"):
+            with self.subTest(query=query):
+                url = f"{planet_detail_url(planet.id)}{query}"
+                self.assertSameResponse(
+                    self.call(self.detail_view, url, pk=str(planet.id)),
+                    self.client_api.get(url),
+                )
+
+    def test_retrieve_not_found(self):
+        res = self.call(self.detail_view, planet_detail_url(0), pk="0")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,105 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import clear_response_cache
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Alderaan", 2000000000, ("grasslands", "mountains"), ("temperate",)),
+    PlanetRecord("Hoth", None, ("tundra",), ("frozen",)),
+]
+
+
+class PlanetSparseFieldsApiTests(TestCase):
+    def setUp(self):
+        clear_response_cache()
+        BulkPlanetWriter().write(RECORDS)
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def get_planets(self, query: str) -> list[dict]:
+        res = self.client_api.get(f"{PLANET_LIST_URL}?{query}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return res.data["results"]
+
+    def test_fields(self):
+        planets = self.get_planets("fields=id,name")
+
+        self.assertEqual(
+            planets,
+            [
+                {"id": planets[0]["id"], "name": "Tatooine"},
+                {"id": planets[1]["id"], "name": "Alderaan"},
+                {"id": planets[2]["id"], "name": "Hoth"},
+            ],
+        )
+
+    def test_omit(self):
+        planets = self.get_planets("omit=terrains&omit=climates")
+
+        self.assertEqual(set(planets[0]), {"id", "name", "population"})
+
+    def test_empty_fields_are_ignored(self):
+        every_field = self.get_planets("")
+
+        for query in ("fields=", "fields=%20,%20", "omit="):
+            with self.subTest(query=query):
+                self.assertEqual(self.get_planets(query), every_field)
+
+    def test_fields_and_omit(self):
+        planets = self.get_planets("fields=name,terrains&omit=terrains")
+
+        self.assertEqual(planets[0], {"name": "Tatooine"})
+
+    def test_retrieve_fields(self):
+        planet_id = self.get_planets("fields=id")[1]["id"]
+
+        res = self.client_api.get(
+            reverse("planet:planet-detail", args=[planet_id]) + "?fields=terrains"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(res.data), ["terrains"])
+        self.assertEqual(sorted(res.data["terrains"]), ["grasslands", "mountains"])
+
+    def test_unknown_fields(self):
+        res = self.client_api.get(f"{PLANET_LIST_URL}?fields=name,diameter&omit=size")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", res.data)
+        self.assertIn("omit", res.data)
+
+    def test_sparse_fields_prune_queries(self):
+        with CaptureQueriesContext(connection) as full:
+            self.get_planets("")
+        clear_response_cache()
+        with CaptureQueriesContext(connection) as sparse:
+            self.get_planets("fields=id,name")
+
+        self.assertEqual(len(sparse), len(full) - 2)
+        planet_query = next(
+            query["sql"] for query in sparse if 'FROM "core_planet"' in query["sql"]
+        )
+        self.assertNotIn("population", planet_query)
+
+    def test_pagination_with_sparse_fields(self):
+        res = self.client_api.get(f"{PLANET_LIST_URL}?fields=name&page_size=2")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client_api.get(res.data["next"])
+
+        self.assertEqual(res.data["results"], [{"name": "Hoth"}])
@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Alderaan", 2000000000, ("grasslands", "mountains"), ("temperate",)),
+    PlanetRecord("Hoth", None, ("tundra", "ice caves", "mountains"), ("frozen",)),
+    PlanetRecord("Bespin", 6000000, ("gas giant",), ("temperate", "tropical")),
+    PlanetRecord("Tund", 0, ("barren", "ash"), ()),
+]
+
+
+class PlanetFilterApiTests(TestCase):
+    def setUp(self):
+        BulkPlanetWriter().write(RECORDS)
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def get_names(self, query: str) -> list[str]:
+        res = self.client_api.get(f"{PLANET_LIST_URL}?{query}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return sorted(planet["name"] for planet in res.data["results"])
+
+    def test_filter_by_terrain_any(self):
+        self.assertEqual(
+            self.get_names("terrain=mountains,desert"),
+            ["Alderaan", "Hoth", "Tatooine"],
+        )
+        self.assertEqual(
+            self.get_names("terrain=mountains&terrain=desert"),
+            ["Alderaan", "Hoth", "Tatooine"],
+        )
+
+    def test_filter_by_terrain_all(self):
+        self.assertEqual(
+            self.get_names("terrain=mountains,tundra&terrain_match=all"), ["Hoth"]
+        )
+        self.assertEqual(
+            self.get_names("terrain=mountains,desert&terrain_match=all"), []
+        )
+
+    def test_filter_by_climate(self):
+        self.assertEqual(self.get_names("climate=temperate"), ["Alderaan", "Bespin"])
+        self.assertEqual(
+            self.get_names("climate=temperate,tropical&climate_match=all"), ["Bespin"]
+        )
+
+    def test_filter_by_population_range(self):
+        self.assertEqual(
+            self.get_names("population_min=200000&population_max=6000000"),
+            ["Bespin", "Tatooine"],
+        )
+        self.assertEqual(self.get_names("population_max=0"), ["Tund"])
+
+    def test_filter_by_name_prefix(self):
+        self.assertEqual(self.get_names("name_prefix=Tu"), ["Tund"])
+        self.assertEqual(self.get_names("name_prefix=T"), ["Tatooine", "Tund"])
+
+    def test_filters_are_combined(self):
+        self.assertEqual(
+            self.get_names("terrain=mountains&climate=temperate&population_min=1"),
+            ["Alderaan"],
+        )
+
+    def test_invalid_filters(self):
+        res = self.client_api.get(
+            f"{PLANET_LIST_URL}?population_min=ten&terrain_match=some"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("population_min", res.data)
+        self.assertIn("terrain_match", res.data)
+
+    def test_inverted_population_range(self):
+        res = self.client_api.get(
+            f"{PLANET_LIST_URL}?population_min=10&population_max=1"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("population_max", res.data)
+
+    def test_filters_do_not_apply_to_detail(self):
+        planet_id = self.client_api.get(PLANET_LIST_URL).data["results"][0]["id"]
+
+        res = self.client_api.get(
+            reverse("planet:planet-detail", args=[planet_id]) + "?name_prefix=zzz"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
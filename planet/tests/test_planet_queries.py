@@ -0,0 +1,128 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import clear_response_cache
+from core.models import Climate, Planet, Terrain
+from core.pagination import IdCursorPagination
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+# One query for the resource version (see core.cache), one for the planets plus one prefetch query per many-to-many
+# field.
+PLANET_LIST_QUERIES = 4
+PLANET_DETAIL_QUERIES = 4
+
+
+def planet_detail_url(planet_id):
+    return reverse("planet:planet-detail", args=[planet_id])
+
+
+def create_planets_in_bulk(amount: int) -> list[Planet]:
+    """
+    The create_planets_in_bulk function creates `amount` planets, each one linked to two terrains and one climate,
+    using bulk inserts so that large catalogs can be built quickly inside a test.
+    """
+    terrains = Terrain.objects.bulk_create(
+        [Terrain(name=f"terrain-{index}") for index in range(5)]
+    )
+    climates = Climate.objects.bulk_create(
+        [Climate(name=f"climate-{index}") for index in range(3)]
+    )
+    Planet.objects.bulk_create(
+        [
+            Planet(name=f"planet-{index}", population=index * 1000)
+            for index in range(amount)
+        ],
+        batch_size=1000,
+    )
+    planets = list(Planet.objects.order_by("id"))
+
+    Planet.terrains.through.objects.bulk_create(
+        [
+            Planet.terrains.through(
+                planet_id=planet.id, terrain_id=terrains[(index + offset) % 5].id
+            )
+            for index, planet in enumerate(planets)
+            for offset in range(2)
+        ],
+        batch_size=1000,
+    )
+    Planet.climates.through.objects.bulk_create(
+        [
+            Planet.climates.through(
+                planet_id=planet.id, climate_id=climates[index % 3].id
+            )
+            for index, planet in enumerate(planets)
+        ],
+        batch_size=1000,
+    )
+
+    return planets
+
+
+class PlanetQueryBudgetTests(TestCase):
+    """
+    Regression suite guaranteeing that the planet endpoints render the terrain and climate names with a number of
+    queries that does not depend on how many planets are stored.
+    """
+
+    def setUp(self):
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        clear_response_cache()
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def assert_list_query_budget(self, amount: int):
+        create_planets_in_bulk(amount)
+
+        with self.assertNumQueries(PLANET_LIST_QUERIES):
+            res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(res.data["results"]), min(amount, IdCursorPagination.page_size)
+        )
+        self.assertEqual(len(res.data["results"][0]["terrains"]), 2)
+        self.assertEqual(len(res.data["results"][0]["climates"]), 1)
+
+    def test_list_planets_query_budget_with_10_planets(self):
+        self.assert_list_query_budget(10)
+
+    def test_list_planets_query_budget_with_1k_planets(self):
+        self.assert_list_query_budget(1_000)
+
+    def test_list_planets_query_budget_with_10k_planets(self):
+        self.assert_list_query_budget(10_000)
+
+    def test_deep_page_query_budget(self):
+        create_planets_in_bulk(1_000)
+
+        url = PLANET_LIST_URL
+        for _ in range(5):
+            url = self.client_api.get(url).data["next"]
+
+        with self.assertNumQueries(PLANET_LIST_QUERIES):
+            res = self.client_api.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["name"], "planet-500")
+
+    def test_retrieve_planet_query_budget(self):
+        planets = create_planets_in_bulk(10)
+
+        with self.assertNumQueries(PLANET_DETAIL_QUERIES):
+            res = self.client_api.get(planet_detail_url(planets[0].id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["name"], planets[0].name)
+        self.assertEqual(
+            sorted(res.data["terrains"]),
+            sorted(planets[0].terrains.values_list("name", flat=True)),
+        )
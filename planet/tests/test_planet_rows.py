@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.cache import clear_response_cache
+from core.models import Climate, Planet, Terrain
+from planet.serializers import PlanetRowSerializer, PlanetSerializer
+from planet.tests.test_planet_queries import create_planets_in_bulk
+from planet.views import PlanetViewSet
+from user.tests.test_user_api import create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+FIELDSETS = [
+    None,
+    ["id", "name"],
+    ["terrains"],
+    ["population", "climates"],
+    ["id", "name", "population", "terrains", "climates"],
+]
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class PlanetRowSerializerConformanceTests(TestCase):
+    """
+    PlanetRowSerializer must render exactly the bytes PlanetSerializer renders for the same planets.
+    """
+
+    def setUp(self):
+        create_planets_in_bulk(250)
+        Planet.objects.create(name="Hoth", population=None)
+        Planet.objects.create(name='Kashyyyk ✨ "wookiee"', population=45000000)
+        jakku = Planet.objects.create(name="Jakku", population=0)
+        jakku.terrains.add(Terrain.objects.create(name="desert"))
+        jakku.terrains.add(Terrain.objects.create(name="Dunes"))
+        jakku.climates.add(Climate.objects.create(name="arid"))
+
+    def test_rows_render_like_planet_serializer(self):
+        queryset = PlanetViewSet.queryset.order_by("id")
+
+        for fields in FIELDSETS:
+            with self.subTest(fields=fields):
+                expected = render(
+                    PlanetSerializer(queryset, many=True, fields=fields).data
+                )
+                serializer = PlanetRowSerializer(fields=fields)
+                rows = list(serializer.rows(queryset))
+
+                self.assertEqual(render(serializer.to_representation(rows)), expected)
+
+    def test_empty_page(self):
+        self.assertEqual(PlanetRowSerializer().to_representation([]), [])
+
+    def test_list_renders_like_planet_serializer(self):
+        client = APIClient()
+        client.force_authenticate(
+            user=create_user(email="test@example.com", password="testpass123")
+        )
+        clear_response_cache()
+
+        res = client.get(f"{PLANET_LIST_URL}?page_size=1000")
+
+        self.assertEqual(
+            render(res.data["results"]),
+            render(
+                PlanetSerializer(PlanetViewSet.queryset.order_by("id"), many=True).data
+            ),
+        )
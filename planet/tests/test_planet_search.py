@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from planet import search
+from user.tests.test_user_api import create_user
+
+PLANET_SEARCH_URL = reverse("planet:planet-search")
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Alderaan", 2000000000, ("grasslands", "mountains"), ("temperate",)),
+    PlanetRecord("Hoth", None, ("tundra", "ice caves", "mountains"), ("frozen",)),
+    PlanetRecord("Bespin", 6000000, ("gas giant",), ("temperate", "tropical")),
+    PlanetRecord("Geonosis", 100000000000, ("rock", "desert", "barren"), ("arid",)),
+]
+
+
+class PublicPlanetSearchApiTests(TestCase):
+    def test_search_unauthorized(self):
+        res = APIClient().get(f"{PLANET_SEARCH_URL}?q=hoth")
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PlanetSearchApiTests(TestCase):
+    def setUp(self):
+        BulkPlanetWriter().write(RECORDS)
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def search(self, query: str) -> list[dict]:
+        res = self.client_api.get(f"{PLANET_SEARCH_URL}?{query}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        return res.data["results"]
+
+    def test_search_by_name(self):
+        results = self.search("q=tatoo")
+
+        self.assertEqual(results[0]["name"], "Tatooine")
+        self.assertEqual(results[0]["match"], search.NAME)
+        self.assertGreater(results[0]["rank"], 0)
+
+    def test_search_is_case_insensitive(self):
+        self.assertEqual(self.search("q=HOTH")[0]["name"], "Hoth")
+
+    def test_exact_match_ranks_first(self):
+        BulkPlanetWriter().write([PlanetRecord("Hothos", None, (), ())])
+
+        self.assertEqual(
+            [result["name"] for result in self.search("q=hoth")][:2],
+            ["Hoth", "Hothos"],
+        )
+
+    def test_search_without_matches(self):
+        self.assertEqual(self.search("q=zzzzzz"), [])
+
+    def test_search_related_terrains_and_climates(self):
+        self.assertEqual(self.search("q=desert"), [])
+
+        results = self.search("q=desert&related=true")
+
+        self.assertEqual(
+            sorted(result["name"] for result in results), ["Geonosis", "Tatooine"]
+        )
+        self.assertEqual({result["match"] for result in results}, {search.TERRAIN})
+
+    def test_search_limit(self):
+        results = self.search("q=mountains&related=true&limit=1")
+
+        self.assertEqual(len(results), 1)
+
+    def test_invalid_search(self):
+        res = self.client_api.get(f"{PLANET_SEARCH_URL}?limit={search.MAX_LIMIT + 1}")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", res.data)
+        self.assertIn("limit", res.data)
+
+    def test_search_is_invalidated_by_writes(self):
+        self.assertEqual(self.search("q=naboo"), [])
+
+        res = self.client_api.post(reverse("planet:planet-list"), {"name": "Naboo"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(
+            [result["name"] for result in self.search("q=naboo")], ["Naboo"]
+        )
+
+    def test_substring_fallback(self):
+        with patch("planet.search.trigram_available", return_value=False):
+            results = search.search_planets("oo")
+
+        self.assertEqual([result.name for result in results], ["Tatooine"])
+        self.assertEqual(results[0].rank, 0.5)
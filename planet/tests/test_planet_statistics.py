@@ -0,0 +1,81 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.ingest.bulk import BulkPlanetWriter
+from core.ingest.records import PlanetRecord
+from user.tests.test_user_api import create_user
+
+STATISTICS_URL = reverse("planet:statistics")
+
+RECORDS = [
+    PlanetRecord("Tatooine", 200000, ("desert",), ("arid",)),
+    PlanetRecord("Geonosis", 100000000000, ("rock", "desert"), ("arid",)),
+    PlanetRecord("Hoth", None, ("tundra",), ("frozen",)),
+]
+
+
+class PublicPopulationStatisticsApiTests(TestCase):
+    def test_statistics_unauthorized(self):
+        res = APIClient().get(STATISTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PopulationStatisticsApiTests(TestCase):
+    def setUp(self):
+        BulkPlanetWriter().write(RECORDS)
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        self.client_api = APIClient()
+        self.client_api.force_authenticate(user=self.user)
+
+    def test_statistics(self):
+        res = self.client_api.get(STATISTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [terrain["name"] for terrain in res.data["terrains"]],
+            ["desert", "rock", "tundra"],
+        )
+        self.assertEqual(
+            res.data["terrains"][0],
+            {
+                "name": "desert",
+                "planets": 2,
+                "populated_planets": 2,
+                "total_population": 100000200000,
+                "average_population": 50000100000.0,
+                "max_population": 100000000000,
+            },
+        )
+        self.assertEqual(
+            res.data["climates"][1],
+            {
+                "name": "frozen",
+                "planets": 1,
+                "populated_planets": 0,
+                "total_population": 0,
+                "average_population": None,
+                "max_population": None,
+            },
+        )
+
+    def test_statistics_follow_api_writes(self):
+        res = self.client_api.post(
+            reverse("planet:planet-list"),
+            {"name": "Jakku", "population": 800, "terrains": ["desert"]},
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        desert = self.client_api.get(STATISTICS_URL).data["terrains"][0]
+
+        self.assertEqual(desert["planets"], 3)
+        self.assertEqual(desert["total_population"], 100000200800)
+
+    def test_statistics_query_count(self):
+        with self.assertNumQueries(2):
+            self.client_api.get(STATISTICS_URL)
@@ -1,3 +1,4 @@
+from django.urls import path
 from rest_framework import routers
 
 from planet import views
@@ -8,4 +9,6 @@ app_name = "planet"
 router = routers.SimpleRouter()
 router.register(r"planet", views.PlanetViewSet)
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("statistics/", views.PopulationStatisticsView.as_view(), name="statistics"),
+] + router.urls
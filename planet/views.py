@@ -1,10 +1,240 @@
-from rest_framework import viewsets, permissions
+from typing import Optional
 
-from core.models import Planet
-from planet.serializers import PlanetSerializer
+from django.db.models import F, Prefetch
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import permissions, serializers, views, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from core import cache
+from core.models import (
+    Climate,
+    ClimatePopulation,
+    Planet,
+    Terrain,
+    TerrainPopulation,
+)
+from core.pagination import IdCursorPagination
+from core.parsers import MessagePackParser
+from core.renderers import MessagePackRenderer
+from core.views import AsyncReadMixin
+from planet.filters import PlanetFilterBackend
+from planet.search import PlanetSearchSerializer, search_planets
+from planet.serializers import (
+    PlanetRowSerializer,
+    PlanetSearchResultSerializer,
+    PlanetSerializer,
+    PopulationStatisticsSerializer,
+)
 
-class PlanetViewSet(viewsets.ModelViewSet):
+
+# The planet endpoints also speak MessagePack, for internal consumers that opt in through Accept / Content-Type.
+RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+PARSER_CLASSES = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        description="Only render these fields, comma separated.",
+    ),
+    OpenApiParameter(
+        "omit",
+        OpenApiTypes.STR,
+        description="Do not render these fields, comma separated.",
+    ),
+]
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS),
+    retrieve=extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS),
+)
+class PlanetViewSet(
+    cache.ConditionalGetMixin,
+    cache.CachedResponseMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
+    cache_resource = cache.PLANET
     serializer_class = PlanetSerializer
-    queryset = Planet.objects.all()
+    # Terrains and climates are rendered through SlugRelatedField(many=True), so
+    # they are prefetched in bulk to keep list/retrieve at a constant number of queries.
+    # They are sorted by name, like the list rendered by PlanetRowSerializer.
+    related_prefetches = {
+        "terrains": Prefetch("terrains", queryset=Terrain.objects.order_by("name")),
+        "climates": Prefetch("climates", queryset=Climate.objects.order_by("name")),
+    }
+    queryset = Planet.objects.prefetch_related(*related_prefetches.values())
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = IdCursorPagination
+    filter_backends = [PlanetFilterBackend]
+    renderer_classes = RENDERER_CLASSES
+    parser_classes = PARSER_CLASSES
+    # Columns of the planet table that can be left out, the id is always needed by the pagination.
+    deferrable_fields = ("name", "population")
+
+    def get_fieldset(self) -> Optional[list[str]]:
+        """
+        The get_fieldset function reads the sparse fieldset of a list or retrieve request: `fields` keeps only the
+        given fields and `omit` drops the given ones, both comma separated. None means every field, an empty parameter
+        is ignored.
+        """
+        if self.action not in ("list", "retrieve"):
+            return None
+        if hasattr(self, "_fieldset"):
+            return self._fieldset
+
+        available = PlanetSerializer.Meta.fields
+        params = {
+            key: [
+                name.strip()
+                for value in self.request.query_params.getlist(key)
+                for name in value.split(",")
+                if name.strip()
+            ]
+            for key in ("fields", "omit")
+            if key in self.request.query_params
+        }
+        params = {key: names for key, names in params.items() if names}
+        errors = {
+            key: [f"Unknown field: {name}." for name in names if name not in available]
+            for key, names in params.items()
+        }
+        errors = {key: messages for key, messages in errors.items() if messages}
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        fieldset = None
+        if params:
+            fieldset = [
+                name
+                for name in available
+                if name in params.get("fields", available)
+                and name not in params.get("omit", [])
+            ]
+        self._fieldset = fieldset
+
+        return fieldset
+
+    def get_queryset(self):
+        """
+        The get_queryset function prunes the query to the sparse fieldset: only the requested columns are selected and
+        only the requested many-to-many fields are prefetched.
+        """
+        queryset = super().get_queryset()
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+
+        return (
+            queryset.prefetch_related(None)
+            .prefetch_related(
+                *(
+                    prefetch
+                    for name, prefetch in self.related_prefetches.items()
+                    if name in fieldset
+                )
+            )
+            .only("id", *(name for name in self.deferrable_fields if name in fieldset))
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        The list function renders pages with PlanetRowSerializer instead of PlanetSerializer, behind the same ETag
+        and response cache as retrieve.
+        """
+        return self.conditional_response(self.cached_list, request)
+
+    def cached_list(self, request):
+        return self.cached_response(self.list_rows, request)
+
+    def list_rows(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = PlanetRowSerializer(fields=self.get_fieldset())
+        page = self.paginate_queryset(serializer.rows(queryset))
+
+        return self.get_paginated_response(serializer.to_representation(page))
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.acached_list, request)
+
+    async def acached_list(self, request):
+        return await self.acached_response(self.alist_rows, request)
+
+    async def alist_rows(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = PlanetRowSerializer(fields=self.get_fieldset())
+        page = await self.apaginate_queryset(serializer.rows(queryset))
+
+        return self.get_paginated_response(await serializer.ato_representation(page))
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs.setdefault("fields", fieldset)
+
+        return super().get_serializer(*args, **kwargs)
+
+    @extend_schema(
+        parameters=[PlanetSearchSerializer],
+        responses=PlanetSearchResultSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        The search function returns the planets whose name (or, with `related`, terrain or climate) is similar to `q`,
+        best match first. Results are cached like the list responses, since typeahead repeats the same prefixes.
+        """
+        return self.conditional_response(self.cached_search, request)
+
+    def cached_search(self, request):
+        return self.cached_response(self.search_results, request)
+
+    def search_results(self, request):
+        serializer = PlanetSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        results = search_planets(
+            params["q"], limit=params["limit"], related=params["related"]
+        )
+
+        return Response(
+            {"results": PlanetSearchResultSerializer(results, many=True).data}
+        )
+
+
+class PopulationStatisticsView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = RENDERER_CLASSES
+
+    @staticmethod
+    def summaries(model, target: str) -> list[dict]:
+        return list(
+            model.objects.filter(planets__gt=0)
+            .values(
+                "planets",
+                "populated_planets",
+                "total_population",
+                "max_population",
+                name=F(f"{target}__name"),
+            )
+            .order_by("name")
+        )
+
+    @extend_schema(responses=PopulationStatisticsSerializer)
+    def get(self, request):
+        """
+        The get function returns the planet count and the total, average and max population per terrain and per
+        climate. They are read from the summary tables maintained by core.aggregates, one row per terrain or climate.
+        """
+        serializer = PopulationStatisticsSerializer(
+            {
+                "terrains": self.summaries(TerrainPopulation, "terrain"),
+                "climates": self.summaries(ClimatePopulation, "climate"),
+            }
+        )
+
+        return Response(serializer.data)
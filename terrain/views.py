@@ -1,10 +1,20 @@
 from rest_framework import viewsets, permissions
 
+from core import cache
 from core.models import Terrain
+from core.pagination import IdCursorPagination
+from core.views import AsyncReadMixin
 from terrain.serializers import TerrainSerializer
 
 
-class TerrainViewSet(viewsets.ModelViewSet):
+class TerrainViewSet(
+    cache.ConditionalGetMixin,
+    cache.CachedResponseMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
+    cache_resource = cache.TERRAIN
     serializer_class = TerrainSerializer
     queryset = Terrain.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = IdCursorPagination
@@ -0,0 +1,133 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from user.revocation import revocations
+
+
+def get_user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id, generation: str) -> str:
+    return f"auth:user:{user_id}:{generation}"
+
+
+def generation_key(user_id) -> str:
+    return f"auth:generation:{user_id}"
+
+
+def user_generation(user_id) -> str:
+    """
+    The user_generation function returns the current generation of a cached user, the cached user is keyed by it.
+    A lost generation is replaced by a new random one, so it never goes back to the key of an older entry.
+    """
+    cache = get_user_cache()
+    key = generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex)
+        generation = cache.get(key)
+
+    return generation
+
+
+def invalidate_cached_user(user_id):
+    """
+    The invalidate_cached_user function moves the cached user to a new generation right away, so the writer reads its
+    own writes, and again when the transaction commits. A request that loaded the user before the commit fills the
+    entry of an older generation, which is never read again.
+    """
+
+    def new_generation():
+        get_user_cache().set(generation_key(user_id), uuid.uuid4().hex)
+
+    new_generation()
+    transaction.on_commit(new_generation)
+
+
+def clear_user_cache():
+    get_user_cache().clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps the users of verified tokens in the "auth" cache, so authenticated requests don't
+    load the user from the database. The tokens are still verified on every request, only the user lookup is cached.
+    Entries are bounded by the cache timeout and max entries, and dropped by user.signals when a user is saved or
+    deleted (the admin and ManageUserView both save the user). The "auth" cache must be shared by the workers, the
+    signals only reach the cache of the process that saved the user (see user.checks).
+    Only the fields of `cached_fields` are cached, with the hash of the password hash the tokens are checked against:
+    the other fields are loaded from the database when a view reads them. A user built from the cache is only read,
+    never saved.
+    Revoked tokens are rejected with the in-process revocation list, see user.revocation.
+    """
+
+    # The fields read by check_user, by the permission checks and by ManageUserView.
+    cached_fields = ("email", "name", "is_active", "is_staff", "is_superuser")
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is not None and revocations.is_revoked(jti):
+            raise InvalidToken(_("Token is revoked"))
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not settings.AUTH_USER_CACHE_ENABLED:
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cache = get_user_cache()
+        key = user_cache_key(user_id, user_generation(user_id))
+        # from_db takes the values in the order of the model fields.
+        fields = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.primary_key or field.attname in self.cached_fields
+        ]
+        cached = cache.get(key)
+        if cached is None:
+            user = super().get_user(validated_token)
+            cache.add(
+                key,
+                (
+                    [getattr(user, field) for field in fields],
+                    get_md5_hash_password(user.password),
+                ),
+            )
+            return user
+
+        # A new instance per request, concurrent requests of the same user must not share one.
+        values, password_hash = cached
+        user = self.user_model.from_db(
+            router.db_for_read(self.user_model), fields, values
+        )
+        self.check_user(user, password_hash, validated_token)
+
+        return user
+
+    def check_user(self, user, password_hash: str, validated_token):
+        """
+        The check_user function runs the checks JWTAuthentication.get_user runs on a user loaded from the database,
+        `password_hash` being the hash of its password hash.
+        """
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
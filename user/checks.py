@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches, deploy=True)
+def check_auth_user_cache(app_configs, **kwargs):
+    """
+    The check_auth_user_cache function warns on deployment when the users of CachedJWTAuthentication are cached in the
+    memory of each process: saving a user only drops it from the cache of the process that saved it, the other
+    workers keep accepting a deactivated user until the cache timeout.
+    """
+    if not settings.AUTH_USER_CACHE_ENABLED:
+        return []
+    if not isinstance(caches[settings.AUTH_USER_CACHE_ALIAS], LocMemCache):
+        return []
+
+    return [
+        Warning(
+            "The auth user cache is local to each process.",
+            hint="Set AUTH_USER_CACHE_BACKEND to a shared backend when running several workers, "
+            "or AUTH_USER_CACHE_ENABLED=false.",
+            id="user.W001",
+        )
+    ]
@@ -0,0 +1,178 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from core.models import RevokedToken
+
+# Revocations committed up to this long after their revoked_at (long transactions, clock skew between workers) are
+# still picked up by the incremental refresh.
+REFRESH_OVERLAP = datetime.timedelta(seconds=60)
+MIN_CAPACITY = 1024
+LOOKUP_CACHE_SIZE = 10000
+
+
+class BloomFilter:
+    """
+    A fixed size Bloom filter over strings: `in` never misses an added key and answers wrongly for other keys with
+    probability `error_rate` while at most `capacity` keys are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key: str):
+        # Double hashing: k positions from the two halves of one 128 bits digest.
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class RevocationList:
+    """
+    The in-process view of the RevokedToken table used to reject revoked JWTs without a query per request.
+    The jtis of the unexpired revoked tokens are kept in a Bloom filter: a jti it doesn't contain (nearly every
+    request) is not revoked. A jti it contains is confirmed with an exact lookup, which is remembered in a bounded map
+    so a false positive or a replayed revoked token costs one query only.
+    The filter picks up new revocations every TOKEN_REVOCATION_REFRESH_INTERVAL seconds with a query on revoked_at,
+    and is rebuilt from the unexpired rows every TOKEN_REVOCATION_REBUILD_INTERVAL seconds to drop the expired ones.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.lookups = OrderedDict()
+        self.watermark = None
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+
+    def is_revoked(self, jti: str) -> bool:
+        self.refresh_if_due()
+        if jti not in self.bloom:
+            return False
+
+        return self.lookup(jti)
+
+    def lookup(self, jti: str) -> bool:
+        with self.lock:
+            if jti in self.lookups:
+                self.lookups.move_to_end(jti)
+                return self.lookups[jti]
+
+        revoked = RevokedToken.objects.filter(
+            jti=jti, expires_at__gt=timezone.now()
+        ).exists()
+        self.remember(jti, revoked)
+
+        return revoked
+
+    def remember(self, jti: str, revoked: bool):
+        with self.lock:
+            self.lookups[jti] = revoked
+            self.lookups.move_to_end(jti)
+            while len(self.lookups) > LOOKUP_CACHE_SIZE:
+                self.lookups.popitem(last=False)
+
+    def revoke(self, token, user=None) -> RevokedToken:
+        """
+        The revoke function stores the revocation of a validated token, it is rejected right away by this process and
+        after the next refresh by the others.
+        """
+        jti = token[api_settings.JTI_CLAIM]
+        expires_at = datetime.datetime.fromtimestamp(
+            token["exp"], tz=datetime.timezone.utc
+        )
+        revoked, _ = RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"user": user, "expires_at": expires_at}
+        )
+
+        self.refresh_if_due()
+        with self.lock:
+            self.bloom.add(jti)
+        self.remember(jti, True)
+
+        return revoked
+
+    def refresh_if_due(self):
+        now = time.monotonic()
+        if (
+            self.bloom is not None
+            and now - self.refreshed_at < settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+        ):
+            return
+
+        with self.lock:
+            if (
+                self.bloom is None
+                or now - self.rebuilt_at >= settings.TOKEN_REVOCATION_REBUILD_INTERVAL
+                or self.bloom.count >= self.bloom.capacity
+            ):
+                self.rebuild()
+            elif now - self.refreshed_at >= settings.TOKEN_REVOCATION_REFRESH_INTERVAL:
+                self.refresh()
+
+    def rebuild(self):
+        """
+        The rebuild function loads the jtis of every unexpired revoked token into a new filter, sized for twice as many.
+        """
+        started_at = timezone.now()
+        revoked = RevokedToken.objects.filter(expires_at__gt=started_at)
+        bloom = BloomFilter(
+            capacity=max(MIN_CAPACITY, 2 * revoked.count()),
+            error_rate=settings.TOKEN_REVOCATION_ERROR_RATE,
+        )
+        for jti in revoked.values_list("jti", flat=True).iterator(chunk_size=10000):
+            bloom.add(jti)
+
+        self.bloom = bloom
+        self.lookups.clear()
+        self.watermark = started_at
+        self.refreshed_at = self.rebuilt_at = time.monotonic()
+
+    def refresh(self):
+        """
+        The refresh function adds the tokens revoked since the last refresh, forgetting what was remembered about them.
+        """
+        started_at = timezone.now()
+        jtis = RevokedToken.objects.filter(
+            revoked_at__gte=self.watermark - REFRESH_OVERLAP,
+            expires_at__gt=started_at,
+        ).values_list("jti", flat=True)
+        for jti in jtis:
+            if jti not in self.bloom:
+                self.bloom.add(jti)
+            self.lookups.pop(jti, None)
+
+        self.watermark = started_at
+        self.refreshed_at = time.monotonic()
+
+    def reset(self):
+        with self.lock:
+            self.bloom = None
+            self.lookups.clear()
+
+
+revocations = RevocationList()
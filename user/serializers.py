@@ -1,7 +1,16 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, AuthUser
-from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    AuthUser,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from user.revocation import revocations
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -89,3 +98,35 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data["user_email"] = user.email
 
         return data
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        """
+        The validate function rejects the refresh tokens revoked at logout before issuing a new access token.
+        """
+        refresh = self.token_class(attrs["refresh"])
+        jti = refresh.get(api_settings.JTI_CLAIM)
+        if jti is not None and revocations.is_revoked(jti):
+            raise InvalidToken(_("Token is revoked"))
+
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+    def validate_refresh(self, value: str) -> RefreshToken:
+        """
+        The validate_refresh function checks that the refresh token is valid and belongs to the user logging out.
+        """
+        try:
+            token = RefreshToken(value)
+        except TokenError as exc:
+            raise serializers.ValidationError(str(exc))
+
+        user = self.context["request"].user
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(user.pk):
+            raise serializers.ValidationError("Token belongs to another user.")
+
+        return token
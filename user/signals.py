@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import invalidate_cached_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """
+    The invalidate_authenticated_user function drops the cached user of CachedJWTAuthentication when the user changes,
+    e.g. when it is deactivated or its password changes.
+    """
+    invalidate_cached_user(instance.pk)
@@ -0,0 +1,150 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.cache import clear_response_cache
+from user.authentication import (
+    clear_user_cache,
+    get_user_cache,
+    user_cache_key,
+    user_generation,
+)
+from user.checks import check_auth_user_cache
+from user.tests.test_user_api import ME_URL, create_user
+
+PLANET_LIST_URL = reverse("planet:planet-list")
+
+
+# A long refresh interval, so the revocation list doesn't query its table in the middle of a test.
+@override_settings(TOKEN_REVOCATION_REFRESH_INTERVAL=3600)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        clear_response_cache()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+
+        self.client_api = APIClient()
+        self.client_api.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_authenticated_reads_skip_the_user_query(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        # The page comes from the response cache and the user from the user cache, only the resource version is read.
+        with self.assertNumQueries(1):
+            res = self.client_api.get(PLANET_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_cached_user_is_a_new_instance(self):
+        self.client_api.get(ME_URL)
+
+        res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.data, {"name": "Test Name", "email": "test@example.com"})
+        key = user_cache_key(self.user.pk, user_generation(self.user.pk))
+        self.assertIsNotNone(get_user_cache().get(key))
+
+    def test_cached_profile_reads_skip_the_user_query(self):
+        self.client_api.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.data, {"name": "Test Name", "email": "test@example.com"})
+
+    def test_profile_update_does_not_save_the_cached_user(self):
+        self.client_api.get(ME_URL)
+        # Changed without the signals, the cached user still has the old flags.
+        type(self.user).objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        res = self.client_api.patch(ME_URL, {"name": "New Name"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_staff)
+        self.assertEqual(self.user.name, "New Name")
+
+    def test_local_cache_is_reported_on_deployment(self):
+        self.assertEqual(
+            [message.id for message in check_auth_user_cache(None)], ["user.W001"]
+        )
+        with override_settings(AUTH_USER_CACHE_ENABLED=False):
+            self.assertEqual(check_auth_user_cache(None), [])
+
+    def test_password_hash_is_not_cached(self):
+        self.client_api.get(ME_URL)
+
+        cached = get_user_cache().get(
+            user_cache_key(self.user.pk, user_generation(self.user.pk))
+        )
+
+        self.assertNotIn(self.user.password, repr(cached))
+
+    def test_profile_update_invalidates_the_user(self):
+        self.client_api.get(ME_URL)
+
+        res = self.client_api.patch(ME_URL, {"name": "New Name"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.client_api.get(ME_URL).data["name"], "New Name")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client_api.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_loaded_before_a_change_is_not_cached(self):
+        get_user = JWTAuthentication.get_user
+
+        def get_user_then_deactivate(authentication, validated_token):
+            # The user changes after this request loaded it, before it fills the cache.
+            user = get_user(authentication, validated_token)
+            changed = type(user).objects.get(pk=user.pk)
+            changed.is_active = False
+            changed.save()
+            return user
+
+        with patch.object(JWTAuthentication, "get_user", get_user_then_deactivate):
+            self.client_api.get(ME_URL)
+
+        res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client_api.get(ME_URL)
+
+        self.user.delete()
+
+        res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_is_rejected(self):
+        self.client_api.get(ME_URL)
+        self.client_api.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_USER_CACHE_ENABLED=False)
+    def test_disabled_cache(self):
+        self.client_api.get(PLANET_LIST_URL)
+
+        with self.assertNumQueries(2):
+            self.client_api.get(PLANET_LIST_URL)
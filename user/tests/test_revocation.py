@@ -0,0 +1,137 @@
+import datetime
+import uuid
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.models import RevokedToken
+from user.authentication import clear_user_cache
+from user.revocation import BloomFilter, revocations
+from user.tests.test_user_api import ME_URL, create_user
+
+LOGOUT_URL = reverse("user:logout")
+TOKEN_REFRESH_URL = reverse("user:token-refresh")
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_added_keys_are_found(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.001)
+        keys = [uuid.uuid4().hex for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+
+        self.assertLess(false_positives, 300)
+
+
+# A long refresh interval, so only the tests that ask for a refresh query the revocation table.
+@override_settings(TOKEN_REVOCATION_REFRESH_INTERVAL=3600)
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        revocations.reset()
+        clear_user_cache()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test Name"
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = self.refresh.access_token
+
+        self.client_api = APIClient()
+        self.client_api.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_logout_revokes_the_access_token(self):
+        other_client = APIClient()
+        other_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+        res = self.client_api.post(LOGOUT_URL)
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client_api.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(other_client.get(ME_URL).status_code, status.HTTP_200_OK)
+
+    def test_logout_revokes_the_refresh_token(self):
+        res = self.client_api.post(LOGOUT_URL, {"refresh": str(self.refresh)})
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(revocations.is_revoked(self.refresh["jti"]))
+        self.assertEqual(
+            RevokedToken.objects.filter(user=self.user).count(),
+            2,
+        )
+
+    def test_revoked_refresh_token_is_rejected(self):
+        res = APIClient().post(TOKEN_REFRESH_URL, {"refresh": str(self.refresh)})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("access", res.data)
+
+        self.client_api.post(LOGOUT_URL, {"refresh": str(self.refresh)})
+        res = APIClient().post(TOKEN_REFRESH_URL, {"refresh": str(self.refresh)})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_invalid_refresh_token(self):
+        other = create_user(email="other@example.com", password="testpass123")
+
+        for refresh in ("invalid", str(RefreshToken.for_user(other))):
+            with self.subTest(refresh=refresh):
+                res = self.client_api.post(LOGOUT_URL, {"refresh": refresh})
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("refresh", res.data)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_logout_unauthorized(self):
+        res = APIClient().post(LOGOUT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_valid_tokens_are_checked_in_memory(self):
+        self.client_api.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revocations.is_revoked(uuid.uuid4().hex))
+
+    def test_revocations_of_other_processes_are_picked_up(self):
+        self.client_api.get(ME_URL)
+        RevokedToken.objects.create(
+            jti=self.access["jti"],
+            user=self.user,
+            expires_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+
+        with override_settings(TOKEN_REVOCATION_REFRESH_INTERVAL=0):
+            res = self.client_api.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_false_positives_fall_back_to_an_exact_lookup(self):
+        revocations.refresh_if_due()
+        jti = uuid.uuid4().hex
+        revocations.bloom.add(jti)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(revocations.is_revoked(jti))
+        with self.assertNumQueries(0):
+            self.assertFalse(revocations.is_revoked(jti))
+
+    def test_expired_revocations_are_ignored(self):
+        RevokedToken.objects.create(
+            jti="expired", expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+        self.assertFalse(revocations.is_revoked("expired"))
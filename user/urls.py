@@ -1,6 +1,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
+    TokenRefreshView,
 )
 
 from user import views
@@ -11,5 +12,7 @@ app_name = "user"
 urlpatterns = [
     path("create/", views.CreateUserView.as_view(), name="create"),
     path("token/", TokenObtainPairView.as_view(), name="token"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("me/", views.ManageUserView.as_view(), name="me"),
+    path("logout/", views.LogoutView.as_view(), name="logout"),
 ]
@@ -1,6 +1,9 @@
-from rest_framework import generics, permissions
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
 
-from user.serializers import UserSerializer
+from user.revocation import revocations
+from user.serializers import LogoutSerializer, UserSerializer
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -21,4 +24,26 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         :return: The user object
         :doc-author: Trelent
         """
-        return self.request.user
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+
+        # The user of the request may be built from the auth cache, updates start from the row in the database.
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class LogoutView(generics.GenericAPIView):
+    serializer_class = LogoutSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        The post function revokes the access token of the request and, when given, the refresh token of the session.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        revocations.revoke(request.auth, user=request.user)
+        if serializer.validated_data.get("refresh"):
+            revocations.revoke(serializer.validated_data["refresh"], user=request.user)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)